@@ -32,7 +32,7 @@ def login(email, password):
 # Enroll in a course
 # -----------------------------
 def enroll_course(user_token, course_id):
-    url = f"{BASE_URL}/courses/courses/{course_id}/enroll"
+    url = f"{BASE_URL}/courses/{course_id}/enroll"
     headers = {"Authorization": f"Bearer {user_token}"}
     response = requests.post(url, headers=headers)
     if response.status_code == 400 and "Already enrolled" in response.text:
@@ -45,7 +45,7 @@ def enroll_course(user_token, course_id):
 # Get enrolled courses
 # -----------------------------
 def get_enrolled_courses(user_token):
-    url = f"{BASE_URL}/courses/courses/enrolled"
+    url = f"{BASE_URL}/courses/enrolled"
     headers = {"Authorization": f"Bearer {user_token}"}
     response = requests.get(url, headers=headers)
     response.raise_for_status()
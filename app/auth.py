@@ -4,6 +4,9 @@ from jose import jwt, JWTError
 from passlib.context import CryptContext
 from app.config import settings
 from typing import Optional
+import uuid
+
+from app.utils.revocation import revocations
 
 # -----------------------------
 # Password hashing context
@@ -40,18 +43,22 @@ def create_access_token(subject: str, expires_delta: Optional[timedelta] = None)
     Create a JWT access token with an optional expiration.
     `subject` is usually the user's email or ID.
     """
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
-    to_encode = {"exp": expire, "sub": str(subject)}
+    now = datetime.utcnow()
+    expire = now + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
+    # `jti` identifies the token for server-side revocation (logout)
+    to_encode = {"exp": expire, "iat": now, "sub": str(subject), "jti": uuid.uuid4().hex}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def decode_token(token: str) -> Optional[str]:
     """
     Decode a JWT token and return the `sub` (user identifier) if valid.
-    Returns None if token is invalid or expired.
+    Returns None if token is invalid, expired or revoked.
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload.get("sub")
     except JWTError:
         return None
+    if revocations.is_revoked(payload.get("jti"), payload.get("exp")):
+        return None
+    return payload.get("sub")
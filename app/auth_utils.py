@@ -1,12 +1,20 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
+from typing import Optional, Tuple
 import os
+import time
 
-from app import crud
+from app import models
+from app.config import settings
 from app.schemas import UserOut
-from app.database import get_db
+from app.database import get_async_db
+from app.utils.cache import TTLCache
+from app.utils.revocation import revocations
+from app.utils.user_invalidation import UserInvalidationLog
 
 # ============================================================
 # JWT CONFIGURATION
@@ -17,13 +25,52 @@ ALGORITHM = os.getenv("ALGORITHM", "HS256")
 # OAuth2 scheme to extract Bearer token from requests
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
+# ============================================================
+# AUTH CACHES
+# ============================================================
+# token -> (subject, jti, exp); never outlives the token's `exp`
+token_cache = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds, "auth_tokens")
+# subject (email) -> validated UserOut
+user_cache = TTLCache(settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds, "auth_users")
+# other workers' user changes, applied to user_cache
+user_invalidations = UserInvalidationLog(user_cache.delete)
+
+
+def invalidate_user(db: Session, *emails: Optional[str]) -> None:
+    """
+    Drop cached users after they change (call after the change is committed).
+    This process is invalidated immediately, other workers within AUTH_CACHE_SYNC_SECONDS.
+    """
+    emails = [email for email in emails if email]
+    if settings.auth_cache_enabled:
+        user_invalidations.invalidate(db, emails)
+
+
+def auth_cache_stats() -> dict:
+    return {"enabled": settings.auth_cache_enabled, "tokens": token_cache.stats(), "users": user_cache.stats()}
+
+
+def _decode_claims(token: str) -> Tuple[Optional[str], Optional[str], Optional[float]]:
+    """Return the token's `(sub, jti, exp)`, raising JWTError for invalid tokens."""
+    if settings.auth_cache_enabled:
+        claims = token_cache.get(token)
+        if claims is not None:
+            return claims
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    claims = (payload.get("sub"), payload.get("jti"), exp if isinstance(exp, (int, float)) else None)
+    if claims[0] is not None and settings.auth_cache_enabled:
+        token_cache.set(token, claims, exp - time.time() if claims[2] is not None else None)
+    return claims
+
 
 # ============================================================
 # GET CURRENT USER
 # ============================================================
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> UserOut:
     """
     Decode the JWT token, validate it, and return the current logged-in user.
@@ -36,27 +83,38 @@ def get_current_user(
     )
 
     try:
-        # Decode the JWT token
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
+        # Decode the JWT token (cached per token)
+        email, jti, exp = _decode_claims(token)
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
+    # Revocation is checked on every request, cache hit or not (O(1) set lookup)
+    if revocations.is_revoked(jti, exp):
+        raise credentials_exception
+
+    if settings.auth_cache_enabled:
+        cached = user_cache.get(email)
+        if cached is not None:
+            return cached
+
     # Fetch the user from the database
-    user = crud.get_user_by_email(db, email=email)
+    user = (await db.execute(select(models.User).where(models.User.email == email))).scalars().first()
     if user is None:
         raise credentials_exception
 
     # Return the user as a validated Pydantic model
-    return UserOut.model_validate(user, from_attributes=True)
+    user_out = UserOut.model_validate(user, from_attributes=True)
+    if settings.auth_cache_enabled:
+        user_cache.set(email, user_out)
+    return user_out
 
 
 # ============================================================
 # ADMIN-ONLY DEPENDENCY
 # ============================================================
-def get_current_admin_user(
+async def get_current_admin_user(
     current_user: UserOut = Depends(get_current_user)
 ) -> UserOut:
     """
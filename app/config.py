@@ -15,10 +15,33 @@ class Settings(BaseSettings):
     # 🔗 SQLAlchemy connection string (optional, can be built dynamically)
     database_url: str = ""
 
+    # 🏊 Engine profile (per worker process; see app/utils/engine_config.py)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 10.0     # wait for a free connection before failing
+    db_pool_recycle_seconds: int = 1800       # replace connections older than this
+    db_pre_ping: str = "idle"                 # "always" | "idle" | "never"
+    db_pre_ping_idle_seconds: float = 30.0    # "idle": ping only connections unused this long
+    db_statement_timeout_ms: int = 30_000     # 0 disables (Postgres / MySQL / MariaDB)
+    db_echo: bool = False                     # log every statement (development only)
+    db_log_sample_rate: float = 0.0           # fraction of statements logged with their duration
+    db_slow_query_ms: float = 500.0           # always log statements slower than this (0 disables)
+    db_schema_check: str = "strict"           # startup revision check: "strict" | "warn" | "off"
+
+    # 📊 Per-request SQL profiling ("app.requests" log line: DEBUG, WARNING on a probable N+1)
+    query_profile_enabled: bool = True
+    query_server_timing: bool = False         # also expose DB timings to clients in a Server-Timing header (debug / internal)
+    query_repeat_threshold: int = 5           # same statement this often in one request is flagged as a probable N+1 (0 = off)
+    query_count_header: bool = False          # also add X-Query-Count (statements per request) to responses
+
+    # 📚 Read replicas (DATABASE_REPLICA_URLS, comma-separated)
+    replica_read_your_writes_seconds: float = 5.0  # a client's reads stay on the primary this long after it writes
+
     # 🔐 JWT / Security
     secret_key: str
     algorithm: str = "HS256"  # <-- add this for JWT
-    access_token_expire_minutes: int = 1440
+    access_token_expire_minutes: int = 1440  # e.g. 5 when clients use /auth/refresh
+    refresh_token_expire_days: int = 14
 
     # 📧 SMTP (optional)
     smtp_host: str = ""
@@ -26,6 +49,43 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_password: str = ""
     from_email: str = ""
+    smtp_pool_size: int = 4                  # concurrent authenticated sessions
+    smtp_idle_timeout_seconds: float = 60.0  # close sessions idle longer than this
+    smtp_health_check_seconds: float = 10.0  # NOOP sessions idle longer than this before reuse
+    smtp_max_messages_per_connection: int = 100
+
+    # 🔑 Auth caches (token -> subject, subject -> user)
+    auth_cache_enabled: bool = True
+    auth_cache_ttl_seconds: float = 60.0
+    auth_cache_max_entries: int = 10_000
+    auth_cache_sync_seconds: float = 2.0     # poll for users changed on other workers
+    auth_cache_sync_overlap_ids: int = 1000  # each poll re-reads this many ids behind the watermark (late commits)
+
+    # 🚫 Token revocation (logout)
+    revocation_sync_seconds: float = 2.0     # poll for revocations made by other workers
+    revocation_sync_overlap_ids: int = 1000  # each poll re-reads this many ids behind the watermark (late commits)
+    revocation_purge_seconds: float = 600.0  # delete expired revocation rows
+
+    # 🔒 Password hashing process pool
+    password_pool_workers: int = 2
+    password_pool_max_pending: int = 64  # queued + running; beyond this /auth answers 503
+
+    # 📬 Notification outbox (background email delivery)
+    outbox_enabled: bool = True
+    outbox_workers: int = 2
+    outbox_batch_size: int = 100
+    outbox_poll_seconds: float = 2.0
+    outbox_max_attempts: int = 5
+    outbox_backoff_base_seconds: float = 30.0
+    outbox_backoff_max_seconds: float = 3600.0
+
+    # 📊 Notification report summaries
+    report_rebuild_enabled: bool = True
+    report_rebuild_interval_seconds: float = 3600.0
+    report_rebuild_days: int = 2  # trailing days re-aggregated by each scheduled run
+
+    # 📡 Live streams (optional Redis relay for multi-worker deployments)
+    redis_url: str = ""
 
     # ✅ Pydantic v2 settings
     model_config = {
@@ -1,11 +1,17 @@
 # app/crud.py
+from sqlalchemy import DateTime, Integer, String, Text, case, func, insert, literal, or_, select, update
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from datetime import datetime
-from typing import Optional, List
+from datetime import datetime, timedelta
+from typing import Dict, Optional, List, Tuple
+import hashlib
+import secrets
+import uuid
 
 from app import models, schemas, auth  # auth.py handles password hashing/verification
+from app.config import settings
+from app.utils import report_summary, timeseries
 
 
 # =========================================================
@@ -26,16 +32,19 @@ def create_user(
     email: str,
     password: str,
     full_name: Optional[str] = None,
-    role: str = "student"
+    role: str = "student",
+    region: Optional[str] = None,
+    hashed_password: Optional[str] = None
 ) -> models.User:
-    """Create a new user with hashed password"""
+    """Create a new user with hashed password (pass `hashed_password` if already hashed)"""
     try:
-        hashed_password = auth.get_password_hash(password)
+        hashed_password = hashed_password or auth.get_password_hash(password)
         user = models.User(
             email=email,
             hashed_password=hashed_password,
             full_name=full_name,
             role=role,
+            region=region,
             created_at=datetime.utcnow()
         )
         db.add(user)
@@ -63,7 +72,11 @@ def update_user(db: Session, db_user: models.User, user_in: schemas.UserCreate)
 
 
 def delete_user(db: Session, db_user: models.User):
-    """Delete a user"""
+    """
+    Delete a user. Their incidents, enrollments and notifications go with
+    them via ON DELETE CASCADE instead of being loaded and deleted row by row.
+    """
+    report_summary.count_deleted_for_user(db, db_user.id)
     db.delete(db_user)
     db.commit()
 
@@ -76,6 +89,82 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[models
     return user
 
 
+# =========================================================
+# REFRESH TOKEN OPERATIONS
+# =========================================================
+def _hash_refresh_token(raw: str) -> str:
+    # Refresh tokens are 256-bit random values, so a fast hash is enough
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def create_refresh_token(db: Session, user_id: int, family_id: Optional[str] = None) -> str:
+    """Issue a new opaque refresh token (a fresh family unless rotating); returns the raw token"""
+    raw = secrets.token_urlsafe(32)
+    db.add(models.RefreshToken(
+        token_hash=_hash_refresh_token(raw),
+        user_id=user_id,
+        family_id=family_id or uuid.uuid4().hex,
+        expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days),
+    ))
+    db.commit()
+    return raw
+
+
+def revoke_refresh_family(db: Session, family_id: str) -> None:
+    """Revoke every still-active token of a login session"""
+    db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.family_id == family_id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    db.commit()
+
+
+def revoke_refresh_session(db: Session, raw: str) -> None:
+    """Revoke the login session a refresh token belongs to (logout); unknown tokens are ignored"""
+    token = db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == _hash_refresh_token(raw)
+    ).first()
+    if token is not None:
+        revoke_refresh_family(db, token.family_id)
+
+
+def rotate_refresh_token(db: Session, raw: str) -> Tuple[models.User, str]:
+    """
+    Exchange a refresh token for a new one in the same family. Presenting a
+    token that was already rotated means it leaked: the whole family is
+    revoked and the caller must log in again.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    token = db.query(models.RefreshToken).filter(
+        models.RefreshToken.token_hash == _hash_refresh_token(raw)
+    ).first()
+    if token is None or token.expires_at <= datetime.utcnow():
+        raise invalid
+
+    family_id, user_id = token.family_id, token.user_id
+    # Conditional update: of two concurrent rotations only one can win
+    rotated = db.execute(
+        update(models.RefreshToken)
+        .where(models.RefreshToken.id == token.id, models.RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    ).rowcount
+    if not rotated:
+        db.rollback()
+        revoke_refresh_family(db, family_id)
+        raise invalid
+
+    user = get_user_by_id(db, user_id)
+    if user is None or not user.is_active:
+        db.rollback()
+        raise invalid
+    return user, create_refresh_token(db, user_id, family_id)
+
+
 # =========================================================
 # COURSE OPERATIONS
 # =========================================================
@@ -219,9 +308,14 @@ def get_enrollment(db: Session, user_id: int, course_id: int) -> Optional[models
     )
 
 
-def get_user_enrollments(db: Session, user_id: int) -> List[models.Enrollment]:
-    """Fetch all enrollments for a user"""
-    return db.query(models.Enrollment).filter(models.Enrollment.user_id == user_id).all()
+def get_enrolled_courses(db: Session, user_id: int) -> List[Tuple[int, str, Optional[str]]]:
+    """(course_id, title, description) for every course a user is enrolled in, in one join"""
+    return db.execute(
+        select(models.Course.id, models.Course.title, models.Course.description)
+        .join(models.Enrollment, models.Enrollment.course_id == models.Course.id)
+        .where(models.Enrollment.user_id == user_id)
+        .order_by(models.Enrollment.id)
+    ).all()
 
 
 # =========================================================
@@ -240,6 +334,7 @@ def create_notification(
             created_at=datetime.utcnow()
         )
         db.add(notification)
+        report_summary.count_created(db, [(notification.created_at, None, None)])
         db.commit()
         db.refresh(notification)
         return notification
@@ -251,6 +346,67 @@ def create_notification(
         )
 
 
+BROADCAST_ID_CHUNK = 10_000
+
+
+def broadcast_notifications(
+    db: Session,
+    title: str,
+    message: str,
+    created_by: Optional[int] = None,
+    role: Optional[str] = None,
+    region: Optional[str] = None,
+    user_ids: Optional[List[int]] = None,
+) -> int:
+    """
+    Create one notification per matching active user with INSERT ... SELECT,
+    so the fan-out is a constant number of statements regardless of audience
+    size (explicit id lists are split into chunks of BROADCAST_ID_CHUNK).
+    Returns the number of notifications created; delivery is left to the outbox.
+    """
+    user = models.User
+    notification = models.Notification
+    # Whole seconds: the stamp must compare equal to what every backend stores
+    created_at = datetime.utcnow().replace(microsecond=0)
+    audience = select(
+        user.id,
+        literal(title, String),
+        literal(message, Text),
+        literal(created_by, Integer),
+        literal(created_at, DateTime),
+    ).where(user.is_active.is_(True))
+    if role is not None:
+        audience = audience.where(user.role == role)
+    if region is not None:
+        audience = audience.where(user.region == region)
+
+    if user_ids is None:
+        selects = [audience]
+    else:
+        unique_ids = sorted(set(user_ids))
+        selects = [
+            audience.where(user.id.in_(unique_ids[i:i + BROADCAST_ID_CHUNK]))
+            for i in range(0, len(unique_ids), BROADCAST_ID_CHUNK)
+        ]
+
+    high_water = db.scalar(select(func.max(notification.id))) or 0
+    created = 0
+    columns = ["target_user_id", "title", "message", "created_by", "created_at"]
+    for audience_chunk in selects:
+        created += db.execute(insert(notification).from_select(columns, audience_chunk)).rowcount
+
+    # Summaries count the rows actually inserted (not a second, racy audience scan)
+    inserted = select(notification.target_user_id).where(
+        notification.id > high_water,
+        notification.created_at == created_at,
+        notification.created_by.is_(None) if created_by is None else notification.created_by == created_by,
+        notification.title == title,
+    )
+    report_summary.count_broadcast(db, created_at, created_by, created, inserted)
+    db.commit()
+    return created
+
+
 def mark_notification_sent(db: Session, notification_id: int) -> models.Notification:
     """Mark a notification as sent"""
     notification = db.query(models.Notification).filter(models.Notification.id == notification_id).first()
@@ -259,7 +415,11 @@ def mark_notification_sent(db: Session, notification_id: int) -> models.Notifica
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Notification {notification_id} not found"
         )
-    notification.sent = True
+    if not notification.sent:
+        notification.sent = True
+        report_summary.count_sent(
+            db, [(notification.created_at, notification.created_by, notification.target_user_id)]
+        )
     db.commit()
     db.refresh(notification)
     return notification
@@ -280,5 +440,91 @@ def delete_notification(db: Session, notification_id: int):
     notification = get_notification(db, notification_id)
     if not notification:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Notification not found")
+    report_summary.count_deleted(
+        db, [(notification.created_at, notification.created_by, notification.target_user_id)], notification.sent
+    )
     db.delete(notification)
     db.commit()
+
+
+# =========================================================
+# SENSOR READING OPERATIONS
+# =========================================================
+READING_INSERT_CHUNK = 5000  # rows per multi-row INSERT
+
+
+def bulk_insert_sensor_readings(db: Session, readings: List[schemas.SensorReadingIn]) -> List[dict]:
+    """
+    Insert a batch of sensor readings and bump `Sensor.last_reported_at`.
+
+    Readings are written with one multi-row INSERT per chunk and every
+    affected sensor is updated by a single UPDATE statement. The 1m/1h/1d
+    rollups are merged in the same transaction. Returns one summary per
+    affected sensor (location, type, newest timestamp and latest value per
+    metric) for the live stream.
+    """
+    now = datetime.utcnow()
+    rows = []
+    latest: Dict[int, datetime] = {}
+    # sensor id -> metric -> (recorded_at, value) of that metric's newest reading
+    latest_values: Dict[int, Dict[str, Tuple[datetime, float]]] = {}
+    for reading in readings:
+        recorded_at = timeseries.as_utc_naive(reading.recorded_at) if reading.recorded_at else now
+        rows.append({
+            "sensor_id": reading.sensor_id,
+            "metric": reading.metric,
+            "value": reading.value,
+            "recorded_at": recorded_at,
+        })
+        current = latest.get(reading.sensor_id)
+        if current is None or recorded_at >= current:
+            latest[reading.sensor_id] = recorded_at
+        metrics = latest_values.setdefault(reading.sensor_id, {})
+        newest = metrics.get(reading.metric)
+        if newest is None or recorded_at >= newest[0]:
+            metrics[reading.metric] = (recorded_at, reading.value)
+
+    if not rows:
+        return []
+
+    known = {
+        sensor_id: (location, sensor_type)
+        for sensor_id, location, sensor_type in db.execute(
+            select(models.Sensor.id, models.Sensor.location, models.Sensor.type)
+            .where(models.Sensor.id.in_(list(latest)))
+        )
+    }
+    unknown = sorted(set(latest) - set(known))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown sensor ids: {unknown[:20]}"
+        )
+
+    for start in range(0, len(rows), READING_INSERT_CHUNK):
+        db.execute(insert(models.SensorReading), rows[start:start + READING_INSERT_CHUNK])
+    timeseries.apply_rollups(db, timeseries.build_rollups(rows))
+
+    # One UPDATE for every sensor in the batch; never move the timestamp backwards
+    new_ts = case(latest, value=models.Sensor.id)
+    db.execute(
+        update(models.Sensor)
+        .where(models.Sensor.id.in_(list(latest)))
+        .values(last_reported_at=case(
+            (or_(models.Sensor.last_reported_at.is_(None),
+                 models.Sensor.last_reported_at < new_ts), new_ts),
+            else_=models.Sensor.last_reported_at,
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return [
+        {
+            "sensor_id": sensor_id,
+            "location": known[sensor_id][0],
+            "type": known[sensor_id][1],
+            "last_reported_at": recorded_at,
+            "latest": {metric: value for metric, (_, value) in latest_values[sensor_id].items()},
+        }
+        for sensor_id, recorded_at in latest.items()
+    ]
@@ -5,11 +5,24 @@
 from dotenv import load_dotenv
 load_dotenv()  # Load .env variables from the project root
 
+import hashlib
+import hmac
+import itertools
+import math
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 import logging
 
+from app.config import settings
+from app.utils.engine_config import configure_engine, engine_kwargs
+
 # ----------------------------------------------------------
 # Setup basic logging
 # ----------------------------------------------------------
@@ -34,17 +47,15 @@ if not DATABASE_URL:
 
     DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
 
-logging.info(f"📦 Connecting to database: {DATABASE_URL}")
+logging.info(f"📦 Connecting to database: {make_url(DATABASE_URL).render_as_string(hide_password=True)}")
 
 # ----------------------------------------------------------
 # SQLAlchemy Engine and Session Factory
 # ----------------------------------------------------------
 try:
-    engine = create_engine(
-        DATABASE_URL,
-        echo=True,            # Show SQL logs (turn off in production)
-        pool_pre_ping=True,   # Ensures connection is valid
-        future=True
+    engine = configure_engine(
+        create_engine(DATABASE_URL, future=True, **engine_kwargs(DATABASE_URL)),
+        "primary"
     )
 except Exception as e:
     logging.error(f"❌ Failed to create SQLAlchemy engine: {e}")
@@ -56,14 +67,216 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# ----------------------------------------------------------
+# Async Engine and Session Factory (async route handlers)
+# ----------------------------------------------------------
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap the sync driver in a database URL for its asyncio counterpart."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"❌ No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_url(DATABASE_URL)
+
+try:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_kwargs(ASYNC_DATABASE_URL))
+    configure_engine(async_engine.sync_engine, "primary-async")
+except Exception as e:
+    logging.error(f"❌ Failed to create async SQLAlchemy engine: {e}")
+    raise
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,  # objects stay readable after commit without lazy IO
+)
+
+# ----------------------------------------------------------
+# Read Replicas (GET endpoints)
+# ----------------------------------------------------------
+# DATABASE_REPLICA_URLS is a comma-separated list of sync URLs; each replica's
+# async URL is derived the same way as the primary's.
+REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+
+replica_engines = []
+ReplicaSessionLocal = []
+AsyncReplicaSessionLocal = []
+
+for index, replica_url in enumerate(REPLICA_URLS):
+    try:
+        replica_engine = configure_engine(
+            create_engine(replica_url, future=True, **engine_kwargs(replica_url)),
+            f"replica-{index}"
+        )
+        async_replica_url = to_async_url(replica_url)
+        async_replica_engine = create_async_engine(async_replica_url, **engine_kwargs(async_replica_url))
+        configure_engine(async_replica_engine.sync_engine, f"replica-{index}-async")
+    except Exception as e:
+        logging.error(f"❌ Failed to create engine for read replica {index}: {e}")
+        raise
+    replica_engines.append((replica_engine, async_replica_engine))
+    ReplicaSessionLocal.append(sessionmaker(autocommit=False, autoflush=False, bind=replica_engine))
+    AsyncReplicaSessionLocal.append(async_sessionmaker(
+        async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    ))
+
+if REPLICA_URLS:
+    logging.info(f"📦 Routing reads across {len(REPLICA_URLS)} read replica(s)")
+
+
+class ReadRouter:
+    """
+    Picks where a read runs: replicas in round-robin order, except for
+    clients whose last write is younger than `window_seconds`, which stay on
+    the primary so they never read a replica that has not replayed their
+    own write yet (read-your-writes).
+    """
+
+    def __init__(self, replica_count: int, window_seconds: float):
+        self.replica_count = replica_count
+        self.window_seconds = window_seconds
+        self._turn = itertools.count()
+        self.primary_reads = 0
+        self.replica_reads = [0] * replica_count
+
+    def choose(self, last_write: Optional[float]) -> Optional[int]:
+        """Replica index for this read, or None for the primary."""
+        if not self.replica_count or (last_write is not None and time.time() - last_write < self.window_seconds):
+            self.primary_reads += 1
+            return None
+        index = next(self._turn) % self.replica_count
+        self.replica_reads[index] += 1
+        return index
+
+    def stats(self) -> dict:
+        return {
+            "replicas": self.replica_count,
+            "window_seconds": self.window_seconds,
+            "primary_reads": self.primary_reads,
+            "replica_reads": list(self.replica_reads),
+        }
+
+
+read_router = ReadRouter(len(REPLICA_URLS), settings.replica_read_your_writes_seconds)
+
+# ----------------------------------------------------------
+# Read-your-writes marker
+# ----------------------------------------------------------
+# A request that commits a write gets back a signed last-write timestamp,
+# as a cookie and as a response header. The client carries it (the cookie
+# automatically, or by echoing the header) so that any worker, not just the
+# one that took the write, keeps its reads on the primary for the window.
+WRITE_MARKER_COOKIE = "last_write"
+WRITE_MARKER_HEADER = "X-Last-Write"
+
+_request_writes: ContextVar[Optional[list]] = ContextVar("request_writes", default=None)
+
+
+def _marker_digest(stamp: str) -> str:
+    return hmac.new(settings.secret_key.encode(), stamp.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def sign_write_marker(written_at: float) -> str:
+    stamp = f"{written_at:.3f}"
+    return f"{stamp}.{_marker_digest(stamp)}"
+
+
+def read_write_marker(value: Optional[str]) -> Optional[float]:
+    """The write time a marker carries, or None when it is missing or not signed by us."""
+    stamp, _, digest = (value or "").rpartition(".")
+    if not stamp or not hmac.compare_digest(digest, _marker_digest(stamp)):
+        return None
+    try:
+        return float(stamp)
+    except ValueError:
+        return None
+
+
+def last_write(request: Request) -> Optional[float]:
+    return read_write_marker(
+        request.headers.get(WRITE_MARKER_HEADER) or request.cookies.get(WRITE_MARKER_COOKIE)
+    )
+
+
+# A transaction counts as a write only if it flushed changes or ran DML;
+# read-only commits (and rollbacks) leave the marker alone.
+@event.listens_for(Session, "after_flush")
+def _flag_flushed_write(session, flush_context):
+    if session.new or session.dirty or session.deleted:
+        session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_write(session):
+    # Async sessions share `info` with their underlying sync Session
+    if session.info.pop("wrote", False):
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.append(time.time())
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware: hand the client a signed last-write marker when its request wrote."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not read_router.replica_count:
+            await self.app(scope, receive, send)
+            return
+
+        writes = []  # shared with the threadpool / greenlets through the copied context
+        token = _request_writes.set(writes)
+
+        async def send_with_marker(message):
+            if message["type"] == "http.response.start" and writes:
+                marker = sign_write_marker(writes[-1])
+                cookie = (f"{WRITE_MARKER_COOKIE}={marker}; Max-Age={math.ceil(read_router.window_seconds)}; "
+                          "Path=/; HttpOnly; SameSite=Lax")
+                headers = list(message.get("headers", []))
+                headers.append((WRITE_MARKER_HEADER.lower().encode(), marker.encode()))
+                headers.append((b"set-cookie", cookie.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_marker)
+        finally:
+            _request_writes.reset(token)
+
+
 Base = declarative_base()
 
 # ----------------------------------------------------------
-# Dependency for FastAPI routes
+# Dependencies for FastAPI routes
 # ----------------------------------------------------------
 def get_db():
     """
-    Dependency for FastAPI routes — opens a DB session
+    Dependency for FastAPI routes — opens a DB session on the primary
     and ensures it's closed after each request.
     """
     db = SessionLocal()
@@ -71,3 +284,35 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Async dependency — yields an AsyncSession on the request's event loop,
+    so handlers never wait for a threadpool slot to reach the database.
+    Use it for writes and for reads that must see the latest data.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def read_session_factory(request: Request) -> sessionmaker:
+    """Session factory for a read: a replica, or the primary right after this client wrote."""
+    index = read_router.choose(last_write(request)) if read_router.replica_count else None
+    return SessionLocal if index is None else ReplicaSessionLocal[index]
+
+
+def get_read_db(request: Request):
+    """Read-only session: a replica, or the primary right after this client wrote."""
+    db = read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """Async counterpart of `get_read_db`."""
+    index = read_router.choose(last_write(request)) if read_router.replica_count else None
+    async with (AsyncSessionLocal if index is None else AsyncReplicaSessionLocal[index])() as db:
+        yield db
@@ -1,30 +1,13 @@
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.database import SessionLocal
-from app.auth import decode_token
-from app import crud
+from app.database import get_db  # noqa: F401  (re-exported for the auth routes)
+from app.auth_utils import get_current_user, oauth2_scheme  # noqa: F401
+from app.schemas import UserOut
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    user_sub = decode_token(token)
-    if not user_sub:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-    user = crud.get_user_by_email(db, user_sub)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+# get_current_user is the shared async dependency: cached token/user lookups
+# and the revocation check, the same for the exports as for every other route
 
 def require_role(role: str):
-    def role_checker(current_user = Depends(get_current_user)):
+    async def role_checker(current_user: UserOut = Depends(get_current_user)):
         if current_user.role != role and current_user.role != "admin":
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
         return current_user
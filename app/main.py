@@ -1,8 +1,14 @@
 # app/main.py
 import logging
-from fastapi import FastAPI
+from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import Base, engine
+from app.config import settings
+from app.database import ReadYourWritesMiddleware, async_engine, engine, read_router, replica_engines
+from app.migrate import check_schema_version
+from app.auth_utils import auth_cache_stats, user_invalidations
+from app.utils.engine_config import pool_stats
+from app.utils.fast_json import ORJSONResponse
+from app.utils.query_counter import QueryProfileMiddleware
 from app.routes import (
     auth_routes,
     courses_routes,
@@ -10,66 +16,51 @@ from app.routes import (
     admin_notifications_routes,
     incidents_routes,
     sensors_routes,
-    allocation_routes  # ✅ Added allocation routes
-)
-
-# ============================================================
-# FASTAPI APP INITIALIZATION
-# ============================================================
-app = FastAPI(
-    title="AIDRP - Python Backend Service",
-    version="0.1.0",
-    description="AI Disaster Response and Prediction Platform API",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json"
-)
-
-# ============================================================
-# CORS CONFIGURATION
-# ============================================================
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # ⚠️ Allow all origins for development; restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allocation_routes,  # ✅ Added allocation routes
+    stream_routes,
+    export_routes
 )
+from app.utils.email_utils import close_pool as close_smtp_pool
+from app.utils.notification_outbox import outbox
+from app.utils.password_pool import password_pool
+from app.utils.pubsub import broker
+from app.utils.report_summary import rebuilder as report_rebuilder
+from app.utils.revocation import revocations
 
 # ============================================================
 # DATABASE INITIALIZATION
 # ============================================================
 def init_db():
-    """Create all database tables if they do not exist."""
+    """Check the schema revision; migrations themselves run once per deploy via `python -m app.migrate`."""
     try:
-        Base.metadata.create_all(bind=engine)
-        logging.info("✅ Database tables created successfully")
+        check_schema_version()
     except Exception as e:
         logging.error(f"❌ Database initialization failed: {e}")
         raise
 
 # ============================================================
-# ROUTES INITIALIZATION
+# ROUTES
 # ============================================================
-def init_routes():
-    """Attach all route modules to FastAPI app."""
-    try:
-        app.include_router(auth_routes.router, prefix="/auth", tags=["Authentication"])
-        app.include_router(courses_routes.router, prefix="/courses", tags=["Courses"])
-        app.include_router(admin_routes.router, prefix="/admin", tags=["Admin"])
-        app.include_router(admin_notifications_routes.router, prefix="/admin/notifications", tags=["Admin Notifications"])
-        app.include_router(incidents_routes.router, prefix="/incidents", tags=["Incidents"])
-        app.include_router(sensors_routes.router, prefix="/sensors", tags=["Sensors"])
-        app.include_router(allocation_routes.router, prefix="/allocation", tags=["Allocation"])  # ✅ Allocation route
-        logging.info("✅ Routes initialized successfully")
-    except Exception as e:
-        logging.error(f"❌ Route initialization failed: {e}")
-        raise
+# Every router carries its own prefix and tags; they are included as-is
+ROUTERS = (
+    auth_routes.router,
+    courses_routes.router,
+    admin_routes.router,
+    admin_notifications_routes.router,
+    incidents_routes.router,
+    sensors_routes.router,
+    allocation_routes.router,
+    stream_routes.router,
+    export_routes.router,
+)
 
 # ============================================================
 # HEALTH CHECK ENDPOINTS
 # ============================================================
-@app.get("/", tags=["Health"])
+health_router = APIRouter(tags=["Health"])
+
+
+@health_router.get("/")
 async def read_root():
     """Root endpoint for API health check."""
     return {
@@ -78,20 +69,31 @@ async def read_root():
         "docs_url": "/docs"
     }
 
-@app.get("/status", tags=["Health"])
+@health_router.get("/status")
 async def status_check():
     """Detailed service status endpoint."""
     return {
         "status": "ok",
         "service": "AIDRP Backend",
         "database": "connected",
-        "version": "0.1.0"
+        "version": "0.1.0",
+        "auth_cache": auth_cache_stats(),
+        "password_pool": password_pool.stats(),
+        "revoked_tokens": revocations.stats(),
+        "db_pool": {
+            "primary": pool_stats(engine),
+            "primary_async": pool_stats(async_engine.sync_engine),
+            **{
+                f"replica_{index}": pool_stats(replica_engine)
+                for index, (replica_engine, _) in enumerate(replica_engines)
+            }
+        },
+        "read_routing": read_router.stats()
     }
 
 # ============================================================
 # APPLICATION STARTUP & SHUTDOWN EVENTS
 # ============================================================
-@app.on_event("startup")
 async def startup_event():
     """Initialize app components on startup."""
     logging.basicConfig(
@@ -100,14 +102,75 @@ async def startup_event():
     )
     logging.info("🚀 Starting AIDRP FastAPI service...")
     init_db()
-    init_routes()
+    await broker.start(settings.redis_url)
+    revocations.start()
+    if settings.auth_cache_enabled:
+        user_invalidations.start()
+    if settings.outbox_enabled:
+        outbox.start()
+    if settings.report_rebuild_enabled:
+        report_rebuilder.start()
     logging.info("✅ AIDRP FastAPI service started successfully")
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Perform cleanup on application shutdown."""
+    outbox.stop()
+    report_rebuilder.stop()
+    password_pool.shutdown()
+    revocations.stop()
+    user_invalidations.stop()
+    close_smtp_pool()
+    await broker.stop()
+    await async_engine.dispose()
+    for replica_engine, async_replica_engine in replica_engines:
+        replica_engine.dispose()
+        await async_replica_engine.dispose()
     logging.info("⏹️ Shutting down AIDRP FastAPI service")
 
+# ============================================================
+# APP FACTORY
+# ============================================================
+def create_app() -> FastAPI:
+    """
+    Build the application: middleware, every router and the lifecycle hooks.
+    Runs at import time, so with `gunicorn --preload` the route table (and the
+    modules behind it) is built once in the master and shared copy-on-write
+    by the forked workers.
+    """
+    application = FastAPI(
+        title="AIDRP - Python Backend Service",
+        version="0.1.0",
+        description="AI Disaster Response and Prediction Platform API",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
+        default_response_class=ORJSONResponse
+    )
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # ⚠️ Allow all origins for development; restrict in production
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    application.add_middleware(ReadYourWritesMiddleware)  # a pass-through without replicas
+    if settings.query_profile_enabled:
+        application.add_middleware(
+            QueryProfileMiddleware,
+            repeat_threshold=settings.query_repeat_threshold,
+            server_timing=settings.query_server_timing,
+            count_header=settings.query_count_header,
+        )
+    application.include_router(health_router)
+    for router in ROUTERS:
+        application.include_router(router)
+    application.add_event_handler("startup", startup_event)
+    application.add_event_handler("shutdown", shutdown_event)
+    return application
+
+
+app = create_app()
+
 # ============================================================
 # LOCAL DEVELOPMENT ENTRY POINT
 # ============================================================
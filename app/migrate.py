@@ -0,0 +1,169 @@
+# app/migrate.py
+# One-shot schema migrations and the workers' startup version check
+# ==========================================================
+#
+#   python -m app.migrate            upgrade the database to the newest revision
+#   python -m app.migrate current    print the database revision
+#   python -m app.migrate check      exit 1 unless the database is at the newest revision
+#
+# Run the upgrade once per deploy, before the API workers start. Each worker
+# then runs a single `SELECT version_num FROM alembic_version` at startup
+# instead of introspecting the whole catalog with `create_all`.
+
+import argparse
+import ast
+import logging
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+
+from app.config import settings
+from app.database import engine
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Databases created by the old `create_all` startup match this revision exactly
+BASELINE_REVISION = "0001"
+BASELINE_TABLES = frozenset({
+    "courses", "enrollments", "incidents", "lessons", "modules", "notifications", "sensors", "users",
+})
+
+
+def alembic_config(configure_logging: bool = False):
+    from alembic.config import Config
+
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+    config.attributes["configure_logging"] = configure_logging
+    return config
+
+
+def _revision_links(path: Path) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    (revision, down_revisions) from a version file's literal assignments;
+    a merge revision revises a tuple. None when they are not plain literals.
+    """
+    fields = {}
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, ast.AnnAssign):
+            target, value = node.target, node.value
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target, value = node.targets[0], node.value
+        else:
+            continue
+        if isinstance(target, ast.Name) and target.id in ("revision", "down_revision") and value is not None:
+            try:
+                fields[target.id] = ast.literal_eval(value)
+            except ValueError:
+                return None
+
+    revision, down = fields.get("revision"), fields.get("down_revision")
+    if isinstance(down, str):
+        down = (down,)
+    elif down is None:
+        down = ()
+    if not isinstance(revision, str) or not isinstance(down, (tuple, list)) \
+            or not all(isinstance(parent, str) for parent in down):
+        return None
+    return revision, tuple(down)
+
+
+def _heads(versions: Path) -> Optional[Set[str]]:
+    """Revisions no other migration revises, or None if a version file cannot be read literally."""
+    revisions, revised = set(), set()
+    for path in versions.glob("*.py"):
+        links = _revision_links(path)
+        if links is None:
+            return None
+        revisions.add(links[0])
+        revised.update(links[1])
+    return revisions - revised
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """
+    Newest revision on disk: the one no other migration revises. Read from
+    the version files directly so worker startup doesn't import Alembic;
+    anything the literal reading cannot settle is left to Alembic itself.
+    """
+    heads = _heads(ROOT / "migrations" / "versions")
+    if heads is None or len(heads) != 1:
+        from alembic.script import ScriptDirectory
+
+        heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    if len(heads) != 1:
+        raise RuntimeError(f"❌ Expected one migration head, found {sorted(heads)}")
+    return heads.pop()
+
+
+def current_revision() -> Optional[str]:
+    """The database's revision, or None if it has never been migrated."""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except DBAPIError:
+        return None  # no alembic_version table yet
+
+
+def upgrade(revision: str = "head", configure_logging: bool = False) -> None:
+    from alembic import command
+
+    config = alembic_config(configure_logging)
+    with engine.connect() as connection:
+        tables = set(inspect(connection).get_table_names())
+    if "alembic_version" not in tables and "users" in tables:
+        if tables != BASELINE_TABLES:
+            # Built by some later `create_all`: no revision describes it, so stamping would lie
+            raise RuntimeError(
+                f"❌ Schema without migration history does not match the baseline revision "
+                f"{BASELINE_REVISION} (unexpected tables: {', '.join(sorted(tables - BASELINE_TABLES)) or '-'}, "
+                f"missing: {', '.join(sorted(BASELINE_TABLES - tables)) or '-'}); migrate it by hand"
+            )
+        logging.warning(f"⚠️ Existing schema without migration history; stamping it as {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, revision)
+    logging.info(f"✅ Database schema at revision {current_revision()}")
+
+
+def check_schema_version() -> None:
+    """
+    Startup guard: compare the database revision with the newest migration.
+    DB_SCHEMA_CHECK=strict refuses to start on a mismatch, warn only logs it,
+    off skips the query entirely.
+    """
+    if settings.db_schema_check == "off":
+        return
+    head, current = head_revision(), current_revision()
+    if current == head:
+        logging.info(f"✅ Database schema is up to date (revision {current})")
+        return
+    message = (
+        f"Database schema is at revision {current or '<none>'} but the code expects {head}; "
+        f"run `python -m app.migrate`"
+    )
+    if settings.db_schema_check == "strict":
+        raise RuntimeError(f"❌ {message}")
+    logging.warning(f"⚠️ {message}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.migrate", description="AIDRP schema migrations")
+    parser.add_argument("action", nargs="?", default="upgrade", choices=["upgrade", "current", "check"])
+    parser.add_argument("--revision", default="head", help="Target revision for upgrade (default: head)")
+    args = parser.parse_args(argv)
+
+    if args.action == "upgrade":
+        upgrade(args.revision, configure_logging=True)
+        return 0
+    current, head = current_revision(), head_revision()
+    print(f"database: {current or '<none>'}  head: {head}")
+    return 0 if args.action == "current" or current == head else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, Text, ForeignKey, Date, DateTime, Float, Index, UniqueConstraint
+from sqlalchemy.dialects.mysql import LONGTEXT
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,27 +16,29 @@ class User(Base):
     hashed_password = Column(String(255), nullable=False)
     full_name = Column(String(255), nullable=True)
     role = Column(String(50), default="responder")  # admin, responder, analyst
+    region = Column(String(100), nullable=True, index=True)  # broadcast targeting
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # Relationships
+    # Relationships (children are removed by the database's ON DELETE CASCADE;
+    # passive_deletes keeps the ORM from loading them before a delete)
     incidents_assigned = relationship(
-        "Incident", back_populates="assignee", cascade="all, delete-orphan"
+        "Incident", back_populates="assignee", cascade="all, delete-orphan", passive_deletes=True
     )
     enrollments = relationship(
-        "Enrollment", back_populates="user", cascade="all, delete-orphan"
+        "Enrollment", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
     )
     notifications_created = relationship(
         "Notification",
         foreign_keys="Notification.created_by",
         back_populates="creator",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan", passive_deletes=True
     )
     notifications_received = relationship(
         "Notification",
         foreign_keys="Notification.target_user_id",
         back_populates="recipient_user",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan", passive_deletes=True
     )
 
 
@@ -44,13 +47,23 @@ class User(Base):
 # =====================================================
 class Incident(Base):
     __tablename__ = "incidents"
+    __table_args__ = (
+        # Keyset pagination on (reported_at, id), optionally narrowed by a filter column
+        Index("ix_incidents_reported_id", "reported_at", "id"),
+        Index("ix_incidents_severity_reported", "severity", "reported_at", "id"),
+        Index("ix_incidents_location_reported", "location", "reported_at", "id"),
+        Index("ix_incidents_assignee_reported", "assigned_to", "reported_at", "id"),
+        Index("ix_incidents_lat_lon", "latitude", "longitude"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     severity = Column(String(50), nullable=False)
     location = Column(String(255), nullable=False)
-    assigned_to = Column(Integer, ForeignKey("users.id"), nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    assigned_to = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
     reported_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationship
@@ -62,14 +75,56 @@ class Incident(Base):
 # =====================================================
 class Sensor(Base):
     __tablename__ = "sensors"
+    __table_args__ = (
+        Index("ix_sensors_lat_lon", "latitude", "longitude"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), nullable=True)
     type = Column(String(50), nullable=False)
     location = Column(String(255), nullable=False)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     status = Column(String(50), default="active")
     last_reported_at = Column(DateTime(timezone=True), default=func.now(), nullable=True)
 
 
+# =====================================================
+# SENSOR READING TABLE
+# =====================================================
+class SensorReading(Base):
+    __tablename__ = "sensor_readings"
+    __table_args__ = (
+        Index("ix_sensor_readings_sensor_recorded", "sensor_id", "recorded_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
+    metric = Column(String(50), nullable=False, default="value")  # e.g. water_level, temperature
+    value = Column(Float, nullable=False)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# =====================================================
+# SENSOR READING ROLLUP TABLE (1m / 1h / 1d buckets)
+# =====================================================
+class SensorReadingRollup(Base):
+    __tablename__ = "sensor_reading_rollups"
+    __table_args__ = (
+        UniqueConstraint("sensor_id", "metric", "resolution", "bucket_start", name="uq_sensor_rollup_bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sensor_id = Column(Integer, ForeignKey("sensors.id", ondelete="CASCADE"), nullable=False)
+    metric = Column(String(50), nullable=False)
+    resolution = Column(Integer, nullable=False)  # bucket width in seconds
+    bucket_start = Column(DateTime, nullable=False)  # UTC
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    sum_value = Column(Float, nullable=False)
+    count = Column(Integer, nullable=False)
+
+
 # =====================================================
 # COURSE TABLE
 # =====================================================
@@ -83,10 +138,10 @@ class Course(Base):
 
     # Relationships
     modules = relationship(
-        "Module", back_populates="course", cascade="all, delete-orphan"
+        "Module", back_populates="course", cascade="all, delete-orphan", passive_deletes=True
     )
     enrollments = relationship(
-        "Enrollment", back_populates="course", cascade="all, delete-orphan"
+        "Enrollment", back_populates="course", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
@@ -105,7 +160,7 @@ class Module(Base):
     # Relationships
     course = relationship("Course", back_populates="modules")
     lessons = relationship(
-        "Lesson", back_populates="module", cascade="all, delete-orphan"
+        "Lesson", back_populates="module", cascade="all, delete-orphan", passive_deletes=True
     )
 
 
@@ -148,15 +203,24 @@ class Enrollment(Base):
 # =====================================================
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Outbox polling: unsent rows that are due for a (re)try
+        Index("ix_notifications_outbox", "sent", "next_attempt_at"),
+        # Day-window reports and summary rebuilds
+        Index("ix_notifications_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=True)
     message = Column(Text, nullable=True)
     recipient = Column(String(255), nullable=True)
     sent = Column(Boolean, default=False)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime, nullable=True)  # UTC; NULL = due now
+    last_error = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    target_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    target_user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True)
 
     # Relationships
     recipient_user = relationship(
@@ -165,3 +229,70 @@ class Notification(Base):
     creator = relationship(
         "User", foreign_keys=[created_by], back_populates="notifications_created"
     )
+
+
+# =====================================================
+# NOTIFICATION DAILY SUMMARY (precomputed report counts)
+# =====================================================
+class NotificationDailySummary(Base):
+    __tablename__ = "notification_daily_summaries"
+    __table_args__ = (
+        UniqueConstraint("day", "scope", "subject_id", name="uq_notification_summary_day"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)  # UTC day of notifications.created_at
+    scope = Column(String(20), nullable=False)  # all, creator, recipient
+    subject_id = Column(Integer, nullable=False, default=0)  # user id (0 for scope "all")
+    total_count = Column(Integer, nullable=False, default=0)
+    sent_count = Column(Integer, nullable=False, default=0)
+
+
+# =====================================================
+# REVOKED TOKEN TABLE (logout / forced sign-out)
+# =====================================================
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)  # monotonically increasing sync watermark
+    jti = Column(String(64), unique=True, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # UTC; row is purged after this
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# =====================================================
+# REFRESH TOKEN TABLE (rotating, stored as SHA-256)
+# =====================================================
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True)
+    token_hash = Column(String(64), unique=True, nullable=False)  # sha256 hex of the opaque token
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    family_id = Column(String(32), nullable=False, index=True)  # one login session; rotations share it
+    expires_at = Column(DateTime, nullable=False)  # UTC
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    revoked_at = Column(DateTime, nullable=True)  # set when rotated, logged out or reuse was detected
+
+
+# =====================================================
+# USER INVALIDATION TABLE (drops cached users on every worker)
+# =====================================================
+class UserInvalidation(Base):
+    __tablename__ = "user_invalidations"
+
+    id = Column(Integer, primary_key=True)  # monotonically increasing sync watermark
+    email = Column(String(255), nullable=False)  # user cache key
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)  # UTC; purged after the cache TTL
+
+
+# =====================================================
+# ALLOCATION PLAN (shared by every worker; single row)
+# =====================================================
+class AllocationPlan(Base):
+    __tablename__ = "allocation_plans"
+
+    id = Column(Integer, primary_key=True)  # always PLAN_ROW_ID, created by migration 0005
+    version = Column(Integer, nullable=False, default=0)  # bumped by every change; workers reload on a new one
+    state = Column(Text().with_variant(LONGTEXT(), "mysql"), nullable=True)  # AllocationPlanner.snapshot() JSON
+    updated_at = Column(DateTime, nullable=True)  # UTC
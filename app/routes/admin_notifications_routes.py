@@ -1,31 +1,39 @@
 # app/routes/admin_notifications_routes.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from fastapi.responses import FileResponse
-import pandas as pd
-import os
-import logging
-
-from app import models, schemas
-from app.database import get_db
+from typing import List, Optional
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, time, timedelta
+import csv
+import io
+
+from app import crud, models, schemas
+from app.database import AsyncSessionLocal, get_async_db, get_async_read_db, get_db
 from app.auth_utils import get_current_admin_user
-from app.utils.email_utils import send_email
+from app.config import settings
+from app.utils import fast_json, report_summary
+from app.utils.notification_outbox import outbox
 
 router = APIRouter(
     prefix="/admin/notifications",
     tags=["Admin Notifications"]
 )
 
+NOTIFICATION_COLUMNS = fast_json.schema_columns(models.Notification, schemas.NotificationOut)
+
 # CREATE NOTIFICATION
 @router.post("/", response_model=schemas.NotificationOut, status_code=status.HTTP_201_CREATED)
-def create_notification(
+async def create_notification(
     notification: schemas.NotificationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: models.User = Depends(get_current_admin_user)
 ):
-    recipient = db.query(models.User).filter(models.User.email == notification.recipient).first()
+    recipient = (
+        await db.execute(select(models.User).where(models.User.email == notification.recipient))
+    ).scalars().first()
     if not recipient:
         raise HTTPException(status_code=404, detail="Recipient user not found")
 
@@ -34,63 +42,194 @@ def create_notification(
         message=notification.message,
         target_user_id=recipient.id,
         created_by=current_admin.id,
-        sent=False
+        sent=False,
+        created_at=datetime.utcnow()
     )
     db.add(db_notification)
-    db.commit()
-    db.refresh(db_notification)
-
-    # Send email
-    try:
-        if send_email(recipient.email, db_notification.title, db_notification.message):
-            db_notification.sent = True
-            db.commit()
-    except Exception as e:
-        logging.error(f"❌ Email sending failed: {e}")
+    await db.run_sync(report_summary.count_created, [(db_notification.created_at, current_admin.id, recipient.id)])
+    await db.commit()
+    await db.refresh(db_notification)
 
+    # Delivery happens in the background outbox workers
+    outbox.wake()
     return db_notification
 
+# BROADCAST NOTIFICATION (role / region / user ids)
+@router.post("/broadcast", response_model=schemas.NotificationBroadcastOut, status_code=status.HTTP_201_CREATED)
+async def broadcast_notification(
+    broadcast: schemas.NotificationBroadcast,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: models.User = Depends(get_current_admin_user)
+):
+    created = await db.run_sync(
+        crud.broadcast_notifications,
+        title=broadcast.title,
+        message=broadcast.message,
+        created_by=current_admin.id,
+        role=broadcast.role,
+        region=broadcast.region,
+        user_ids=broadcast.user_ids,
+    )
+    if not created:
+        raise HTTPException(status_code=404, detail="No active users match the broadcast target")
+
+    # The outbox workers deliver the new rows in batches
+    outbox.wake()
+    return {"created": created}
+
 # GET ALL NOTIFICATIONS
 @router.get("/", response_model=List[schemas.NotificationOut])
-def get_all_notifications(
-    db: Session = Depends(get_db),
+async def get_all_notifications(
+    db: AsyncSession = Depends(get_async_read_db),
     current_admin: models.User = Depends(get_current_admin_user)
 ):
-    return db.query(models.Notification).all()
+    rows = (await db.execute(select(*NOTIFICATION_COLUMNS))).all()
+    return fast_json.rows_response(NOTIFICATION_COLUMNS, rows)
 
 # DELETE NOTIFICATION
 @router.delete("/{notification_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_notification(
+async def delete_notification(
     notification_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_admin: models.User = Depends(get_current_admin_user)
 ):
-    notification = db.query(models.Notification).filter(models.Notification.id == notification_id).first()
-    if not notification:
-        raise HTTPException(status_code=404, detail="Notification not found")
-    db.delete(notification)
-    db.commit()
+    await db.run_sync(crud.delete_notification, notification_id)  # also adjusts the report summaries
     return None
 
 # DAILY REPORT CSV
-@router.get("/report/daily", response_class=FileResponse)
-def daily_report(
-    db: Session = Depends(get_db),
+REPORT_CHUNK_ROWS = 1000
+REPORT_COLUMNS = ["id", "title", "recipient_id", "created_by", "sent", "attempts", "created_at"]
+
+
+async def _csv_chunks(db: AsyncSession, result, partitions, first: list):
+    """Yield CSV text one fetched partition at a time; owns and closes `db`."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    try:
+        writer.writerow(REPORT_COLUMNS)
+        writer.writerows(first)
+        yield buffer.getvalue()
+        async for rows in partitions:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+    finally:
+        await result.close()
+        await db.close()
+
+
+@router.get("/report/daily", response_class=StreamingResponse)
+async def daily_report(
+    day: Optional[date] = Query(None, description="UTC day to report on (defaults to today)"),
     current_admin: models.User = Depends(get_current_admin_user)
 ):
-    notifications = db.query(models.Notification).all()
-    if not notifications:
+    day = day or datetime.utcnow().date()
+    start = datetime.combine(day, time.min)
+    notification = models.Notification
+
+    # The session outlives this function, so it is opened here and closed by the stream
+    db = AsyncSessionLocal()
+    try:
+        result = await db.stream(
+            select(
+                notification.id,
+                notification.title,
+                notification.target_user_id,
+                notification.created_by,
+                notification.sent,
+                notification.attempts,
+                notification.created_at,
+            )
+            .where(notification.created_at >= start, notification.created_at < start + timedelta(days=1))
+            .order_by(notification.id)
+            .execution_options(yield_per=REPORT_CHUNK_ROWS)
+        )
+        partitions = result.partitions()
+        first = await anext(partitions, None)
+    except Exception:
+        await db.close()
+        raise
+    if not first:
+        await result.close()
+        await db.close()
         raise HTTPException(status_code=404, detail="No notifications found")
 
-    df = pd.DataFrame([{
-        "title": n.title,
-        "recipient_id": n.target_user_id,
-        "created_by": n.created_by,
-        "sent": n.sent,
-        "created_at": n.created_at
-    } for n in notifications])
+    return StreamingResponse(
+        _csv_chunks(db, result, partitions, first),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="daily_notification_report_{day.isoformat()}.csv"'},
+    )
+
+
+# PRECOMPUTED REPORT SUMMARIES
+DEFAULT_SUMMARY_DAYS = 30
+MAX_SUMMARY_DAYS = 366 * 2
+
 
-    file_path = os.path.join(os.getcwd(), "notification_report.csv")
-    df.to_csv(file_path, index=False)
+def _summary_window(from_day: Optional[date], to_day: Optional[date], default_days: int):
+    to_day = to_day or datetime.utcnow().date()
+    from_day = from_day or to_day - timedelta(days=default_days - 1)
+    if from_day > to_day:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if (to_day - from_day).days >= MAX_SUMMARY_DAYS:
+        raise HTTPException(status_code=400, detail=f"Window is limited to {MAX_SUMMARY_DAYS} days")
+    return from_day, to_day
 
-    return FileResponse(file_path, media_type="text/csv", filename="daily_notification_report.csv")
+
+def _summary_subject(scope: str, subject_id: Optional[int]) -> int:
+    if scope == report_summary.SCOPE_ALL:
+        return 0
+    if subject_id is None:
+        raise HTTPException(status_code=400, detail=f"subject_id is required for scope '{scope}'")
+    return subject_id
+
+
+@router.get("/report/summary", response_model=schemas.NotificationSummaryOut)
+async def report_summary_daily(
+    from_day: Optional[date] = Query(None, alias="from"),
+    to_day: Optional[date] = Query(None, alias="to"),
+    scope: str = Query(report_summary.SCOPE_ALL, pattern="^(all|creator|recipient)$"),
+    subject_id: Optional[int] = Query(None, description="Creator / recipient user id"),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: models.User = Depends(get_current_admin_user)
+):
+    from_day, to_day = _summary_window(from_day, to_day, DEFAULT_SUMMARY_DAYS)
+    subject = _summary_subject(scope, subject_id)
+    return {
+        "scope": scope,
+        "subject_id": subject,
+        "days": await db.run_sync(report_summary.read_daily, from_day, to_day, scope, subject),
+    }
+
+
+@router.get("/report/weekly", response_model=schemas.NotificationWeeklySummaryOut)
+async def report_summary_weekly(
+    weeks: int = Query(4, ge=1, le=104),
+    scope: str = Query(report_summary.SCOPE_ALL, pattern="^(all|creator|recipient)$"),
+    subject_id: Optional[int] = Query(None, description="Creator / recipient user id"),
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: models.User = Depends(get_current_admin_user)
+):
+    today = datetime.utcnow().date()
+    from_day = today - timedelta(days=today.weekday() + 7 * (weeks - 1))
+    subject = _summary_subject(scope, subject_id)
+    return {
+        "scope": scope,
+        "subject_id": subject,
+        "weeks": await db.run_sync(report_summary.read_weekly, from_day, today, scope, subject),
+    }
+
+
+@router.post("/report/rebuild", response_model=schemas.NotificationSummaryRebuildOut)
+def report_summary_rebuild(
+    from_day: Optional[date] = Query(None, alias="from"),
+    to_day: Optional[date] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_admin: models.User = Depends(get_current_admin_user)
+):
+    """Re-aggregate the summaries for a window from raw notifications (backfill / repair)."""
+    # A sync handler: the re-aggregation runs in the threadpool, off the event loop
+    from_day, to_day = _summary_window(from_day, to_day, settings.report_rebuild_days)
+    rows = report_summary.rebuild(db, from_day, to_day)
+    return {"from_day": from_day, "to_day": to_day, "rows": rows}
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List
 
 from app import crud, schemas, models
-from app.database import get_db
-from app.auth_utils import get_current_admin_user
-from app.utils.security import hash_password  # ✅ Fixed import
+from app.database import get_db, get_read_db
+from app.auth_utils import get_current_admin_user, invalidate_user
+from app.utils import fast_json
+from app.utils.password_pool import PasswordPoolBusy, password_pool
 
 # ============================================================
 # ADMIN ROUTER CONFIGURATION
@@ -15,16 +17,19 @@ router = APIRouter(
     tags=["Admin"]
 )
 
+USER_COLUMNS = fast_json.schema_columns(models.User, schemas.UserOut)
+
 # ============================================================
 # 1️⃣ LIST ALL USERS (ADMIN ONLY)
 # ============================================================
 @router.get("/users", response_model=List[schemas.UserOut])
 def list_users(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: models.User = Depends(get_current_admin_user)
 ):
-    users = db.query(models.User).all()
-    return [schemas.UserOut.model_validate(user, from_attributes=True) for user in users]
+    # Rows go straight from SQL tuples to JSON; response_model only documents the shape
+    rows = db.execute(select(*USER_COLUMNS)).all()
+    return fast_json.rows_response(USER_COLUMNS, rows)
 
 # ============================================================
 # 2️⃣ UPDATE A USER (ADMIN ONLY)
@@ -40,19 +45,30 @@ def update_user(
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
+    old_email = db_user.email
     if user_in.email is not None:
         db_user.email = user_in.email
     if user_in.full_name is not None:
         db_user.full_name = user_in.full_name
     if user_in.role is not None:
         db_user.role = user_in.role
+    if user_in.region is not None:
+        db_user.region = user_in.region
     if user_in.password is not None:
-        db_user.hashed_password = hash_password(user_in.password)
+        try:
+            db_user.hashed_password = password_pool.hash_sync(user_in.password)
+        except PasswordPoolBusy:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password hashing is busy, please retry",
+                headers={"Retry-After": "1"},
+            )
     if user_in.is_active is not None:
         db_user.is_active = user_in.is_active
 
     db.commit()
     db.refresh(db_user)
+    invalidate_user(db, old_email, db_user.email)
     return schemas.UserOut.model_validate(db_user, from_attributes=True)
 
 # ============================================================
@@ -68,6 +84,7 @@ def delete_user(
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    db.delete(db_user)
-    db.commit()
+    email = db_user.email
+    crud.delete_user(db, db_user)
+    invalidate_user(db, email)
     return {"message": f"✅ User {user_id} deleted successfully"}
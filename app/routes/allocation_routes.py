@@ -1,19 +1,181 @@
 # app/routes/allocation_routes.py
-from fastapi import APIRouter
+import threading
+from datetime import datetime
+from typing import Callable, List
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.auth_utils import get_current_user
+from app.database import get_db
+from app.utils.allocation import allocate, allocate_batch
 
 router = APIRouter(prefix="/allocation", tags=["Resource Allocation"])
 
+MAX_BATCH_SIZE = 100_000
+PLAN_ROW_ID = 1  # the allocation_plans row (created by migration 0005)
+_batch_adapter = TypeAdapter(List[schemas.AllocationRequest])
+_plan_lock = threading.Lock()  # one change or reload at a time within this worker
+
+
+def _planner():
+    # The planner pulls in NumPy; load it on first use rather than at worker startup
+    from app.utils.allocation_engine import planner
+    return planner
+
+
 @router.get("/predict")
 def predict_resource(incident_type: str, severity: int):
     # Minimal dummy logic
-    resources = {
-        "fire": ["Fire Truck", "Water Tank"],
-        "flood": ["Boats", "Rescue Team"],
-        "earthquake": ["Ambulance", "Rescue Team"]
-    }
-    needed = resources.get(incident_type.lower(), ["General Rescue Team"])
     return {
         "incident_type": incident_type,
         "severity": severity,
-        "allocated_resources": needed[:severity]  # just slice for demo
+        "allocated_resources": allocate(incident_type, severity)
     }
+
+
+@router.post(
+    "/predict:batch",
+    response_model=schemas.AllocationBatchOut,
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": {
+        "type": "array", "items": {"$ref": "#/components/schemas/AllocationRequest"}
+    }}}, "required": True}}
+)
+async def predict_resources_batch(request: Request):
+    """
+    Predict resources for many incidents in one call.
+    The body is a JSON array of `{incident_type, severity}` objects.
+    """
+    try:
+        items = _batch_adapter.validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_BATCH_SIZE} incidents per request"
+        )
+
+    types = [item.incident_type for item in items]
+    severities = [item.severity for item in items]
+    resources = allocate_batch(types, severities)
+
+    # Output is already in its final shape; skip re-validating it through response_model
+    return JSONResponse({
+        "count": len(items),
+        "allocations": [
+            {"incident_type": t, "severity": s, "allocated_resources": r}
+            for t, s, r in zip(types, severities, resources)
+        ],
+    })
+
+
+# ============================================================
+# GLOBAL ASSIGNMENT PLAN
+# ============================================================
+# Every worker keeps a planner in memory and the allocation_plans row holds
+# the shared state: reads reload the snapshot when the row's version moved
+# on, changes bump the version first (taking the row's write lock, so changes
+# from any worker apply one after another) and save the new snapshot.
+def _state(raw):
+    return None if raw is None else orjson.loads(raw)
+
+
+def _current_planner(db: Session):
+    """This worker's planner, brought up to the saved plan."""
+    plan_row = models.AllocationPlan
+    planner = _planner()
+    version, raw = db.execute(
+        select(plan_row.version, plan_row.state).where(plan_row.id == PLAN_ROW_ID)
+    ).one()
+    if version != planner.version:
+        planner.restore(_state(raw), version)
+    return planner
+
+
+def _change_plan(db: Session, change: Callable):
+    """Apply `change(planner)` to the latest saved plan and save the result."""
+    plan_row = models.AllocationPlan
+    with _plan_lock:
+        db.execute(update(plan_row).where(plan_row.id == PLAN_ROW_ID).values(version=plan_row.version + 1))
+        version, raw = db.execute(
+            select(plan_row.version, plan_row.state).where(plan_row.id == PLAN_ROW_ID)
+        ).one()
+        planner = _planner()
+        try:
+            if version - 1 != planner.version:
+                planner.restore(_state(raw), version - 1)
+            result = change(planner)
+            db.execute(update(plan_row).where(plan_row.id == PLAN_ROW_ID).values(
+                state=orjson.dumps(planner.snapshot()).decode(), updated_at=datetime.utcnow()
+            ))
+            db.commit()
+        except BaseException:
+            db.rollback()
+            planner.version = -1  # memory may be ahead of the saved plan: reload on next use
+            raise
+        planner.version = version
+        return result
+
+
+@router.post("/plan", response_model=schemas.AllocationPlanOut)
+def create_plan(
+    plan_in: schemas.AllocationPlanRequest,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    """
+    Assign the available resource units across all open incidents.
+    Highest severity is served first, each with the nearest free unit of every
+    resource type it needs. Replaces the current plan for every worker.
+    """
+    incidents = [incident.model_dump() for incident in plan_in.incidents]
+    resources = [unit.model_dump() for unit in plan_in.resources]
+    try:
+        return _change_plan(
+            db, lambda planner: planner.solve(incidents, resources, time_budget_ms=plan_in.time_budget_ms)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/plan", response_model=schemas.AllocationPlanOut)
+def get_plan(
+    db: Session = Depends(get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    """Return the current assignment plan."""
+    with _plan_lock:
+        return _current_planner(db).plan()
+
+
+@router.put("/plan/incidents/{incident_id}", response_model=schemas.AllocationPlanOut)
+def update_plan_incident(
+    incident_id: int,
+    incident: schemas.PlanIncident,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    """Add or change one incident and re-plan only that incident."""
+    if incident.id != incident_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Incident id mismatch")
+    return _change_plan(db, lambda planner: planner.update_incident(incident.model_dump()))
+
+
+@router.delete("/plan/incidents/{incident_id}", response_model=schemas.AllocationPlanOut)
+def remove_plan_incident(
+    incident_id: int,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    """Close an incident and hand its units to incidents that are still short."""
+    try:
+        return _change_plan(db, lambda planner: planner.remove_incident(incident_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Incident not in plan")
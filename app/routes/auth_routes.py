@@ -1,34 +1,64 @@
 # app/routes/auth_routes.py
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from typing import Optional
+from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app import crud, schemas, auth  # auth should include create_access_token
 from app.deps import get_db
-from app.auth_utils import get_current_user
+from app.auth_utils import get_current_user, oauth2_scheme
+from app.utils.revocation import revocations
+from app.utils.password_pool import PasswordPoolBusy, password_pool
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"])
+
+
+async def _pooled(call):
+    """Await a password pool call, shedding load with 503 when its queue is full."""
+    try:
+        return await call
+    except PasswordPoolBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+def _token_response(email: str, refresh_token: str) -> dict:
+    return {
+        "access_token": auth.create_access_token(subject=email),
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": auth.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
 
 # -----------------------------
 # Register a new user
 # -----------------------------
 @router.post("/register", response_model=schemas.UserOut)
-def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
     """
     Register a new user (Responder, Admin, Analyst, etc.)
     """
-    existing = crud.get_user_by_email(db, user_in.email)
+    existing = await run_in_threadpool(crud.get_user_by_email, db, user_in.email)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    user = crud.create_user(
+    # bcrypt runs in the hashing process pool, not on a request thread
+    hashed_password = await _pooled(password_pool.hash(user_in.password))
+    user = await run_in_threadpool(
+        crud.create_user,
         db=db,
         email=user_in.email,
         password=user_in.password,
         full_name=user_in.full_name,
-        role=user_in.role
+        role=user_in.role,
+        region=user_in.region,
+        hashed_password=hashed_password
     )
     return user
 
@@ -36,20 +66,32 @@ def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
 # Login user and get JWT token
 # -----------------------------
 @router.post("/token", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
     """
     Authenticate user and return a JWT token.
     """
-    user = crud.authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+    user = await run_in_threadpool(crud.get_user_by_email, db, form_data.username)
+    if not user or not await _pooled(password_pool.verify(form_data.password, user.hashed_password)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = auth.create_access_token(subject=user.email)
-    return {"access_token": access_token, "token_type": "bearer"}
+    refresh_token = await run_in_threadpool(crud.create_refresh_token, db, user.id)
+    return _token_response(user.email, refresh_token)
+
+# -----------------------------
+# Exchange a refresh token (rotation; no password check)
+# -----------------------------
+@router.post("/refresh", response_model=schemas.Token)
+def refresh(body: schemas.RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Rotate a refresh token and issue a new short-lived access token.
+    Reusing an already rotated refresh token revokes the whole session.
+    """
+    user, refresh_token = crud.rotate_refresh_token(db, body.refresh_token)
+    return _token_response(user.email, refresh_token)
 
 # -----------------------------
 # Get logged-in user's profile
@@ -65,8 +107,27 @@ def read_profile(current_user: schemas.UserOut = Depends(get_current_user)):
 # Logout user (simulated)
 # -----------------------------
 @router.post("/logout")
-def logout_user():
+def logout_user(
+    body: Optional[schemas.RefreshRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db)
+):
     """
-    Simulate logout. (JWT is stateless — just discard the token on client side)
+    Revoke the presented access token server-side (by its `jti`) until it
+    expires, and the session's refresh tokens if one is supplied.
     """
+    try:
+        payload = jwt.decode(token, auth.SECRET_KEY, algorithms=[auth.ALGORITHM])
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if not payload.get("jti") or not payload.get("exp"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Token cannot be revoked; log in again")
+
+    revocations.revoke(db, payload["jti"], payload["exp"])
+    if body is not None:
+        crud.revoke_refresh_session(db, body.refresh_token)
     return {"message": "Successfully logged out."}
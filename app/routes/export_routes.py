@@ -0,0 +1,57 @@
+# app/routes/export_routes.py
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.database import read_session_factory
+from app.deps import require_role
+from app.utils import columnar_export
+
+# ============================================================
+# ROUTER CONFIGURATION
+# ============================================================
+router = APIRouter(
+    prefix="/export",
+    tags=["Export"]
+)
+
+
+# ============================================================
+# COLUMNAR EXPORTS (analysts and admins)
+# ============================================================
+@router.get("/{entity}.{fmt}", response_class=StreamingResponse)
+def export_entity(
+    request: Request,
+    entity: str,
+    fmt: str,
+    from_ts: Optional[datetime] = Query(None, alias="from", description="Inclusive lower bound on the entity's timestamp"),
+    to_ts: Optional[datetime] = Query(None, alias="to", description="Exclusive upper bound on the entity's timestamp"),
+    columns: Optional[str] = Query(None, description="Comma-separated column projection, e.g. id,severity,reported_at"),
+    current_user=Depends(require_role("analyst")),
+):
+    """
+    Stream a table as Parquet (`.parquet`) or Arrow IPC stream (`.arrow`),
+    one zstd-compressed record batch at a time, read from a replica when configured.
+    """
+    if entity not in columnar_export.EXPORTS or fmt not in columnar_export.FORMATS:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown export '{entity}.{fmt}'")
+    if not columnar_export.available():
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail="Columnar exports require 'pyarrow'")
+    if from_ts and to_ts and from_ts >= to_ts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="'from' must be before 'to'")
+
+    names = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+    try:
+        selected = columnar_export.resolve_columns(entity, names)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return StreamingResponse(
+        columnar_export.stream_export(
+            entity, fmt, selected, from_ts, to_ts, session_factory=read_session_factory(request)
+        ),
+        media_type=columnar_export.FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{entity}.{fmt}"'},
+    )
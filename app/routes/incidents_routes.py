@@ -1,12 +1,17 @@
 # app/routes/incidents_routes.py
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 
 from app import models, schemas
-from app.database import get_db
+from app.database import get_async_db, get_async_read_db, get_db
 from app.auth_utils import get_current_admin_user
+from app.utils import fast_json, pagination
+from app.utils.geo_index import incident_geo
+from app.utils.pubsub import broker
 
 # ============================================================
 # ROUTER CONFIGURATION
@@ -16,48 +21,126 @@ router = APIRouter(
     tags=["Incidents"]
 )
 
+# Columns behind IncidentOut; list pages are encoded straight from these tuples
+INCIDENT_COLUMNS = fast_json.schema_columns(models.Incident, schemas.IncidentOut)
+
 # ============================================================
 # CREATE INCIDENT (Admin only)
 # ============================================================
 @router.post("/", response_model=schemas.IncidentOut, status_code=status.HTTP_201_CREATED)
-def create_incident(
+async def create_incident(
     incident: schemas.IncidentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
     """
     Create a new incident. Admin only.
     """
     # Automatically set reported_at if not provided
-    db_incident = models.Incident(**incident.dict())
+    db_incident = models.Incident(**incident.model_dump())
     if not getattr(db_incident, "reported_at", None):
         db_incident.reported_at = datetime.utcnow()
-    
+
     db.add(db_incident)
-    db.commit()
-    db.refresh(db_incident)
+    await db.commit()
+    await db.refresh(db_incident)
+    incident_geo.upsert(db_incident.id, db_incident.latitude, db_incident.longitude)
+    broker.publish(
+        "incidents", "incident.created",
+        schemas.IncidentOut.model_validate(db_incident).model_dump(mode="json"),
+        location=db_incident.location, severity=db_incident.severity
+    )
     return db_incident
 
 # ============================================================
-# GET ALL INCIDENTS
+# LIST INCIDENTS (keyset pagination, newest first)
 # ============================================================
-@router.get("/", response_model=List[schemas.IncidentOut])
-def get_incidents(db: Session = Depends(get_db)):
+@router.get("/", response_model=schemas.IncidentPage)
+async def get_incidents(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    severity: Optional[str] = None,
+    location: Optional[str] = None,
+    assigned_to: Optional[int] = None,
+    reported_from: Optional[datetime] = None,
+    reported_to: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
     """
-    Retrieve all incidents.
+    Retrieve incidents ordered by `(reported_at, id)` descending, undated ones last.
+    Pass the returned `next_cursor` as `cursor` to fetch the following page.
     """
-    incidents = db.query(models.Incident).all()
-    return incidents
+    query = select(*INCIDENT_COLUMNS)
+    if severity is not None:
+        query = query.where(models.Incident.severity == severity)
+    if location is not None:
+        query = query.where(models.Incident.location == location)
+    if assigned_to is not None:
+        query = query.where(models.Incident.assigned_to == assigned_to)
+    if reported_from is not None:
+        query = query.where(models.Incident.reported_at >= reported_from)
+    if reported_to is not None:
+        query = query.where(models.Incident.reported_at < reported_to)
+    if cursor:
+        try:
+            position, last_id = pagination.decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(
+            pagination.before(models.Incident.reported_at, models.Incident.id, position, last_id)
+        )
+
+    order = pagination.order_desc(db.get_bind().dialect.name, models.Incident.reported_at, models.Incident.id)
+    result = await db.execute(query.order_by(*order).limit(limit + 1))
+    rows = result.all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = pagination.encode_cursor(last.reported_at, last.id)
+    return fast_json.ORJSONResponse({"items": fast_json.rows_to_dicts(INCIDENT_COLUMNS, rows), "next_cursor": next_cursor})
+
+# ============================================================
+# INCIDENTS NEAR A POINT
+# ============================================================
+@router.get("/near", response_model=List[schemas.IncidentNearOut])
+def get_incidents_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=1000),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve incidents within `radius_km` of a point, nearest first.
+    Served from the in-process spatial index; only the matching rows are loaded.
+    A sync handler, so an index rebuild runs in the threadpool, not on the event loop.
+    """
+    hits = incident_geo.within(db, lat, lon, radius_km)[:limit]
+    if not hits:
+        return []
+    incidents = {
+        incident.id: incident
+        for incident in db.query(models.Incident).filter(models.Incident.id.in_([i for i, _ in hits]))
+    }
+    return [
+        schemas.IncidentNearOut(
+            **schemas.IncidentOut.model_validate(incidents[incident_id]).model_dump(),
+            distance_km=round(distance, 3)
+        )
+        for incident_id, distance in hits
+        if incident_id in incidents
+    ]
 
 # ============================================================
 # GET INCIDENT BY ID
 # ============================================================
 @router.get("/{incident_id}", response_model=schemas.IncidentOut)
-def get_incident_by_id(incident_id: int, db: Session = Depends(get_db)):
+async def get_incident_by_id(incident_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve a single incident by ID.
     """
-    incident = db.query(models.Incident).filter(models.Incident.id == incident_id).first()
+    incident = await db.get(models.Incident, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
     return incident
@@ -66,18 +149,21 @@ def get_incident_by_id(incident_id: int, db: Session = Depends(get_db)):
 # DELETE INCIDENT BY ID (Admin only)
 # ============================================================
 @router.delete("/{incident_id}", status_code=status.HTTP_200_OK)
-def delete_incident(
+async def delete_incident(
     incident_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
     """
     Delete an incident by ID. Admin only.
     """
-    incident = db.query(models.Incident).filter(models.Incident.id == incident_id).first()
+    incident = await db.get(models.Incident, incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
-    
-    db.delete(incident)
-    db.commit()
+
+    location, severity = incident.location, incident.severity
+    await db.delete(incident)
+    await db.commit()
+    incident_geo.remove(incident_id)
+    broker.publish("incidents", "incident.deleted", {"id": incident_id}, location=location, severity=severity)
     return {"message": f"✅ Incident {incident_id} deleted successfully"}
\ No newline at end of file
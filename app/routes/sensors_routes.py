@@ -1,10 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from datetime import datetime, timedelta
 
-from app import models, schemas
-from app.database import get_db
-from app.auth_utils import get_current_admin_user
+from app import crud, models, schemas
+from app.database import get_async_db, get_async_read_db, get_db
+from app.auth_utils import get_current_user, get_current_admin_user
+from app.utils import fast_json, timeseries
+from app.utils.geo_index import sensor_geo
+from app.utils.pubsub import broker
 
 # ============================================================
 # ROUTER CONFIGURATION
@@ -14,63 +23,195 @@ router = APIRouter(
     tags=["Sensors"]
 )
 
+SENSOR_COLUMNS = fast_json.schema_columns(models.Sensor, schemas.SensorOut)
+
 # ============================================================
 # CREATE SENSOR (Admin only)
 # ============================================================
 @router.post("/", response_model=schemas.SensorOut, status_code=status.HTTP_201_CREATED)
-def create_sensor(
+async def create_sensor(
     sensor: schemas.SensorCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
     """
     Create a new sensor. Admin only.
     """
-    db_sensor = models.Sensor(**sensor.dict())
+    db_sensor = models.Sensor(**sensor.model_dump())
     db.add(db_sensor)
-    db.commit()
-    db.refresh(db_sensor)
+    await db.commit()
+    await db.refresh(db_sensor)
+    sensor_geo.upsert(db_sensor.id, db_sensor.latitude, db_sensor.longitude)
+    broker.publish(
+        "sensors", "sensor.created",
+        {"id": db_sensor.id, "type": db_sensor.type, "location": db_sensor.location},
+        location=db_sensor.location, type=db_sensor.type
+    )
     return db_sensor
 
+# ============================================================
+# BULK READING INGESTION
+# ============================================================
+MAX_READINGS_PER_REQUEST = 100_000
+_readings_adapter = TypeAdapter(List[schemas.SensorReadingIn])
+
+
+def _parse_readings(body: bytes, content_type: str) -> List[schemas.SensorReadingIn]:
+    """Validate a JSON array or NDJSON payload in a single pydantic pass."""
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        lines = [line for line in body.splitlines() if line.strip()]
+        body = b"[" + b",".join(lines) + b"]"
+    try:
+        return _readings_adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
+
+@router.post(
+    "/readings:batch",
+    response_model=schemas.SensorReadingBatchResult,
+    status_code=status.HTTP_201_CREATED
+)
+async def ingest_readings(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: schemas.UserOut = Depends(get_current_user)
+):
+    """
+    Ingest many readings for many sensors at once.
+    Accepts a JSON array or NDJSON (`application/x-ndjson`) body.
+    Parsing, the bulk insert and the rollups are CPU-bound, so they run in
+    the threadpool rather than on the event loop (which serves the streams).
+    """
+    body = await request.body()
+    readings = await run_in_threadpool(_parse_readings, body, request.headers.get("content-type", ""))
+    if len(readings) > MAX_READINGS_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_READINGS_PER_REQUEST} readings per request"
+        )
+
+    updated = await run_in_threadpool(crud.bulk_insert_sensor_readings, db, readings)
+    for summary in updated:
+        broker.publish(
+            "sensors", "sensor.readings", summary,
+            location=summary["location"], type=summary["type"]
+        )
+    return {"accepted": len(readings), "sensors_updated": len(updated)}
+
 # ============================================================
 # GET ALL SENSORS
 # ============================================================
 @router.get("/", response_model=List[schemas.SensorOut])
-def get_sensors(db: Session = Depends(get_db)):
+async def get_sensors(db: AsyncSession = Depends(get_async_read_db)):
     """
     Retrieve all sensors.
     """
-    return db.query(models.Sensor).all()
+    rows = (await db.execute(select(*SENSOR_COLUMNS))).all()
+    return fast_json.rows_response(SENSOR_COLUMNS, rows)
+
+# ============================================================
+# SENSORS NEAR A POINT
+# ============================================================
+@router.get("/near", response_model=List[schemas.SensorNearOut])
+def get_sensors_near(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(5.0, gt=0, le=1000),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    Retrieve sensors within `radius_km` of a point, nearest first.
+    Served from the in-process spatial index; only the matching rows are loaded.
+    A sync handler, so an index rebuild runs in the threadpool, not on the event loop.
+    """
+    hits = sensor_geo.within(db, lat, lon, radius_km)[:limit]
+    if not hits:
+        return []
+    sensors = {
+        sensor.id: sensor
+        for sensor in db.query(models.Sensor).filter(models.Sensor.id.in_([i for i, _ in hits]))
+    }
+    return [
+        schemas.SensorNearOut(
+            **schemas.SensorOut.model_validate(sensors[sensor_id]).model_dump(),
+            distance_km=round(distance, 3)
+        )
+        for sensor_id, distance in hits
+        if sensor_id in sensors
+    ]
 
 # ============================================================
 # GET SENSOR BY ID
 # ============================================================
 @router.get("/{sensor_id}", response_model=schemas.SensorOut)
-def get_sensor_by_id(sensor_id: int, db: Session = Depends(get_db)):
+async def get_sensor_by_id(sensor_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve a single sensor by ID.
     """
-    sensor = db.query(models.Sensor).filter(models.Sensor.id == sensor_id).first()
+    sensor = await db.get(models.Sensor, sensor_id)
     if not sensor:
         raise HTTPException(status_code=404, detail="Sensor not found")
     return sensor
 
+# ============================================================
+# SENSOR TIME SERIES
+# ============================================================
+@router.get("/{sensor_id}/series", response_model=schemas.SensorSeriesOut)
+def get_sensor_series(
+    sensor_id: int,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    resolution: Optional[str] = None,
+    metric: str = "value",
+    db: Session = Depends(get_db)
+):
+    """
+    Downsampled min/max/mean/count series for one sensor metric.
+    Defaults to the last 24 hours; `resolution` accepts e.g. `30s`, `5m`, `1h`, `1d`.
+    A sync handler, so the aggregation runs in the threadpool, not on the event loop.
+    """
+    if not db.get(models.Sensor, sensor_id):
+        raise HTTPException(status_code=404, detail="Sensor not found")
+
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+    try:
+        step = timeseries.parse_resolution(resolution) if resolution else None
+        if timeseries.as_utc_naive(start) >= timeseries.as_utc_naive(end):
+            raise ValueError("'from' must be earlier than 'to'")
+        step, source, points = timeseries.query_series(db, sensor_id, metric, start, end, step)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return {
+        "sensor_id": sensor_id,
+        "metric": metric,
+        "resolution": step,
+        "source": source,
+        "points": points,
+    }
+
 # ============================================================
 # DELETE SENSOR BY ID (Admin only)
 # ============================================================
 @router.delete("/{sensor_id}", status_code=status.HTTP_200_OK)
-def delete_sensor(
+async def delete_sensor(
     sensor_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: models.User = Depends(get_current_admin_user)
 ):
     """
     Delete a sensor by ID. Admin only.
     """
-    sensor = db.query(models.Sensor).filter(models.Sensor.id == sensor_id).first()
+    sensor = await db.get(models.Sensor, sensor_id)
     if not sensor:
         raise HTTPException(status_code=404, detail="Sensor not found")
-    
-    db.delete(sensor)
-    db.commit()
+
+    location, sensor_type = sensor.location, sensor.type
+    await db.delete(sensor)
+    await db.commit()
+    sensor_geo.remove(sensor_id)
+    broker.publish("sensors", "sensor.deleted", {"id": sensor_id}, location=location, type=sensor_type)
     return {"message": f"✅ Sensor {sensor_id} deleted successfully"}
@@ -0,0 +1,116 @@
+# app/routes/stream_routes.py
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Request, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.utils.pubsub import broker
+
+# ============================================================
+# ROUTER CONFIGURATION
+# ============================================================
+router = APIRouter(
+    prefix="/stream",
+    tags=["Streaming"]
+)
+
+SSE_KEEPALIVE_SECONDS = 15
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+async def _serve_websocket(websocket: WebSocket, topic: str, **filters: Optional[str]) -> None:
+    async with broker.subscribe(topic, **filters) as subscription:
+        await websocket.accept()
+        disconnected = asyncio.ensure_future(_wait_for_disconnect(websocket))
+        try:
+            while True:
+                next_event = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected in done:
+                    next_event.cancel()
+                    break
+                await websocket.send_text(next_event.result().payload)
+        finally:
+            disconnected.cancel()
+
+
+def _sse_response(request: Request, topic: str, **filters: Optional[str]) -> StreamingResponse:
+    # Subscribe when the body starts streaming: a response that is never sent
+    # (client gone first, middleware short-circuit) then never registers a queue
+    async def event_source():
+        async with broker.subscribe(topic, **filters) as subscription:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscription.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield event.sse
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# ============================================================
+# INCIDENT STREAM
+# ============================================================
+@router.websocket("/incidents")
+async def stream_incidents_ws(
+    websocket: WebSocket,
+    location: Optional[str] = None,
+    severity: Optional[str] = None
+):
+    """Push incident events over a WebSocket, optionally filtered."""
+    await _serve_websocket(websocket, "incidents", location=location, severity=severity)
+
+
+@router.get("/incidents")
+async def stream_incidents_sse(
+    request: Request,
+    location: Optional[str] = None,
+    severity: Optional[str] = None
+):
+    """
+    Push incident events as Server-Sent Events.
+    `location` matches as a substring, `severity` accepts a comma-separated list.
+    """
+    return _sse_response(request, "incidents", location=location, severity=severity)
+
+
+# ============================================================
+# SENSOR STREAM
+# ============================================================
+@router.websocket("/sensors")
+async def stream_sensors_ws(
+    websocket: WebSocket,
+    location: Optional[str] = None,
+    type: Optional[str] = None
+):
+    """Push sensor events over a WebSocket, optionally filtered."""
+    await _serve_websocket(websocket, "sensors", location=location, type=type)
+
+
+@router.get("/sensors")
+async def stream_sensors_sse(
+    request: Request,
+    location: Optional[str] = None,
+    type: Optional[str] = None
+):
+    """Push sensor events as Server-Sent Events."""
+    return _sse_response(request, "sensors", location=location, type=type)
@@ -1,7 +1,7 @@
 # app/schemas.py
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 # =========================================================
 # ====================== USERS ===========================
@@ -11,20 +11,23 @@ class UserCreate(BaseModel):
     password: str
     full_name: Optional[str] = None
     role: Optional[str] = "responder"  # default role
+    region: Optional[str] = None
 
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     password: Optional[str] = None
     full_name: Optional[str] = None
     role: Optional[str] = None
+    region: Optional[str] = None
     is_active: Optional[bool] = None
 
 class UserOut(BaseModel):
     id: int
     email: EmailStr
     full_name: Optional[str]
-    role: str
-    is_active: bool
+    role: Optional[str]  # nullable columns: the fast list path returns them as stored
+    region: Optional[str] = None
+    is_active: Optional[bool]
 
     class Config:
         from_attributes = True  # Pydantic v2 compatible
@@ -35,6 +38,11 @@ class UserOut(BaseModel):
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # access token lifetime in seconds
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
 
 # =========================================================
 # ====================== INCIDENTS =======================
@@ -44,6 +52,8 @@ class IncidentBase(BaseModel):
     description: Optional[str] = None
     severity: str
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     assigned_to: Optional[int] = None
 
 class IncidentCreate(IncidentBase):
@@ -56,24 +66,61 @@ class IncidentOut(IncidentBase):
     class Config:
         from_attributes = True
 
+class IncidentNearOut(IncidentOut):
+    distance_km: float
+
+class IncidentPage(BaseModel):
+    items: List[IncidentOut]
+    next_cursor: Optional[str] = None  # pass back as `cursor` to fetch the next page
+
 # =========================================================
 # ====================== SENSORS =========================
 # =========================================================
 class SensorBase(BaseModel):
     type: str
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class SensorCreate(SensorBase):
     name: str
 
 class SensorOut(SensorCreate):
     id: int
+    name: Optional[str] = None  # sensors created before names were stored have none
     status: Optional[str] = "inactive"
     last_reported_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class SensorNearOut(SensorOut):
+    distance_km: float
+
+class SensorReadingIn(BaseModel):
+    sensor_id: int
+    value: float
+    metric: str = "value"
+    recorded_at: Optional[datetime] = None  # defaults to ingestion time
+
+class SensorReadingBatchResult(BaseModel):
+    accepted: int
+    sensors_updated: int
+
+class SeriesPoint(BaseModel):
+    bucket_start: datetime
+    min: float
+    max: float
+    mean: float
+    count: int
+
+class SensorSeriesOut(BaseModel):
+    sensor_id: int
+    metric: str
+    resolution: int  # seconds per point
+    source: str      # raw, 1m, 1h or 1d
+    points: List[SeriesPoint]
+
 # =========================================================
 # ====================== COURSES =========================
 # =========================================================
@@ -137,14 +184,108 @@ class NotificationBase(BaseModel):
 class NotificationCreate(NotificationBase):
     pass
 
-class NotificationOut(BaseModel):
-    id: int
+class NotificationBroadcast(BaseModel):
+    """Targets are combined: e.g. role + region = responders in that region."""
     title: str
     message: str
-    sent: bool
+    role: Optional[str] = None
+    region: Optional[str] = None
+    user_ids: Optional[List[int]] = Field(None, max_length=100_000)
+
+    @model_validator(mode="after")
+    def require_target(self):
+        if self.role is None and self.region is None and self.user_ids is None:
+            raise ValueError("Specify at least one of role, region or user_ids")
+        return self
+
+class NotificationBroadcastOut(BaseModel):
+    created: int
+
+class NotificationDaySummary(BaseModel):
+    day: date
+    total: int
+    sent: int
+    unsent: int
+
+class NotificationWeekSummary(BaseModel):
+    week_start: date
+    total: int
+    sent: int
+    unsent: int
+
+class NotificationSummaryOut(BaseModel):
+    scope: str
+    subject_id: int
+    days: List[NotificationDaySummary]
+
+class NotificationWeeklySummaryOut(BaseModel):
+    scope: str
+    subject_id: int
+    weeks: List[NotificationWeekSummary]
+
+class NotificationSummaryRebuildOut(BaseModel):
+    from_day: date
+    to_day: date
+    rows: int
+
+class NotificationOut(BaseModel):
+    id: int
+    title: Optional[str]
+    message: Optional[str]
+    sent: Optional[bool]
     target_user_id: Optional[int] = None
     created_by: Optional[int] = None
     created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+# =========================================================
+# ====================== ALLOCATION ======================
+# =========================================================
+class AllocationRequest(BaseModel):
+    incident_type: str
+    severity: int
+
+class AllocationOut(AllocationRequest):
+    allocated_resources: List[str]
+
+class AllocationBatchOut(BaseModel):
+    count: int
+    allocations: List[AllocationOut]
+
+class PlanIncident(BaseModel):
+    id: int
+    incident_type: str
+    severity: int
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+class ResourceUnit(BaseModel):
+    id: str
+    resource_type: str  # must match the allocation table, e.g. "Fire Truck"
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
+
+class AllocationPlanRequest(BaseModel):
+    incidents: List[PlanIncident]
+    resources: List[ResourceUnit]
+    time_budget_ms: int = Field(800, ge=1, le=10_000)
+
+class PlanAssignment(BaseModel):
+    incident_id: int
+    resource_id: str
+    resource_type: str
+    distance_km: Optional[float] = None
+
+class UnmetDemand(BaseModel):
+    incident_id: int
+    resource_type: str
+
+class AllocationPlanOut(BaseModel):
+    incidents: int
+    resources: int
+    assignments: List[PlanAssignment]
+    unmet: List[UnmetDemand]
+    complete: bool  # False if the time budget ran out before every incident was served
+    solve_ms: float
@@ -0,0 +1,63 @@
+# app/tests/conftest.py
+import os
+import tempfile
+
+# Point the app at a throwaway SQLite database before anything imports it
+_db_dir = tempfile.mkdtemp(prefix="aidrp-test-")
+os.environ["DATABASE_URL"] = os.getenv(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("MYSQL_USER", "test")
+os.environ.setdefault("MYSQL_PASSWORD", "test")
+os.environ.setdefault("MYSQL_DB", "test")
+os.environ.setdefault("OUTBOX_ENABLED", "false")  # tests drive the outbox directly
+os.environ.setdefault("REPORT_REBUILD_ENABLED", "false")
+os.environ.setdefault("QUERY_COUNT_HEADER", "true")  # N+1 checks read X-Query-Count
+os.environ.setdefault("QUERY_SERVER_TIMING", "true")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.database import SessionLocal
+from app import migrate
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    migrate.upgrade()
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _auth_headers(client, email: str, role: str) -> dict:
+    client.post("/auth/register", json={
+        "email": email, "password": "password123", "full_name": role.title(), "role": role
+    })
+    resp = client.post("/auth/token", data={"username": email, "password": "password123"})
+    assert resp.status_code == 200, resp.text
+    return {"Authorization": f"Bearer {resp.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    return _auth_headers(client, "admin@example.com", "admin")
+
+
+@pytest.fixture(scope="session")
+def user_headers(client):
+    return _auth_headers(client, "responder@example.com", "responder")
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
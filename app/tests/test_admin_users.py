@@ -7,19 +7,19 @@ HEADERS = {"Authorization": f"Bearer {ADMIN_JWT}"} if ADMIN_JWT else {}
 
 # Use correct admin endpoints: /admin/users
 def update_user(user_id: int, new_data: dict):
-    url = f"{BASE_URL}/admin/admin/users/{user_id}"  # <-- fixed URL
+    url = f"{BASE_URL}/admin/users/{user_id}"  # <-- fixed URL
     resp = requests.put(url, json=new_data, headers=HEADERS)
     print(f"\nPUT {url} -> Status: {resp.status_code}")
     _print_response(resp)
 
 def delete_user(user_id: int):
-    url = f"{BASE_URL}/admin/admin/users/{user_id}"  # <-- fixed URL
+    url = f"{BASE_URL}/admin/users/{user_id}"  # <-- fixed URL
     resp = requests.delete(url, headers=HEADERS)
     print(f"\nDELETE {url} -> Status: {resp.status_code}")
     _print_response(resp)
 
 def list_users():
-    url = f"{BASE_URL}/admin/admin/users"  # <-- fixed URL
+    url = f"{BASE_URL}/admin/users"  # <-- fixed URL
     resp = requests.get(url, headers=HEADERS)
     print(f"\nGET {url} -> Status: {resp.status_code}")
     _print_response(resp)
@@ -0,0 +1,104 @@
+import itertools
+
+from app.utils.allocation import VECTORIZE_THRESHOLD, allocate, allocate_batch
+
+
+def test_batch_matches_single_predictions():
+    cases = list(itertools.product(["fire", "FLOOD", "Earthquake", "meteor"], range(-4, 5)))
+    # Repeat so both the small-batch and the vectorized code paths are exercised
+    for size in (len(cases), VECTORIZE_THRESHOLD + len(cases)):
+        batch = list(itertools.islice(itertools.cycle(cases), size))
+        types, severities = zip(*batch)
+        results = allocate_batch(types, severities)
+        assert [list(r) for r in results] == [allocate(t, s) for t, s in batch]
+
+
+def test_batch_endpoint(client):
+    resp = client.post("/allocation/predict:batch", json=[
+        {"incident_type": "fire", "severity": 1},
+        {"incident_type": "tornado", "severity": 3},
+    ])
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"count": 2, "allocations": [
+        {"incident_type": "fire", "severity": 1, "allocated_resources": ["Fire Truck"]},
+        {"incident_type": "tornado", "severity": 3, "allocated_resources": ["General Rescue Team"]},
+    ]}
+
+
+def test_plan_serves_highest_severity_with_nearest_units(client, user_headers):
+    plan = client.post("/allocation/plan", json={
+        "incidents": [
+            {"id": 1, "incident_type": "fire", "severity": 1, "latitude": 10.0, "longitude": 10.0},
+            {"id": 2, "incident_type": "fire", "severity": 2, "latitude": 10.5, "longitude": 10.5},
+        ],
+        "resources": [
+            {"id": "truck-far", "resource_type": "Fire Truck", "latitude": 20.0, "longitude": 20.0},
+            {"id": "truck-near", "resource_type": "Fire Truck", "latitude": 10.4, "longitude": 10.4},
+            {"id": "tank", "resource_type": "Water Tank", "latitude": 10.0, "longitude": 10.0},
+        ],
+    }, headers=user_headers).json()
+    by_incident = {(a["incident_id"], a["resource_id"]) for a in plan["assignments"]}
+    assert by_incident == {(2, "truck-near"), (2, "tank"), (1, "truck-far")}
+    assert plan["unmet"] == [] and plan["complete"]
+
+    # Closing incident 2 must not disturb incident 1's assignment
+    plan = client.delete("/allocation/plan/incidents/2", headers=user_headers).json()
+    assert [(a["incident_id"], a["resource_id"]) for a in plan["assignments"]] == [(1, "truck-far")]
+
+    # Raising incident 1's severity re-plans only that incident
+    plan = client.put("/allocation/plan/incidents/1", json={
+        "id": 1, "incident_type": "fire", "severity": 2, "latitude": 10.0, "longitude": 10.0
+    }, headers=user_headers).json()
+    assert {a["resource_id"] for a in plan["assignments"]} == {"truck-near", "tank"}
+
+
+def test_plan_releases_units_to_waiting_incidents():
+    from app.utils.allocation_engine import AllocationPlanner
+
+    planner = AllocationPlanner()
+    plan = planner.solve(
+        [{"id": 1, "incident_type": "flood", "severity": 1},
+         {"id": 2, "incident_type": "flood", "severity": 1}],
+        [{"id": "boat", "resource_type": "Boats"}],
+    )
+    assert plan["unmet"] == [{"incident_id": 2, "resource_type": "Boats"}]
+
+    plan = planner.remove_incident(1)
+    assert plan["assignments"][0]["incident_id"] == 2
+    assert plan["unmet"] == []
+
+
+def test_update_offers_freed_units_by_priority_including_the_updated_incident():
+    from app.utils.allocation_engine import AllocationPlanner
+
+    planner = AllocationPlanner()
+    planner.solve([{"id": 1, "incident_type": "flood", "severity": 1}], [{"id": "boat", "resource_type": "Boats"}])
+    planner.update_incident({"id": 2, "incident_type": "flood", "severity": 2})
+
+    # Moving incident 1 frees its boat; the more severe incident 2 is served first
+    plan = planner.update_incident({"id": 1, "incident_type": "flood", "severity": 1, "latitude": 1.0, "longitude": 1.0})
+    assert [(a["incident_id"], a["resource_id"]) for a in plan["assignments"]] == [(2, "boat")]
+    assert {(u["incident_id"], u["resource_type"]) for u in plan["unmet"]} == {
+        (1, "Boats"), (2, "Rescue Team")
+    }
+
+
+def test_plan_is_shared_through_the_database(client, user_headers):
+    from app.utils.allocation_engine import planner
+
+    client.post("/allocation/plan", json={
+        "incidents": [{"id": 7, "incident_type": "flood", "severity": 1, "latitude": 5.0, "longitude": 5.0}],
+        "resources": [{"id": "boat-7", "resource_type": "Boats", "latitude": 5.0, "longitude": 5.1}],
+    }, headers=user_headers)
+    saved = client.get("/allocation/plan", headers=user_headers).json()
+
+    # Another worker (or a restarted one) starts without the plan in memory
+    planner.restore(None, 0)
+    assert client.get("/allocation/plan", headers=user_headers).json() == saved
+
+    planner.restore(None, 0)
+    plan = client.put("/allocation/plan/incidents/8", json={
+        "id": 8, "incident_type": "flood", "severity": 1
+    }, headers=user_headers).json()
+    assert [(a["incident_id"], a["resource_id"]) for a in plan["assignments"]] == [(7, "boat-7")]
+    assert plan["unmet"] == [{"incident_id": 8, "resource_type": "Boats"}]
@@ -0,0 +1,97 @@
+# app/tests/test_async_routes.py
+import asyncio
+import csv
+import io
+from datetime import datetime
+
+from app import crud, models
+from app.routes import admin_notifications_routes
+from app.utils.geo_index import incident_geo
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _track_report_sessions(monkeypatch) -> list:
+    """Record each report session's close() (the stream owns the session it is handed)."""
+    closed = []
+    open_session = admin_notifications_routes.AsyncSessionLocal
+
+    def tracking_session():
+        session = open_session()
+        close = session.close
+
+        async def tracked_close():
+            closed.append(True)
+            await close()
+
+        session.close = tracked_close
+        return session
+
+    monkeypatch.setattr(admin_notifications_routes, "AsyncSessionLocal", tracking_session)
+    return closed
+
+
+def test_daily_report_streams_partitions_and_closes_its_session(client, admin_headers, db, monkeypatch):
+    day = datetime(2024, 3, 9)
+    db.add_all([models.Notification(title=f"Report {i}", message="m", created_at=day) for i in range(5)])
+    db.commit()
+    monkeypatch.setattr(admin_notifications_routes, "REPORT_CHUNK_ROWS", 2)
+    closed = _track_report_sessions(monkeypatch)
+
+    resp = client.get("/admin/notifications/report/daily", params={"day": "2024-03-09"}, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    rows = list(csv.reader(io.StringIO(resp.text)))
+    assert rows[0] == admin_notifications_routes.REPORT_COLUMNS
+    assert [row[1] for row in rows[1:]] == [f"Report {i}" for i in range(5)]
+    assert closed == [True]
+
+    # An empty day answers 404 and still releases the session
+    resp = client.get("/admin/notifications/report/daily", params={"day": "1999-01-01"}, headers=admin_headers)
+    assert resp.status_code == 404
+    assert closed == [True, True]
+
+
+def test_async_session_objects_stay_readable_after_commit(client, admin_headers):
+    # expire_on_commit=False: the handler serializes the row after commit without lazy IO
+    resp = client.post("/sensors/", json={"name": "Ridge gauge", "type": "rain", "location": "Ridge"}, headers=admin_headers)
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["location"] == "Ridge" and resp.json()["id"]
+
+
+def test_cpu_bound_helpers_run_off_the_event_loop(client, admin_headers, user_headers, db, monkeypatch):
+    seen = {}
+    bulk_insert = crud.bulk_insert_sensor_readings
+    within = incident_geo.within
+
+    def spy_bulk_insert(session, readings):
+        seen["ingest"] = _on_event_loop()
+        return bulk_insert(session, readings)
+
+    def spy_within(session, lat, lon, radius_km):
+        seen["near"] = _on_event_loop()
+        return within(session, lat, lon, radius_km)
+
+    monkeypatch.setattr(crud, "bulk_insert_sensor_readings", spy_bulk_insert)
+    monkeypatch.setattr(incident_geo, "within", spy_within)
+
+    sensor_id = client.post("/sensors/", json={"name": "Weir gauge", "type": "rain", "location": "Weir"}, headers=admin_headers).json()["id"]
+    resp = client.post("/sensors/readings:batch", json=[{"sensor_id": sensor_id, "value": 1.0}], headers=user_headers)
+    assert resp.status_code == 201, resp.text
+    assert client.get("/incidents/near", params={"lat": 0, "lon": 0}).status_code == 200
+    assert seen == {"ingest": False, "near": False}
+
+
+def test_exports_use_the_revocation_aware_user_dependency(client, admin_headers):
+    client.post("/auth/register", json={"email": "analyst-out@example.com", "password": "password123", "role": "analyst"})
+    token = client.post("/auth/token", data={"username": "analyst-out@example.com", "password": "password123"}).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/export/incidents.arrow", headers=headers).status_code == 200
+
+    client.post("/auth/logout", headers=headers)
+    assert client.get("/export/incidents.arrow", headers=headers).status_code == 401
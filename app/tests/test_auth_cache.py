@@ -0,0 +1,66 @@
+# app/tests/test_auth_cache.py
+import time
+
+from app.auth_utils import user_cache
+from app.utils.cache import TTLCache
+from app.utils.user_invalidation import UserInvalidationLog
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None and cache.get("c") == 3
+
+    cache.set("short", 4, ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+    assert cache.stats()["evictions"] == 2
+
+
+def test_current_user_is_cached_and_invalidated_on_admin_update(client, admin_headers):
+    client.post("/auth/register", json={"email": "cached@example.com", "password": "password123", "role": "responder"})
+    token = client.post("/auth/token", data={"username": "cached@example.com", "password": "password123"}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+
+    # Non-admins are rejected; the second call is served from the cache
+    assert client.get("/admin/users", headers=headers).status_code == 403
+    hits = user_cache.hits
+    assert client.get("/admin/users", headers=headers).status_code == 403
+    assert user_cache.hits == hits + 1
+
+    users = client.get("/admin/users", headers=admin_headers).json()
+    user_id = next(user["id"] for user in users if user["email"] == "cached@example.com")
+    resp = client.put(f"/admin/users/{user_id}", json={"role": "admin"}, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+
+    # The promotion is visible immediately instead of after the TTL
+    assert client.get("/admin/users", headers=headers).status_code == 200
+
+    client.delete(f"/admin/users/{user_id}", headers=admin_headers)
+    assert client.get("/admin/users", headers=headers).status_code == 401
+
+    assert "auth_cache" in client.get("/status").json()
+
+
+def test_user_changes_reach_other_workers(client, admin_headers, db):
+    client.post("/auth/register", json={"email": "demoted@example.com", "password": "password123", "role": "admin"})
+    token = client.post("/auth/token", data={"username": "demoted@example.com", "password": "password123"}).json()
+    headers = {"Authorization": f"Bearer {token['access_token']}"}
+    assert client.get("/admin/users", headers=headers).status_code == 200
+
+    # Another worker caches the same user, then sees the demotion in the log
+    other_cache = TTLCache(ttl_seconds=60)
+    other_worker = UserInvalidationLog(other_cache.delete)
+    other_worker.sync(db)
+    other_cache.set("demoted@example.com", "admin")
+
+    users = client.get("/admin/users", headers=admin_headers).json()
+    user_id = next(user["id"] for user in users if user["email"] == "demoted@example.com")
+    client.put(f"/admin/users/{user_id}", json={"role": "responder"}, headers=admin_headers)
+
+    assert other_worker.sync(db) >= 1
+    assert other_cache.get("demoted@example.com") is None
+    assert client.get("/admin/users", headers=headers).status_code == 403
@@ -0,0 +1,71 @@
+# app/tests/test_email_pool.py
+import smtplib
+
+import pytest
+
+from app.utils import email_utils
+
+
+class FakeSMTP:
+    """Stand-in SMTP server session that records what was sent."""
+
+    sessions = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.closed = False
+        self.fail_next = False
+        FakeSMTP.sessions.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def noop(self):
+        return (250, b"OK")
+
+    def send_message(self, msg):
+        if self.fail_next:
+            self.fail_next = False
+            raise smtplib.SMTPServerDisconnected("connection dropped")
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        self.closed = True
+
+    close = quit
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    FakeSMTP.sessions = []
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(email_utils.settings, "smtp_host", "smtp.test")
+    monkeypatch.setattr(email_utils.settings, "smtp_max_messages_per_connection", 100)
+    email_utils.close_pool()
+    yield FakeSMTP
+    email_utils.close_pool()
+
+
+def test_bulk_send_reuses_sessions(fake_smtp):
+    messages = [(f"r{i}@example.com", "Evacuate", "Leave now") for i in range(250)]
+    assert email_utils.send_many(messages) == [None] * 250
+
+    # 250 messages at 100 per session -> 3 handshakes, not 250
+    assert len(fake_smtp.sessions) == 3
+    assert sum(len(session.sent) for session in fake_smtp.sessions) == 250
+
+    # A single send afterwards reuses the idle session
+    assert email_utils.send_email("one@example.com", "Hi", "Body") is True
+    assert len(fake_smtp.sessions) == 3
+
+
+def test_dropped_session_is_retried_on_a_new_one(fake_smtp):
+    assert email_utils.send_email("a@example.com", "Hi", "Body")
+    fake_smtp.sessions[0].fail_next = True
+
+    assert email_utils.send_many([("b@example.com", "Hi", "Body")]) == [None]
+    assert fake_smtp.sessions[0].closed
+    assert fake_smtp.sessions[1].sent == ["b@example.com"]
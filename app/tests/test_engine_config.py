@@ -0,0 +1,72 @@
+# app/tests/test_engine_config.py
+import logging
+
+import pytest
+
+from sqlalchemy import create_engine, exc, text
+
+from app.config import settings
+from app.utils import engine_config
+
+
+def _engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    return engine_config.configure_engine(create_engine(url, **engine_config.engine_kwargs(url)), "test")
+
+
+def test_status_reports_pool_statistics(client):
+    pools = client.get("/status").json()["db_pool"]
+    primary = pools["primary"]
+    assert primary["pool"] == "QueuePool"
+    assert primary["size"] == settings.db_pool_size
+    assert primary["checkouts"] >= 1
+    assert "checked_out" in primary and "overflow" in primary
+
+
+def test_idle_pre_ping_only_pings_idle_connections(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pre_ping", "idle")
+    engine = _engine(tmp_path)
+
+    monkeypatch.setattr(settings, "db_pre_ping_idle_seconds", 3600)
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    assert engine_config.pool_stats(engine)["idle_pings"] == 0
+
+    monkeypatch.setattr(settings, "db_pre_ping_idle_seconds", 0)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    stats = engine_config.pool_stats(engine)
+    assert stats["idle_pings"] == 1
+    assert stats["connects"] == 1 and stats["checkouts"] == 4
+    engine.dispose()
+
+
+def test_sql_log_sampling(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "db_slow_query_ms", 0)
+    monkeypatch.setattr(settings, "db_log_sample_rate", 1.0)
+    engine = _engine(tmp_path)
+    with caplog.at_level(logging.INFO, logger="app.sql"), engine.connect() as conn:
+        conn.execute(text("SELECT 42"))
+    assert any("SELECT 42" in r.getMessage() for r in caplog.records)
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "db_log_sample_rate", 0.0)
+    with caplog.at_level(logging.INFO, logger="app.sql"), engine.connect() as conn:
+        conn.execute(text("SELECT 43"))
+    assert not any("SELECT 43" in r.getMessage() for r in caplog.records)
+    engine.dispose()
+
+
+def test_failed_statement_leaves_no_timing_state(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "db_slow_query_ms", 0)
+    monkeypatch.setattr(settings, "db_log_sample_rate", 1.0)
+    engine = _engine(tmp_path)
+    with caplog.at_level(logging.INFO, logger="app.sql"), engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(exc.OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 44"))
+        assert "query_started" not in conn.info  # the failed statements' timestamps were overwritten, not stacked
+    assert [r.getMessage().split(": ", 1)[1] for r in caplog.records if r.name == "app.sql"] == ["SELECT 44"]
+    engine.dispose()
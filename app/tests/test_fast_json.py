@@ -0,0 +1,76 @@
+# app/tests/test_fast_json.py
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import delete, insert
+
+from app import models, schemas
+from app.utils import fast_json
+
+
+def _delete(db, *rows):
+    for model, row_id in rows:
+        db.execute(delete(model).where(model.id == row_id))
+    db.commit()
+
+
+def test_fast_list_matches_response_model(client, admin_headers, db, request):
+    client.post("/sensors/", json={
+        "name": "Gauge", "type": "water_level", "location": "Harbor", "latitude": 1.5, "longitude": 2.5,
+    }, headers=admin_headers)
+    client.post("/incidents/", json={"title": "Matched", "severity": "low", "location": "Quay"}, headers=admin_headers)
+    # NULLs in every nullable column the hot lists return (written around the API, so removed again below)
+    user_id = db.execute(insert(models.User).values(
+        email="nulls@example.com", hashed_password="x", role=None, is_active=None
+    )).inserted_primary_key[0]
+    notification_id = db.execute(insert(models.Notification).values(
+        title=None, message=None, sent=None
+    )).inserted_primary_key[0]
+    db.commit()
+    request.addfinalizer(lambda: _delete(db, (models.Notification, notification_id), (models.User, user_id)))
+
+    for path, model, schema in [
+        ("/admin/users", models.User, schemas.UserOut),
+        ("/sensors/", models.Sensor, schemas.SensorOut),
+        ("/admin/notifications/", models.Notification, schemas.NotificationOut),
+    ]:
+        resp = client.get(path, headers=admin_headers)
+        assert resp.status_code == 200, resp.text
+        expected = [schema.model_validate(row).model_dump(mode="json") for row in db.query(model).all()]
+        assert resp.json() == expected
+
+    resp = client.get("/incidents/", params={"location": "Quay", "limit": 10})
+    incidents = db.query(models.Incident).filter_by(location="Quay").order_by(
+        models.Incident.reported_at.desc(), models.Incident.id.desc()
+    )
+    expected = schemas.IncidentPage(items=[schemas.IncidentOut.model_validate(row) for row in incidents])
+    assert resp.json() == expected.model_dump(mode="json")
+
+
+def test_incident_page_keeps_cursor(client, admin_headers):
+    for i in range(3):
+        client.post("/incidents/", json={"title": f"Fast {i}", "severity": "low", "location": "Dock"}, headers=admin_headers)
+    page = client.get("/incidents/", params={"limit": 2, "location": "Dock"}).json()
+    assert [item["title"] for item in page["items"]] == ["Fast 2", "Fast 1"]
+    rest = client.get("/incidents/", params={"limit": 2, "location": "Dock", "cursor": page["next_cursor"]}).json()
+    assert [item["title"] for item in rest["items"]] == ["Fast 0"] and rest["next_cursor"] is None
+
+
+def test_encoding_details():
+    when = datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=timezone.utc)
+    assert fast_json.dumps({"at": when}) == b'{"at":"2024-01-02T03:04:05.600000Z"}'
+
+    class Extra(BaseModel):
+        id: int
+        computed: str
+
+    with pytest.raises(ValueError, match="computed"):
+        fast_json.schema_columns(models.User, Extra)
+
+    class Strict(BaseModel):
+        id: int
+        role: str
+
+    with pytest.raises(ValueError, match="Optional.*role"):
+        fast_json.schema_columns(models.User, Strict)
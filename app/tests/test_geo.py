@@ -0,0 +1,46 @@
+import gc
+import random
+
+from app.utils.geo_index import GeoGridIndex, haversine_km
+
+
+def test_grid_index_matches_brute_force():
+    rng = random.Random(7)
+    points = {i: (rng.uniform(-60, 60), rng.uniform(-179.9, 179.9)) for i in range(5000)}
+    index = GeoGridIndex(cell_deg=0.5)
+    index.bulk_load((i, lat, lon) for i, (lat, lon) in points.items())
+    index.remove(0)
+    del points[0]
+
+    for lat, lon, radius in [(10.0, 20.0, 300.0), (0.0, 179.95, 150.0), (45.0, -120.0, 5.0)]:
+        expected = sorted(i for i, (plat, plon) in points.items() if haversine_km(lat, lon, plat, plon) <= radius)
+        assert sorted(i for i, _ in index.within(lat, lon, radius)) == expected
+
+
+def test_incidents_and_sensors_near(client, admin_headers):
+    incidents = [("Dam breach", 12.9716, 77.5946), ("Warehouse fire", 13.0827, 80.2707)]
+    for title, lat, lon in incidents:
+        resp = client.post("/incidents/", json={
+            "title": title, "severity": "high", "location": title, "latitude": lat, "longitude": lon
+        }, headers=admin_headers)
+        assert resp.status_code == 201, resp.text
+
+    resp = client.post("/sensors/", json={
+        "name": "Gauge 1", "type": "water_level", "location": "Lake", "latitude": 12.98, "longitude": 77.6
+    }, headers=admin_headers)
+    assert resp.status_code == 201, resp.text
+
+    near = client.get("/incidents/near", params={"lat": 12.97, "lon": 77.59, "radius_km": 10}).json()
+    assert [item["title"] for item in near] == ["Dam breach"]
+    assert near[0]["distance_km"] < 1
+
+    sensors = client.get("/sensors/near", params={"lat": 12.97, "lon": 77.59, "radius_km": 5}).json()
+    assert [s["name"] for s in sensors] == ["Gauge 1"]
+
+
+def test_bulk_load_leaves_the_collector_alone():
+    frozen = gc.get_freeze_count()
+    index = GeoGridIndex()
+    for batch in range(5):  # as repeated incremental polls would
+        index.bulk_load((batch * 100 + i, 1.0, 2.0) for i in range(100))
+    assert gc.isenabled() and gc.get_freeze_count() == frozen
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app import models
+
+INCIDENTS_URL = "/incidents/"
+
+
+def _create_incidents(client, admin_headers, location, count):
+    ids = []
+    for i in range(count):
+        resp = client.post(INCIDENTS_URL, json={
+            "title": f"Incident {i}", "severity": "high" if i % 2 else "low", "location": location
+        }, headers=admin_headers)
+        assert resp.status_code == 201, resp.text
+        ids.append(resp.json()["id"])
+    return ids
+
+
+def test_keyset_pagination_walks_every_incident_once(client, admin_headers):
+    ids = _create_incidents(client, admin_headers, "Pagination Town", 5)
+
+    seen, cursor = [], None
+    while True:
+        params = {"location": "Pagination Town", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(INCIDENTS_URL, params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(ids, reverse=True)
+
+
+def test_pagination_walks_undated_incidents_last(client, admin_headers, db):
+    ids = _create_incidents(client, admin_headers, "Undated Village", 4)
+    for incident_id, reported_at in zip(ids, [datetime(2024, 1, 1), datetime(2024, 1, 2), None, None]):
+        db.execute(update(models.Incident).where(models.Incident.id == incident_id).values(reported_at=reported_at))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        params = {"location": "Undated Village", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(INCIDENTS_URL, params=params)
+        assert resp.status_code == 200, resp.text
+        seen.extend(item["id"] for item in resp.json()["items"])
+        cursor = resp.json()["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == [ids[1], ids[0], ids[3], ids[2]]
+
+
+def test_incident_filters(client, admin_headers):
+    _create_incidents(client, admin_headers, "Filter City", 4)
+    page = client.get(INCIDENTS_URL, params={"location": "Filter City", "severity": "high"}).json()
+    assert len(page["items"]) == 2
+    assert {item["severity"] for item in page["items"]} == {"high"}
+    assert page["next_cursor"] is None
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get(INCIDENTS_URL, params={"cursor": "not-a-cursor"}).status_code == 400
@@ -0,0 +1,75 @@
+# app/tests/test_migrations.py
+import os
+import subprocess
+import sys
+
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+
+from app import migrate
+from app.config import settings
+from app.database import Base, engine
+
+
+def test_migrations_match_models():
+    with engine.connect() as connection:
+        diff = compare_metadata(MigrationContext.configure(connection), Base.metadata)
+    assert diff == [], "models changed without a migration: run `alembic revision --autogenerate`"
+
+
+def test_database_is_at_head(capsys):
+    script = ScriptDirectory.from_config(migrate.alembic_config())
+    assert migrate.head_revision() == script.get_current_head()  # the startup parser agrees with Alembic
+    assert migrate.current_revision() == migrate.head_revision()
+    assert migrate.main(["check"]) == 0
+    assert migrate.head_revision() in capsys.readouterr().out
+
+
+def test_head_parser_follows_merge_revisions(tmp_path):
+    def version(name, body):
+        (tmp_path / f"{name}.py").write_text(f"revision: str = '{name}'\n{body}\n")
+
+    version("a1", "down_revision = None")
+    version("b1", "down_revision: Union[str, None] = 'a1'")
+    version("b2", "down_revision = 'a1'")
+    assert migrate._heads(tmp_path) == {"b1", "b2"}
+
+    version("m1", "down_revision: Union[str, Sequence[str], None] = ('b1', 'b2')")
+    assert migrate._heads(tmp_path) == {"m1"}
+
+    version("x1", "down_revision = compute_parent()")
+    assert migrate._heads(tmp_path) is None  # not a literal: head_revision asks Alembic
+
+
+def test_startup_check_modes(monkeypatch):
+    monkeypatch.setattr(migrate, "current_revision", lambda: None)
+
+    monkeypatch.setattr(settings, "db_schema_check", "strict")
+    with pytest.raises(RuntimeError, match="python -m app.migrate"):
+        migrate.check_schema_version()
+
+    monkeypatch.setattr(settings, "db_schema_check", "warn")
+    migrate.check_schema_version()  # logs only
+    assert migrate.main(["check"]) == 1
+
+
+def test_pre_migration_database_is_stamped_and_upgraded(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    config = migrate.alembic_config()
+    config.set_main_option("sqlalchemy.url", url)
+    command.upgrade(config, migrate.BASELINE_REVISION)
+    legacy = create_engine(url)
+    with legacy.begin() as connection:
+        connection.execute(text("DROP TABLE alembic_version"))  # as the old create_all startup left it
+
+    subprocess.run(
+        [sys.executable, "-m", "app.migrate"], cwd=migrate.ROOT, env={**os.environ, "DATABASE_URL": url},
+        check=True, capture_output=True,
+    )
+    with legacy.connect() as connection:
+        assert compare_metadata(MigrationContext.configure(connection), Base.metadata) == []
+    legacy.dispose()
@@ -0,0 +1,51 @@
+# app/tests/test_password_pool.py
+import asyncio
+
+import pytest
+
+from app.utils.password_pool import PasswordHasherPool, PasswordPoolBusy, password_pool
+
+
+def test_pool_hashes_verifies_and_sheds_load():
+    pool = PasswordHasherPool(workers=1, max_pending=1)
+
+    async def run():
+        hashed = await pool.hash("s3cret")
+        assert await pool.verify("s3cret", hashed)
+        assert not await pool.verify("wrong", hashed)
+
+        first = asyncio.ensure_future(pool.hash("a"))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordPoolBusy):
+            await pool.hash("b")
+        await first
+
+    try:
+        asyncio.run(run())
+    finally:
+        pool.shutdown()
+    stats = pool.stats()
+    assert stats["completed"] == 4 and stats["rejected"] == 1 and stats["pending"] == 0
+
+
+def test_login_answers_503_when_pool_is_saturated(client, user_headers, monkeypatch):
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    resp = client.post("/auth/token", data={"username": "responder@example.com", "password": "password123"})
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
+
+
+def test_explicit_zero_is_not_replaced_by_the_settings_default():
+    pool = PasswordHasherPool(workers=1, max_pending=0)
+    assert pool.max_pending == 0
+    with pytest.raises(PasswordPoolBusy):
+        pool.hash_sync("never queued")
+    assert pool.stats()["rejected"] == 1
+
+
+def test_admin_password_change_answers_503_with_retry_after(client, admin_headers, monkeypatch):
+    user_id = client.post("/auth/register", json={"email": "busy@example.com", "password": "password123"}).json()["id"]
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    resp = client.put(f"/admin/users/{user_id}", json={"password": "password456"}, headers=admin_headers)
+    assert resp.status_code == 503
+    assert resp.headers["retry-after"] == "1"
@@ -0,0 +1,88 @@
+# app/tests/test_query_counts.py
+import json
+import logging
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+from app import models
+from app.database import SessionLocal
+from app.utils import report_summary
+from app.utils.query_counter import COUNT_HEADER, QueryProfileMiddleware
+
+
+def _queries(resp) -> int:
+    assert resp.status_code == 200, resp.text
+    return int(resp.headers[COUNT_HEADER])
+
+
+def test_enrolled_courses_query_count_is_flat(client, admin_headers, user_headers):
+    def enroll(count):
+        for i in range(count):
+            course = client.post("/courses/", json={"title": f"Flat {i}", "description": "N+1"}, headers=admin_headers)
+            client.post(f"/courses/{course.json()['id']}/enroll", headers=user_headers)
+        return client.get("/courses/enrolled", headers=user_headers)
+
+    few = enroll(1)
+    few_count = _queries(enroll(0))  # warm the auth cache before measuring
+    many = enroll(10)
+    assert len(many.json()["enrolled_courses"]) == len(few.json()["enrolled_courses"]) + 10
+    assert _queries(many) == few_count
+
+
+def test_user_delete_cascades_in_the_database(client, admin_headers, db):
+    client.get("/admin/users", headers=admin_headers)  # warm the auth cache
+
+    def delete_user_with(children):
+        email = f"cascade{children}@example.com"
+        user_id = client.post("/auth/register", json={"email": email, "password": "password123"}).json()["id"]
+        db.execute(insert(models.Incident), [
+            {"title": "Flood", "severity": "high", "location": "Dock", "assigned_to": user_id} for _ in range(children)
+        ])
+        db.execute(insert(models.Notification), [
+            {"title": "Alert", "message": "Move", "target_user_id": user_id, "sent": True} for _ in range(children)
+        ])
+        report_summary.count_created(db, [(None, None, user_id)] * children, sent=True)
+        db.commit()
+        return user_id, _queries(client.delete(f"/admin/users/{user_id}", headers=admin_headers))
+
+    small_id, small = delete_user_with(1)
+    large_id, large = delete_user_with(25)
+    assert small == large
+
+    assert db.scalars(select(models.Incident.id).where(models.Incident.assigned_to == large_id)).all() == []
+    assert db.scalars(select(models.Notification.id).where(models.Notification.target_user_id == large_id)).all() == []
+    today = date.today()
+    assert report_summary.read_daily(db, today, today, report_summary.SCOPE_RECIPIENT, large_id)[0]["total"] == 0
+
+
+def test_server_timing_reports_db_time(client, admin_headers):
+    resp = client.get("/admin/users", headers=admin_headers)
+    timing = {metric.split(";")[0]: metric for metric in resp.headers["Server-Timing"].split(", ")}
+    assert set(timing) == {"db", "db-slowest", "app"}
+    assert f'desc="{resp.headers[COUNT_HEADER]} queries"' in timing["db"]
+
+
+def test_repeated_statements_are_flagged(caplog):
+    probe = FastAPI()
+    probe.add_middleware(QueryProfileMiddleware, repeat_threshold=3)  # Server-Timing off by default
+
+    @probe.get("/probe/{times}")
+    def repeat_lookup(times: int):
+        with SessionLocal() as session:
+            for user_id in range(times):  # a per-row lookup, as a lazy load would issue
+                session.execute(select(models.User.email).where(models.User.id == user_id)).all()
+        return {}
+
+    with TestClient(probe) as probe_client, caplog.at_level(logging.DEBUG, logger="app.requests"):
+        assert "server-timing" not in probe_client.get("/probe/2").headers
+        probe_client.get("/probe/4")
+
+    records = [record for record in caplog.records if record.name == "app.requests"]
+    assert [record.levelno for record in records] == [logging.DEBUG, logging.WARNING]
+    quiet, flagged = [json.loads(record.getMessage()) for record in records]
+    assert quiet["db_queries"] == 2 and "probable_n_plus_one" not in quiet
+    assert flagged["route"] == "/probe/{times}" and flagged["db_queries"] == 4
+    assert flagged["probable_n_plus_one"][0]["count"] == 4
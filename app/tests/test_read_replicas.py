@@ -0,0 +1,93 @@
+# app/tests/test_read_replicas.py
+import time
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import database, models
+from app.database import ReadRouter
+
+
+def test_read_router_round_robin_and_read_your_writes():
+    router = ReadRouter(replica_count=2, window_seconds=60)
+    assert [router.choose(None) for _ in range(4)] == [0, 1, 0, 1]
+
+    assert router.choose(time.time() - 1) is None          # sticks to the primary after a recent write
+    assert router.choose(time.time() - 120) is not None    # an old write no longer does
+    assert router.stats()["primary_reads"] == 1
+
+    assert ReadRouter(replica_count=0, window_seconds=60).choose(None) is None
+
+
+def test_write_marker_is_signed():
+    marker = database.sign_write_marker(1700000000.5)
+    assert database.read_write_marker(marker) == 1700000000.5
+    digest = marker.rpartition(".")[2]
+    assert database.read_write_marker(f"1800000000.000.{digest}") is None  # forged timestamp
+    assert database.read_write_marker("garbage") is None
+    assert database.read_write_marker(None) is None
+
+
+def test_only_commits_that_wrote_are_remembered(db):
+    writes = []
+    token = database._request_writes.set(writes)
+    try:
+        db.execute(select(models.Course.id)).all()
+        db.commit()                                 # a read-only commit
+        assert writes == []
+
+        db.add(models.Course(title="marker", description=None))
+        db.commit()
+        assert len(writes) == 1
+
+        db.execute(update(models.Course).where(models.Course.title == "marker").values(description="x"))
+        db.commit()                                 # Core DML through the session counts too
+        assert len(writes) == 2
+
+        db.add(models.Course(title="rolled back", description=None))
+        db.flush()
+        db.rollback()
+        db.commit()
+        assert len(writes) == 2
+    finally:
+        database._request_writes.reset(token)
+
+
+def _replica(tmp_path, name: str):
+    path = tmp_path / f"{name}.db"
+    engine = create_engine(f"sqlite:///{path}")
+    database.Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(models.Course.__table__.insert(), [{"title": f"from-{name}", "description": None}])
+    engine.dispose()
+    # aiosqlite uses a NullPool, so there is nothing to dispose afterwards
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    return async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def test_get_routes_read_from_replicas_until_client_writes(client, admin_headers, user_headers, tmp_path, monkeypatch):
+    replicas = [_replica(tmp_path, "r0"), _replica(tmp_path, "r1")]
+    monkeypatch.setattr(database, "AsyncReplicaSessionLocal", replicas)
+    monkeypatch.setattr(database, "read_router", ReadRouter(replica_count=2, window_seconds=60))
+
+    def titles(headers):
+        resp = client.get("/courses/", headers=headers)
+        assert resp.status_code == 200, resp.text
+        return {course["title"] for course in resp.json()}
+
+    assert titles(user_headers) == {"from-r0"}
+    assert titles(user_headers) == {"from-r1"}
+
+    resp = client.post("/courses/", json={"title": "fresh", "description": "x"}, headers=admin_headers)
+    assert resp.status_code == 200, resp.text
+    marker = resp.headers[database.WRITE_MARKER_HEADER]
+    assert database.WRITE_MARKER_COOKIE in resp.cookies
+    try:
+        assert "fresh" in titles(admin_headers)       # the cookie keeps the writer on the primary
+        client.cookies.clear()
+        # Any worker honours the echoed header: nothing about the write is kept in-process
+        assert "fresh" in titles({**user_headers, database.WRITE_MARKER_HEADER: marker})
+        assert titles(user_headers) <= {"from-r0", "from-r1"}
+        assert titles({**user_headers, database.WRITE_MARKER_HEADER: marker.replace(".", ".9", 1)}) <= {"from-r0", "from-r1"}
+    finally:
+        client.cookies.clear()
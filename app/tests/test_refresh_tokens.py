@@ -0,0 +1,45 @@
+# app/tests/test_refresh_tokens.py
+
+
+def _login(client, email):
+    client.post("/auth/register", json={"email": email, "password": "password123", "role": "responder"})
+    resp = client.post("/auth/token", data={"username": email, "password": "password123"})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_refresh_rotates_and_issues_access_token(client):
+    tokens = _login(client, "refresh@example.com")
+    assert tokens["refresh_token"] and tokens["expires_in"] > 0
+
+    resp = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert resp.status_code == 200, resp.text
+    rotated = resp.json()
+    assert rotated["refresh_token"] != tokens["refresh_token"]
+    headers = {"Authorization": f"Bearer {rotated['access_token']}"}
+    assert client.get("/auth/profile", headers=headers).json()["email"] == "refresh@example.com"
+
+    # The new refresh token keeps working
+    assert client.post("/auth/refresh", json={"refresh_token": rotated["refresh_token"]}).status_code == 200
+
+
+def test_reusing_a_rotated_token_revokes_the_session(client):
+    tokens = _login(client, "reuse@example.com")
+    first = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).json()
+
+    # Replaying the old token is detected ...
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    # ... and the legitimate successor is revoked with it
+    assert client.post("/auth/refresh", json={"refresh_token": first["refresh_token"]}).status_code == 401
+
+
+def test_logout_revokes_refresh_session(client):
+    tokens = _login(client, "refresh-logout@example.com")
+    resp = client.post(
+        "/auth/logout",
+        json={"refresh_token": tokens["refresh_token"]},
+        headers={"Authorization": f"Bearer {tokens['access_token']}"},
+    )
+    assert resp.status_code == 200
+    assert client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]}).status_code == 401
+    assert client.post("/auth/refresh", json={"refresh_token": "garbage"}).status_code == 401
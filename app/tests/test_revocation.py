@@ -0,0 +1,67 @@
+# app/tests/test_revocation.py
+import time
+from datetime import datetime
+
+from jose import jwt
+from sqlalchemy import func
+
+from app import auth, models
+from app.utils.revocation import RevocationList
+
+
+def _login(client, email):
+    client.post("/auth/register", json={"email": email, "password": "password123", "role": "responder"})
+    resp = client.post("/auth/token", data={"username": email, "password": "password123"})
+    return resp.json()["access_token"]
+
+
+def test_logout_revokes_the_token(client):
+    token = _login(client, "logout@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/auth/profile", headers=headers).status_code == 200
+
+    assert client.post("/auth/logout", headers=headers).status_code == 200
+    assert client.get("/auth/profile", headers=headers).status_code == 401
+    assert auth.decode_token(token) is None
+
+    # Other sessions of the same user stay valid
+    other = _login(client, "logout@example.com")
+    assert client.get("/auth/profile", headers={"Authorization": f"Bearer {other}"}).status_code == 200
+
+
+def test_revocations_sync_to_other_workers(client, db):
+    token = _login(client, "sync@example.com")
+    client.post("/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    claims = jwt.get_unverified_claims(token)
+
+    other_worker = RevocationList()
+    assert not other_worker.is_revoked(claims["jti"], claims["exp"])
+    assert other_worker.sync(db) >= 1
+    assert other_worker.is_revoked(claims["jti"], claims["exp"])
+    assert other_worker.sync(db) == 0  # watermark: nothing new
+
+
+def test_expired_entries_are_not_kept(db):
+    revocations = RevocationList()
+    revocations.revoke(db, "already-expired", time.time() - 10)
+    assert len(revocations) == 0
+    revocations.purge(db)
+    assert db.query(models.RevokedToken).filter_by(jti="already-expired").count() == 0
+
+
+def test_sync_rereads_ids_committed_behind_the_watermark(db):
+    exp = time.time() + 3600
+    expires_at = datetime.utcfromtimestamp(exp)
+    base = (db.query(func.max(models.RevokedToken.id)).scalar() or 0) + 10
+    worker = RevocationList()
+
+    # A later id commits first ...
+    db.add(models.RevokedToken(id=base + 2, jti="committed-first", expires_at=expires_at))
+    db.commit()
+    assert worker.sync(db) >= 1
+
+    # ... then the transaction holding the lower id commits
+    db.add(models.RevokedToken(id=base + 1, jti="committed-late", expires_at=expires_at))
+    db.commit()
+    assert worker.sync(db) == 1
+    assert worker.is_revoked("committed-late", exp)
@@ -0,0 +1,110 @@
+import json
+from datetime import datetime
+
+from app import crud, models, schemas
+from app.utils import timeseries
+
+BATCH_URL = "/sensors/readings:batch"
+
+
+def _make_sensors(db, count):
+    sensors = [models.Sensor(type="water_level", location=f"River gauge {i}", last_reported_at=datetime(2025, 1, 1)) for i in range(count)]
+    db.add_all(sensors)
+    db.commit()
+    return [s.id for s in sensors]
+
+
+def test_batch_ingest_json_array(client, user_headers, db):
+    sensor_ids = _make_sensors(db, 3)
+    readings = [
+        {"sensor_id": sid, "metric": "water_level", "value": float(i),
+         "recorded_at": f"2026-01-01T00:0{i}:00"}
+        for sid in sensor_ids for i in range(5)
+    ]
+    resp = client.post(BATCH_URL, json=readings, headers=user_headers)
+    assert resp.status_code == 201, resp.text
+    assert resp.json() == {"accepted": 15, "sensors_updated": 3}
+
+    db.expire_all()
+    for sid in sensor_ids:
+        sensor = db.get(models.Sensor, sid)
+        assert sensor.last_reported_at.replace(tzinfo=None) == datetime(2026, 1, 1, 0, 4)
+        assert db.query(models.SensorReading).filter_by(sensor_id=sid).count() == 5
+
+
+def test_batch_ingest_ndjson(client, user_headers, db):
+    (sensor_id,) = _make_sensors(db, 1)
+    body = "\n".join(json.dumps({"sensor_id": sensor_id, "value": v}) for v in (1.5, 2.5)) + "\n"
+    resp = client.post(
+        BATCH_URL, content=body,
+        headers={**user_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 201, resp.text
+    assert resp.json()["accepted"] == 2
+
+
+def test_batch_ingest_rejects_unknown_sensor(client, user_headers):
+    resp = client.post(BATCH_URL, json=[{"sensor_id": 999999, "value": 1}], headers=user_headers)
+    assert resp.status_code == 404
+
+
+def test_batch_ingest_validates_payload(client, user_headers):
+    resp = client.post(BATCH_URL, json=[{"sensor_id": "abc"}], headers=user_headers)
+    assert resp.status_code == 422
+
+
+def test_series_reads_coarsest_rollup(client, user_headers, db):
+    (sensor_id,) = _make_sensors(db, 1)
+    first = [{"sensor_id": sensor_id, "metric": "water_level", "value": float(m),
+              "recorded_at": f"2026-02-01T00:{m:02d}:00"} for m in range(0, 60, 10)]
+    second = [{"sensor_id": sensor_id, "metric": "water_level", "value": 100.0,
+               "recorded_at": "2026-02-01T01:30:00"}]
+    for batch in (first, second):
+        assert client.post(BATCH_URL, json=batch, headers=user_headers).status_code == 201
+
+    url = f"/sensors/{sensor_id}/series"
+    params = {"from": "2026-02-01T00:00:00", "to": "2026-02-01T02:00:00", "metric": "water_level"}
+
+    hourly = client.get(url, params={**params, "resolution": "1h"}).json()
+    assert hourly["source"] == "1h"
+    assert [(p["count"], p["min"], p["max"], p["mean"]) for p in hourly["points"]] == [
+        (6, 0.0, 50.0, 25.0), (1, 100.0, 100.0, 100.0)
+    ]
+
+    five_min = client.get(url, params={**params, "resolution": "5m"}).json()
+    assert five_min["source"] == "1m"
+    assert sum(p["count"] for p in five_min["points"]) == 7
+
+    raw = client.get(url, params={**params, "resolution": "30s"}).json()
+    assert raw["source"] == "raw"
+    assert len(raw["points"]) == 7
+
+
+def test_series_rejects_bad_resolution(client, db):
+    (sensor_id,) = _make_sensors(db, 1)
+    resp = client.get(f"/sensors/{sensor_id}/series", params={"resolution": "soon"})
+    assert resp.status_code == 400
+
+
+def test_batch_summary_keeps_the_latest_value_of_every_metric(db):
+    (sensor_id,) = _make_sensors(db, 1)
+    readings = [
+        schemas.SensorReadingIn(sensor_id=sensor_id, metric="temp", value=20.0, recorded_at=datetime(2026, 2, 1, 0, 0)),
+        schemas.SensorReadingIn(sensor_id=sensor_id, metric="temp", value=21.0, recorded_at=datetime(2026, 2, 1, 0, 1)),
+        schemas.SensorReadingIn(sensor_id=sensor_id, metric="level", value=1.0, recorded_at=datetime(2026, 2, 1, 0, 5)),
+    ]
+    (summary,) = crud.bulk_insert_sensor_readings(db, readings)
+    assert summary["latest"] == {"temp": 21.0, "level": 1.0}
+    assert summary["last_reported_at"] == datetime(2026, 2, 1, 0, 5)
+
+
+def test_rollups_are_upserted_in_key_order(monkeypatch):
+    seen = []
+    monkeypatch.setattr(timeseries, "upsert", lambda db, table, rows, key, merge: seen.extend(rows))
+    rows = [
+        {"sensor_id": sensor_id, "metric": metric, "value": 1.0, "recorded_at": datetime(2026, 3, 1, hour)}
+        for sensor_id, metric, hour in [(2, "b", 5), (1, "b", 0), (2, "a", 1), (1, "a", 3)]
+    ]
+    timeseries.apply_rollups(None, timeseries.build_rollups(rows))
+    keys = [(r["sensor_id"], r["metric"], r["resolution"], r["bucket_start"]) for r in seen]
+    assert keys == sorted(keys)
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+from starlette.requests import Request
+
+from app.routes import stream_routes
+from app.utils.pubsub import PubSub, broker
+
+INCIDENTS_URL = "/incidents/"
+
+
+def test_websocket_receives_filtered_incident_events(client, admin_headers):
+    with client.websocket_connect("/stream/incidents?severity=high") as ws:
+        for severity in ("low", "high"):
+            resp = client.post(INCIDENTS_URL, json={
+                "title": f"Flood ({severity})", "severity": severity, "location": "Riverside"
+            }, headers=admin_headers)
+            assert resp.status_code == 201, resp.text
+
+        event = json.loads(ws.receive_text())
+        assert event["type"] == "incident.created"
+        assert event["data"]["severity"] == "high"
+        assert event["data"]["title"] == "Flood (high)"
+
+
+def test_event_is_serialized_once_for_all_subscribers():
+    async def scenario():
+        broker = PubSub()
+        subscribers = [broker.subscribe("sensors", location="harbor") for _ in range(50)]
+        other = broker.subscribe("sensors", location="airport")
+
+        broker.publish("sensors", "sensor.readings", {"sensor_id": 1}, location="North Harbor")
+        events = [await sub.get() for sub in subscribers]
+        assert all(event is events[0] for event in events)
+        assert other.queue.empty()
+
+        await subscribers[0].__aexit__(None, None, None)
+        assert broker.subscriber_count("sensors") == 50
+
+    asyncio.run(scenario())
+
+
+class _FakeAsyncRedis:
+    """Stands in for `redis.asyncio.Redis` and records each publish."""
+
+    def __init__(self):
+        self.published = []
+
+    async def publish(self, channel, message):
+        asyncio.get_running_loop()  # only ever awaited on the event loop
+        self.published.append((channel, json.loads(message)["type"]))
+
+    async def close(self):
+        pass
+
+
+def test_redis_publish_is_scheduled_on_the_loop_from_handlers_and_threads():
+    async def scenario():
+        broker = PubSub()
+        broker._redis, broker._loop = _FakeAsyncRedis(), asyncio.get_running_loop()
+        local = broker.subscribe("incidents")
+
+        broker.publish("incidents", "incident.created", {"id": 1})  # an async handler
+        await asyncio.to_thread(broker.publish, "incidents", "incident.deleted", {"id": 1})  # the threadpool
+        redis = broker._redis
+        await broker.stop()
+
+        assert redis.published == [
+            ("aidrp:stream:incidents", "incident.created"),
+            ("aidrp:stream:incidents", "incident.deleted"),
+        ]
+        assert local.queue.empty()  # delivered by the relay, not locally
+
+    asyncio.run(scenario())
+
+
+def test_sse_subscribes_only_while_the_body_streams():
+    async def scenario():
+        before = broker.subscriber_count("incidents")
+        request = Request({"type": "http", "method": "GET", "path": "/stream/incidents", "headers": []})
+        response = stream_routes._sse_response(request, "incidents")
+        assert broker.subscriber_count("incidents") == before  # never sent: nothing to leak
+
+        body = response.body_iterator
+        assert await body.__anext__() == ": connected\n\n"
+        assert broker.subscriber_count("incidents") == before + 1
+        await body.aclose()
+        assert broker.subscriber_count("incidents") == before
+
+    asyncio.run(scenario())
@@ -0,0 +1,64 @@
+# app/utils/allocation.py
+# Resource lookup table for allocation predictions (single + vectorized batch)
+# ==========================================================
+
+from functools import lru_cache
+from typing import List, Sequence
+
+RESOURCE_TABLE = {
+    "fire": ("Fire Truck", "Water Tank"),
+    "flood": ("Boats", "Rescue Team"),
+    "earthquake": ("Ambulance", "Rescue Team"),
+}
+DEFAULT_RESOURCES = ("General Rescue Team",)
+
+# Below this many incidents the pandas/NumPy setup costs more than a plain dict loop
+VECTORIZE_THRESHOLD = 512
+
+_ROWS = list(RESOURCE_TABLE.values()) + [DEFAULT_RESOURCES]
+_MAX_LEN = max(len(resources) for resources in _ROWS)
+
+
+# ----------------------------------------------------------
+# Encoded lookup table: one row per incident type (+ default row), one
+# column per clipped severity, each cell holding `resources[:severity]`.
+# Built on first batch call so workers don't import pandas/NumPy at startup.
+# ----------------------------------------------------------
+@lru_cache(maxsize=1)
+def _lookup():
+    import numpy as np
+    import pandas as pd
+
+    table = np.empty((len(_ROWS), 2 * _MAX_LEN + 1), dtype=object)
+    for row, resources in enumerate(_ROWS):
+        for severity in range(-_MAX_LEN, _MAX_LEN + 1):
+            table[row, severity + _MAX_LEN] = resources[:severity]
+    return np, pd, pd.Index(list(RESOURCE_TABLE)), table
+
+
+def allocate(incident_type: str, severity: int) -> List[str]:
+    """Resources for a single incident (same slicing semantics as the batch path)."""
+    needed = RESOURCE_TABLE.get(incident_type.lower(), DEFAULT_RESOURCES)
+    return list(needed[:severity])
+
+
+def allocate_batch(incident_types: Sequence[str], severities: Sequence[int]) -> Sequence[tuple]:
+    """
+    Resources for many incidents in one vectorized pass.
+
+    Incident types are lower-cased and encoded against the lookup table in
+    a single pandas operation; severities are clipped to the table width so
+    Python slice semantics (including negative severities) are preserved.
+    Returns resource tuples aligned with the inputs.
+    """
+    if len(incident_types) < VECTORIZE_THRESHOLD:
+        return [
+            RESOURCE_TABLE.get(t.lower(), DEFAULT_RESOURCES)[:s]
+            for t, s in zip(incident_types, severities)
+        ]
+    np, pd, type_index, table = _lookup()
+    codes = type_index.get_indexer(pd.Series(incident_types, dtype=object).str.lower())
+    codes[codes < 0] = len(_ROWS) - 1
+    columns = np.clip(np.asarray(severities, dtype=np.int64), -_MAX_LEN, _MAX_LEN) + _MAX_LEN
+    return table[codes, columns]
+
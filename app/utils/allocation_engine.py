@@ -0,0 +1,268 @@
+# app/utils/allocation_engine.py
+# Global resource assignment across concurrent incidents
+# ==========================================================
+#
+# Each incident's demand comes from the allocation lookup table (one unit
+# per resource type). Incidents are served in priority order (highest
+# severity first) from a heap, and every demand is filled with the nearest
+# free unit of that type. Free units live in one NumPy array per resource
+# type, so a nearest-unit lookup is a single vectorized haversine + argmin.
+#
+# The planner keeps its state between calls: updating or removing a single
+# incident only releases and re-assigns that incident's units and offers
+# the freed units to incidents that are still short, without re-solving the
+# whole plan. Incremental updates never preempt units already assigned;
+# post a fresh plan to re-balance everything.
+#
+# That state is the module-level `planner`, one per worker process. The
+# routes persist every change as a `snapshot()` in the allocation_plans row
+# under a bumped version, and a worker that sees a version other than its
+# own `restore()`s the snapshot before serving, so all workers (and restarts)
+# share one plan.
+
+import heapq
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.allocation import allocate
+
+EARTH_RADIUS_KM = 6371.0088
+DEADLINE_CHECK_EVERY = 128
+
+
+class _TypePool:
+    """All units of one resource type plus a free mask."""
+
+    def __init__(self, units: List[dict]):
+        self.ids = [unit["id"] for unit in units]
+        self.lat = np.radians(np.array([_coord(unit.get("latitude")) for unit in units], dtype=float))
+        self.lon = np.radians(np.array([_coord(unit.get("longitude")) for unit in units], dtype=float))
+        self.located = ~(np.isnan(self.lat) | np.isnan(self.lon))
+        self.cos_lat = np.cos(self.lat)
+        self.free = np.ones(len(units), dtype=bool)
+        self.free_count = len(units)
+
+    def take_nearest(self, lat: Optional[float], lon: Optional[float]) -> Optional[Tuple[int, Optional[float]]]:
+        """Claim the nearest free unit; units without coordinates are used last."""
+        if self.free_count == 0:
+            return None
+
+        distance = None
+        candidates = self.free & self.located
+        if lat is not None and lon is not None and candidates.any():
+            phi, lmb = np.radians(lat), np.radians(lon)
+            a = (np.sin((self.lat - phi) / 2) ** 2
+                 + np.cos(phi) * self.cos_lat * np.sin((self.lon - lmb) / 2) ** 2)
+            a = np.where(candidates, a, np.inf)
+            index = int(np.argmin(a))
+            distance = float(2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(min(a[index], 1.0))))
+        else:
+            index = int(np.argmax(self.free))
+
+        self.free[index] = False
+        self.free_count -= 1
+        return index, distance
+
+    def release(self, index: int) -> None:
+        if not self.free[index]:
+            self.free[index] = True
+            self.free_count += 1
+
+
+def _coord(value) -> float:
+    return np.nan if value is None else value
+
+
+def _priority(incident: dict) -> Tuple[int, int]:
+    return -incident["severity"], incident["id"]
+
+
+class AllocationPlanner:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset([], [])
+        self.version = 0  # allocation_plans.version this state was loaded from or saved as
+
+    # -------- state --------
+    def _reset(self, incidents: List[dict], resources: List[dict]) -> None:
+        ids = [unit["id"] for unit in resources]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Resource unit ids must be unique")
+        incident_ids = [incident["id"] for incident in incidents]
+        if len(incident_ids) != len(set(incident_ids)):
+            raise ValueError("Incident ids must be unique")
+
+        by_type: Dict[str, List[dict]] = {}
+        for unit in resources:
+            by_type.setdefault(unit["resource_type"].lower(), []).append(unit)
+
+        self.resources = resources
+        self.pools = {rtype: _TypePool(units) for rtype, units in by_type.items()}
+        self.incidents: Dict[int, dict] = {incident["id"]: incident for incident in incidents}
+        self.resource_count = len(resources)
+        # incident id -> [(resource type, pool index, distance_km)]
+        self.assignments: Dict[int, List[Tuple[str, int, Optional[float]]]] = {}
+        # incident id -> resource types still missing
+        self.unmet: Dict[int, List[str]] = {}
+        self.complete = True
+        self.solve_ms = 0.0
+
+    def _assign(self, incident: dict, demand: Iterable[str]) -> None:
+        assigned = self.assignments.setdefault(incident["id"], [])
+        missing = []
+        for rtype in demand:
+            pool = self.pools.get(rtype.lower())
+            hit = pool.take_nearest(incident.get("latitude"), incident.get("longitude")) if pool else None
+            if hit is None:
+                missing.append(rtype)
+            else:
+                assigned.append((rtype, hit[0], hit[1]))
+        if missing:
+            self.unmet[incident["id"]] = missing
+        else:
+            self.unmet.pop(incident["id"], None)
+        if not assigned:
+            del self.assignments[incident["id"]]
+
+    def _release(self, incident_id: int) -> set:
+        freed = set()
+        for rtype, index, _ in self.assignments.pop(incident_id, []):
+            self.pools[rtype.lower()].release(index)
+            freed.add(rtype.lower())
+        self.unmet.pop(incident_id, None)
+        return freed
+
+    def _fill_unmet(self, freed_types: set) -> None:
+        if not freed_types:
+            return
+        waiting = sorted(
+            (incident_id for incident_id, missing in self.unmet.items()
+             if any(rtype.lower() in freed_types for rtype in missing)),
+            key=lambda incident_id: _priority(self.incidents[incident_id]),
+        )
+        for incident_id in waiting:
+            self._assign(self.incidents[incident_id], list(self.unmet[incident_id]))
+
+    # -------- public API --------
+    def solve(self, incidents: List[dict], resources: List[dict], time_budget_ms: float = 800) -> dict:
+        """Build a fresh plan; incidents left when the time budget runs out stay unmet."""
+        started = time.perf_counter()
+        deadline = started + time_budget_ms / 1000.0
+        with self._lock:
+            self._reset(incidents, resources)
+            heap = [(*_priority(incident), incident["id"]) for incident in incidents]
+            heapq.heapify(heap)
+
+            served = 0
+            while heap:
+                if served % DEADLINE_CHECK_EVERY == 0 and time.perf_counter() > deadline:
+                    self.complete = False
+                    break
+                incident = self.incidents[heapq.heappop(heap)[-1]]
+                self._assign(incident, allocate(incident["incident_type"], incident["severity"]))
+                served += 1
+
+            for *_, incident_id in heap:
+                incident = self.incidents[incident_id]
+                demand = allocate(incident["incident_type"], incident["severity"])
+                if demand:
+                    self.unmet[incident_id] = demand
+
+            self.solve_ms = (time.perf_counter() - started) * 1000
+            return self._plan()
+
+    def update_incident(self, incident: dict) -> dict:
+        """Re-plan one new or changed incident without touching the others."""
+        started = time.perf_counter()
+        with self._lock:
+            freed = self._release(incident["id"])
+            self.incidents[incident["id"]] = incident
+            # Queue the incident with everyone else still short, so the units it
+            # just freed go to a waiting higher-severity incident before it
+            demand = allocate(incident["incident_type"], incident["severity"])
+            if demand:
+                self.unmet[incident["id"]] = demand
+            self._fill_unmet(freed | {rtype.lower() for rtype in demand})
+            self.solve_ms = (time.perf_counter() - started) * 1000
+            return self._plan()
+
+    def remove_incident(self, incident_id: int) -> dict:
+        """Release a closed incident's units to incidents that are still short."""
+        started = time.perf_counter()
+        with self._lock:
+            if incident_id not in self.incidents:
+                raise KeyError(incident_id)
+            freed = self._release(incident_id)
+            del self.incidents[incident_id]
+            self._fill_unmet(freed)
+            self.solve_ms = (time.perf_counter() - started) * 1000
+            return self._plan()
+
+    def plan(self) -> dict:
+        with self._lock:
+            return self._plan()
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state; `restore` rebuilds an identical planner from it."""
+        with self._lock:
+            return {
+                "incidents": list(self.incidents.values()),
+                "resources": self.resources,
+                "assignments": [
+                    [incident_id, rtype, self.pools[rtype.lower()].ids[index], distance]
+                    for incident_id, units in self.assignments.items()
+                    for rtype, index, distance in units
+                ],
+                "unmet": [[incident_id, missing] for incident_id, missing in self.unmet.items()],
+                "complete": self.complete,
+                "solve_ms": self.solve_ms,
+            }
+
+    def restore(self, state: Optional[dict], version: int) -> None:
+        """Replace the current state with a `snapshot` (None: an empty plan) saved as `version`."""
+        with self._lock:
+            if state is None:
+                self._reset([], [])
+            else:
+                self._reset(state["incidents"], state["resources"])
+                index_of = {unit_id: index for pool in self.pools.values() for index, unit_id in enumerate(pool.ids)}
+                for incident_id, rtype, unit_id, distance in state["assignments"]:
+                    index = index_of[unit_id]
+                    pool = self.pools[rtype.lower()]
+                    pool.free[index] = False
+                    pool.free_count -= 1
+                    self.assignments.setdefault(incident_id, []).append((rtype, index, distance))
+                self.unmet = {incident_id: missing for incident_id, missing in state["unmet"]}
+                self.complete = state["complete"]
+                self.solve_ms = state["solve_ms"]
+            self.version = version
+
+    def _plan(self) -> dict:
+        assignments = []
+        for incident_id, units in self.assignments.items():
+            for rtype, index, distance in units:
+                assignments.append({
+                    "incident_id": incident_id,
+                    "resource_id": self.pools[rtype.lower()].ids[index],
+                    "resource_type": rtype,
+                    "distance_km": None if distance is None else round(distance, 3),
+                })
+        unmet = [
+            {"incident_id": incident_id, "resource_type": rtype}
+            for incident_id, missing in self.unmet.items()
+            for rtype in missing
+        ]
+        return {
+            "incidents": len(self.incidents),
+            "resources": self.resource_count,
+            "assignments": assignments,
+            "unmet": unmet,
+            "complete": self.complete,
+            "solve_ms": round(self.solve_ms, 3),
+        }
+
+
+planner = AllocationPlanner()
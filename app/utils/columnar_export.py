@@ -0,0 +1,150 @@
+# app/utils/columnar_export.py
+# Columnar (Parquet / Arrow IPC) table exports for analysts
+# ==========================================================
+#
+# Rows are fetched from a server-side cursor in `yield_per` partitions, and
+# each partition becomes one Arrow record batch (one Parquet row group)
+# that is written and flushed to the client before the next one is read.
+# Memory is bounded by the batch size, not by the table size, and no ORM
+# objects or Pydantic models are built along the way.
+
+import importlib.util
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, String, Text, select
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.database import SessionLocal
+
+EXPORT_BATCH_ROWS = 50_000
+FORMATS = {
+    "parquet": "application/vnd.apache.parquet",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# entity -> (model, column used for from/to filtering)
+EXPORTS = {
+    "incidents": (models.Incident, "reported_at"),
+    "sensors": (models.Sensor, "last_reported_at"),
+    "sensor_readings": (models.SensorReading, "recorded_at"),
+    "notifications": (models.Notification, "created_at"),
+}
+
+
+def available() -> bool:
+    # pyarrow is optional (the export routes answer 501 without it) and only imported on first export
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _pyarrow():
+    import pyarrow as pa
+    import pyarrow.ipc  # noqa: F401
+    import pyarrow.parquet as pq
+    return pa, pq
+
+
+def _arrow_type(pa, column):
+    sql_type = column.type
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, Float):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us", tz="UTC")  # naive values are stored as UTC
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    if isinstance(sql_type, (String, Text)):
+        return pa.string()
+    raise TypeError(f"No Arrow type for column {column.name} ({sql_type})")
+
+
+def resolve_columns(entity: str, names: Optional[List[str]] = None) -> List:
+    """Return the projected table columns; raises KeyError / ValueError on bad input."""
+    model, _ = EXPORTS[entity]
+    table_columns = {column.name: column for column in model.__table__.columns}
+    if not names:
+        return list(table_columns.values())
+    unknown = [name for name in names if name not in table_columns]
+    if unknown:
+        raise ValueError(f"Unknown column(s) for {entity}: {', '.join(unknown)}")
+    return [table_columns[name] for name in dict.fromkeys(names)]
+
+
+class _ChunkSink:
+    """Write-only file object that hands everything written so far to the stream."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def stream_export(
+    entity: str,
+    fmt: str,
+    columns: List,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_rows: int = EXPORT_BATCH_ROWS,
+    session_factory: sessionmaker = SessionLocal,
+) -> Iterator[bytes]:
+    """Yield the encoded export one record batch at a time; owns a session from `session_factory`."""
+    pa, pq = _pyarrow()
+    model, time_column = EXPORTS[entity]
+    schema = pa.schema([pa.field(column.name, _arrow_type(pa, column)) for column in columns])
+
+    query = select(*columns).order_by(model.__table__.c.id)
+    ts = model.__table__.c[time_column]
+    if start is not None:
+        query = query.where(ts >= start)
+    if end is not None:
+        query = query.where(ts < end)
+
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression="zstd"))
+        write = writer.write_batch
+
+    db = session_factory()
+    try:
+        result = db.execute(query.execution_options(yield_per=batch_rows))
+        for rows in result.partitions():
+            values = list(zip(*rows))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(values[i], type=field.type) for i, field in enumerate(schema)],
+                schema=schema,
+            )
+            write(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+        writer.close()
+        yield sink.drain()
+    finally:
+        db.close()
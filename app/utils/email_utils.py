@@ -1,14 +1,242 @@
 # app/utils/email_utils.py
+# smtplib / email are imported on first send rather than at worker startup.
 
-import smtplib
-from email.message import EmailMessage
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
 import logging
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 from app.config import settings  # Make sure settings has SMTP details
 
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import EmailMessage
+
 # Configure logger
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
+# (to_email, subject, body)
+Message = Tuple[str, str, str]
+
+
+# =========================================================
+# SMTP connection pool
+# =========================================================
+class _PooledConnection:
+    def __init__(self, server: "smtplib.SMTP"):
+        self.server = server
+        self.last_used = time.monotonic()
+        self.messages_sent = 0
+
+
+class SMTPPool:
+    """
+    Keeps up to `size` authenticated SMTP sessions open and hands them out
+    to senders, so TCP connect + STARTTLS + login happen once per session
+    instead of once per email. Sessions idle longer than `idle_timeout` are
+    closed, sessions idle longer than `health_check` are probed with NOOP
+    before reuse, and a session is recycled after `max_messages` sends.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        user: str = "",
+        password: str = "",
+        size: int = 4,
+        idle_timeout: float = 60.0,
+        health_check: float = 10.0,
+        max_messages: int = 100,
+    ):
+        self.host, self.port = host, port
+        self.user, self.password = user, password
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.max_messages = max_messages
+        self._idle: deque = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+
+    def _connect(self) -> _PooledConnection:
+        import smtplib
+
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        server.starttls()
+        if self.user and self.password:
+            server.login(self.user, self.password)
+        self.connections_opened += 1
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close(conn: _PooledConnection) -> None:
+        try:
+            conn.server.quit()
+        except Exception:
+            try:
+                conn.server.close()
+            except Exception:
+                pass
+
+    def _checkout(self) -> _PooledConnection:
+        import smtplib
+
+        while True:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._connect()
+
+            idle_for = time.monotonic() - conn.last_used
+            if idle_for > self.idle_timeout:
+                self._close(conn)
+                continue
+            if idle_for > self.health_check:
+                try:
+                    if conn.server.noop()[0] != 250:
+                        raise smtplib.SMTPException("NOOP failed")
+                except Exception:
+                    self._close(conn)
+                    continue
+            return conn
+
+    def _checkin(self, conn: _PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.messages_sent >= self.max_messages:
+            self._close(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a session; it is discarded instead of returned if the block raises."""
+        with self._slots:
+            conn = self._checkout()
+            try:
+                yield conn
+            except Exception:
+                self._close(conn)
+                raise
+            self._checkin(conn)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            self._close(conn)
+
+
+_pool: Optional[SMTPPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> SMTPPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = SMTPPool(
+                settings.smtp_host,
+                settings.smtp_port,
+                settings.smtp_user,
+                settings.smtp_password,
+                size=settings.smtp_pool_size,
+                idle_timeout=settings.smtp_idle_timeout_seconds,
+                health_check=settings.smtp_health_check_seconds,
+                max_messages=settings.smtp_max_messages_per_connection,
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close_all()
+
+
+# =========================================================
+# Sending
+# =========================================================
+def _build_message(to_email: str, subject: str, body: str) -> "EmailMessage":
+    from email.message import EmailMessage
+
+    msg = EmailMessage()
+    msg["Subject"] = subject
+    msg["From"] = getattr(settings, "from_email", None) or "no-reply@aidrp.com"
+    msg["To"] = to_email
+    msg.set_content(body)
+    return msg
+
+
+def _is_connection_error(e: Exception) -> bool:
+    import smtplib
+
+    # SMTPException subclasses OSError, so only bare socket errors count here
+    return isinstance(e, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)) or (
+        isinstance(e, OSError) and not isinstance(e, smtplib.SMTPException)
+    )
+
+
+def send_many(messages: Iterable[Message]) -> List[Optional[str]]:
+    """
+    Send a batch of emails over pooled SMTP sessions.
+
+    Messages are sent back to back on one authenticated session (a fresh
+    session is borrowed every `smtp_max_messages_per_connection` messages).
+    A message whose session dropped is retried once on a new session.
+
+    Returns:
+        list: One entry per message - None if it was sent, otherwise the error.
+    """
+    messages = list(messages)
+    if not settings.smtp_host:
+        logger.info("SMTP not configured; skipping sending %d email(s).", len(messages))
+        for to_email, subject, body in messages:
+            logger.info("Email to %s | Subject: %s | Body: %s", to_email, subject, body)
+        return [None] * len(messages)
+
+    import smtplib
+
+    pool = get_pool()
+    results: List[Optional[str]] = [None] * len(messages)
+    position = 0
+    retried = set()
+    while position < len(messages):
+        acquired = False
+        try:
+            with pool.connection() as conn:
+                acquired = True
+                while position < len(messages) and conn.messages_sent < pool.max_messages:
+                    to_email, subject, body = messages[position]
+                    try:
+                        conn.server.send_message(_build_message(to_email, subject, body))
+                    except smtplib.SMTPRecipientsRefused as e:
+                        results[position] = str(e)  # session is still usable
+                    conn.messages_sent += 1
+                    position += 1
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            if position not in retried and (not acquired or _is_connection_error(e)):
+                retried.add(position)  # stale session: retry once on a fresh one
+                continue
+            if not acquired:
+                # Could not open a session at all; don't hammer the server for every message
+                logger.error("❌ SMTP unavailable, %d email(s) not sent: %s", len(messages) - position, e)
+                results[position:] = [error] * (len(messages) - position)
+                break
+            logger.error("❌ Failed to send email to %s: %s", messages[position][0], e)
+            results[position] = error
+            position += 1
+
+    sent = sum(result is None for result in results)
+    logger.info("✅ Sent %d/%d email(s)", sent, len(messages))
+    return results
+
 
 def send_email(to_email: str, subject: str, body: str) -> bool:
     """
@@ -22,37 +250,7 @@ def send_email(to_email: str, subject: str, body: str) -> bool:
     Returns:
         bool: True if email sent successfully, False otherwise
     """
-    # Check if SMTP settings are configured
-    smtp_host = getattr(settings, "smtp_host", None)
-    if not smtp_host:
-        logger.info("SMTP not configured; skipping sending email.")
-        logger.info("Email to %s | Subject: %s | Body: %s", to_email, subject, body)
-        return True
-
-    # Prepare the email message
-    msg = EmailMessage()
-    msg["Subject"] = subject
-    msg["From"] = getattr(settings, "from_email", "no-reply@aidrp.com")
-    msg["To"] = to_email
-    msg.set_content(body)
-
-    try:
-        smtp_port = getattr(settings, "smtp_port", 587)
-        smtp_user = getattr(settings, "smtp_user", None)
-        smtp_password = getattr(settings, "smtp_password", None)
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            if smtp_user and smtp_password:
-                server.login(smtp_user, smtp_password)
-            server.send_message(msg)
-
-        logger.info("✅ Email sent successfully to %s", to_email)
-        return True
-
-    except Exception as e:
-        logger.error("❌ Failed to send email to %s: %s", to_email, e)
-        return False
+    return send_many([(to_email, subject, body)])[0] is None
 
 
 # =========================================================
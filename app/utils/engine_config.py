@@ -0,0 +1,175 @@
+# app/utils/engine_config.py
+# Engine profile: pool sizing, pre-ping strategy, statement timeout,
+# sampled SQL logging and live pool statistics
+# ==========================================================
+#
+# Everything here is driven by `Settings` (DB_* environment variables), so
+# the same code runs quietly with a sized pool in production and can be
+# turned up for debugging without a code change:
+#
+#   DB_POOL_SIZE / DB_MAX_OVERFLOW   persistent + burst connections per worker
+#   DB_POOL_RECYCLE_SECONDS          replace connections older than this
+#   DB_PRE_PING                      "always" | "idle" | "never"
+#   DB_STATEMENT_TIMEOUT_MS          server-side statement timeout (0 = off)
+#   DB_LOG_SAMPLE_RATE               fraction of statements logged (0.0 - 1.0)
+#   DB_SLOW_QUERY_MS                 statements slower than this are always logged
+#
+# Statement timing (SQL logging and per-request profiling) shares one pair
+# of listeners, attached by app/utils/query_counter.instrument.
+
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.utils.query_counter import instrument
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+def engine_kwargs(url: str) -> dict:
+    """Keyword arguments for create_engine / create_async_engine."""
+    if settings.db_pre_ping not in PRE_PING_STRATEGIES:
+        raise RuntimeError(
+            f"❌ DB_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, got '{settings.db_pre_ping}'"
+        )
+    kwargs = {
+        "echo": settings.db_echo,
+        "pool_pre_ping": settings.db_pre_ping == "always",
+    }
+    parsed = make_url(url)
+    # SQLite memory / aiosqlite use single-connection or null pools that take no sizing
+    if issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+        kwargs.update(
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_use_lifo=True,  # surplus connections go idle and are recycled instead of kept warm
+        )
+    return kwargs
+
+
+# ------------------------------------------------------------
+# Statement timeout (applied once per new DBAPI connection)
+# ------------------------------------------------------------
+def _statement_timeout_sql(backend: str, timeout_ms: int) -> Optional[str]:
+    if backend == "postgresql":
+        return f"SET statement_timeout = {timeout_ms}"
+    if backend == "mysql":
+        return f"SET SESSION max_execution_time = {timeout_ms}"  # SELECTs only
+    if backend == "mariadb":
+        return f"SET SESSION max_statement_time = {timeout_ms / 1000:.3f}"
+    return None  # SQLite has no server-side timeout
+
+
+# ------------------------------------------------------------
+# Pool statistics (reported on /status)
+# ------------------------------------------------------------
+class PoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.pings = 0
+        self.invalidated = 0
+        self.peak_checked_out = 0
+        self._checked_out = 0
+
+    def checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self._checked_out)
+
+    def checkin(self) -> None:
+        with self._lock:
+            self._checked_out = max(self._checked_out - 1, 0)
+
+    def as_dict(self) -> dict:
+        return {
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "idle_pings": self.pings,
+            "invalidated": self.invalidated,
+            "peak_checked_out": self.peak_checked_out,
+        }
+
+
+_stats: Dict[Engine, PoolStats] = {}
+
+
+def configure_engine(engine: Engine, name: str) -> Engine:
+    """
+    Attach the profile's event listeners to a sync engine (pass
+    `async_engine.sync_engine` for an AsyncEngine).
+    """
+    stats = _stats[engine] = PoolStats()
+    instrument(engine, name)  # statement timing: slow / sampled SQL log and per-request profiles
+    backend = engine.dialect.name
+    connect_sql = []
+    if settings.db_statement_timeout_ms > 0:
+        connect_sql.append(_statement_timeout_sql(backend, settings.db_statement_timeout_ms))
+    if backend == "sqlite":
+        connect_sql.append("PRAGMA foreign_keys=ON")  # SQLite ignores ON DELETE CASCADE otherwise
+    connect_sql = [sql for sql in connect_sql if sql]
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+        if connect_sql:
+            cursor = dbapi_connection.cursor()
+            try:
+                for sql in connect_sql:
+                    cursor.execute(sql)
+            finally:
+                cursor.close()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if settings.db_pre_ping == "idle":
+            idle_since = connection_record.info.get("checked_in_at")
+            if idle_since is not None and time.monotonic() - idle_since >= settings.db_pre_ping_idle_seconds:
+                stats.pings += 1
+                cursor = dbapi_connection.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                except Exception as e:
+                    # The pool discards this connection and retries the checkout with a fresh one
+                    raise exc.DisconnectionError(f"Idle connection failed pre-ping: {e}") from e
+                finally:
+                    cursor.close()
+        stats.checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+        stats.checkin()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        stats.invalidated += 1
+
+    return engine
+
+
+def pool_stats(engine: Engine) -> dict:
+    """Live checkout / overflow figures plus lifetime counters for one engine."""
+    pool = engine.pool
+    info = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        info.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    if engine in _stats:
+        info.update(_stats[engine].as_dict())
+    return info
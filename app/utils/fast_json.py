@@ -0,0 +1,62 @@
+# app/utils/fast_json.py
+# Fast JSON path for large list responses
+# ==========================================================
+#
+# The default path for a `response_model` list endpoint builds an ORM object
+# per row, validates it into a Pydantic model, validates the whole list
+# again against `response_model`, runs `jsonable_encoder` and finally the
+# stdlib `json`. For list endpoints whose rows map 1:1 onto table columns,
+# the hot routes skip all of that: they select only the response model's
+# columns, zip each result tuple into a dict and encode the list with orjson
+# in one call. The response model stays on the route for the OpenAPI schema,
+# so `schema_columns` insists that every nullable column maps onto a field
+# that admits None: the tuples are never validated against it.
+
+from typing import Any, List, Sequence, Type, get_args
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+try:
+    import orjson
+except ImportError:  # optional; pydantic-core's encoder is the (slower) fallback
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)  # "Z" for UTC, like Pydantic
+    return to_json(content)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; the app's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def schema_columns(model, schema: Type[BaseModel]) -> List:
+    """The table columns behind every field of `schema`, in field order."""
+    table = model.__table__.c
+    missing = [name for name in schema.model_fields if name not in table]
+    if missing:
+        raise ValueError(f"{schema.__name__} fields without a '{model.__tablename__}' column: {', '.join(missing)}")
+    not_optional = [
+        name for name, field in schema.model_fields.items()
+        if table[name].nullable and type(None) not in get_args(field.annotation)
+    ]
+    if not_optional:
+        raise ValueError(f"{schema.__name__} fields must be Optional for nullable columns: {', '.join(not_optional)}")
+    return [table[name] for name in schema.model_fields]
+
+
+def rows_to_dicts(columns: Sequence, rows) -> List[dict]:
+    keys = [column.name for column in columns]
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def rows_response(columns: Sequence, rows, status_code: int = 200) -> Response:
+    """Encode result tuples straight to a JSON array response (no per-row models)."""
+    return Response(dumps(rows_to_dicts(columns, rows)), status_code=status_code, media_type="application/json")
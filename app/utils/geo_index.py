@@ -0,0 +1,185 @@
+# app/utils/geo_index.py
+# In-process spatial index for incident / sensor radius queries
+# ==========================================================
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+# ----------------------------------------------------------
+# Grid index
+# ----------------------------------------------------------
+class GeoGridIndex:
+    """
+    Fixed-size lat/lon grid (a geohash-style bucketing) supporting
+    incremental upserts/removals and radius lookups that only inspect the
+    cells overlapping the query's bounding box.
+    """
+
+    def __init__(self, cell_deg: float = 0.1):
+        self.cell_deg = cell_deg
+        self._lon_cells = int(round(360 / cell_deg))
+        self._cells: Dict[Tuple[int, int], Dict[int, Tuple[float, float]]] = {}
+        self._points: Dict[int, Tuple[float, float]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lon / self.cell_deg)) % self._lon_cells
+
+    def upsert(self, item_id: int, lat: float, lon: float) -> None:
+        with self._lock:
+            self.remove(item_id)
+            self._points[item_id] = (lat, lon)
+            self._cells.setdefault(self._cell(lat, lon), {})[item_id] = (lat, lon)
+
+    def remove(self, item_id: int) -> None:
+        with self._lock:
+            point = self._points.pop(item_id, None)
+            if point is None:
+                return
+            key = self._cell(*point)
+            cell = self._cells.get(key)
+            if cell is not None:
+                cell.pop(item_id, None)
+                if not cell:
+                    del self._cells[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._points.clear()
+
+    def bulk_load(self, points: Iterable[Tuple[int, float, float]]) -> None:
+        cell_deg, lon_cells, floor = self.cell_deg, self._lon_cells, math.floor
+        cells, known = self._cells, self._points
+        with self._lock:
+            for item_id, lat, lon in points:
+                if item_id in known:
+                    self.upsert(item_id, lat, lon)
+                    continue
+                known[item_id] = (lat, lon)
+                key = (int(floor(lat / cell_deg)), int(floor(lon / cell_deg)) % lon_cells)
+                cell = cells.get(key)
+                if cell is None:
+                    cells[key] = cell = {}
+                cell[item_id] = (lat, lon)
+
+    def _candidate_cells(self, lat: float, lon: float, radius_km: float):
+        lat_span = radius_km / KM_PER_DEGREE
+        row_lo = int(math.floor(max(lat - lat_span, -90.0) / self.cell_deg))
+        row_hi = int(math.floor(min(lat + lat_span, 90.0) / self.cell_deg))
+
+        cos_lat = min(math.cos(math.radians(lat + lat_span)), math.cos(math.radians(lat - lat_span)))
+        if cos_lat <= 1e-6 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+            cols = range(self._lon_cells)  # near a pole or huge radius: every longitude
+        else:
+            lon_span = radius_km / (KM_PER_DEGREE * cos_lat)
+            col_lo = int(math.floor((lon - lon_span) / self.cell_deg))
+            col_hi = int(math.floor((lon + lon_span) / self.cell_deg))
+            cols = [col % self._lon_cells for col in range(col_lo, col_hi + 1)]
+
+        for row in range(row_lo, row_hi + 1):
+            for col in cols:
+                yield row, col
+
+    def within(self, lat: float, lon: float, radius_km: float) -> List[Tuple[int, float]]:
+        """Return `(id, distance_km)` pairs within `radius_km`, nearest first."""
+        with self._lock:
+            rows = int(2 * radius_km / KM_PER_DEGREE / self.cell_deg) + 2
+            if rows * rows >= len(self._cells):
+                cells = self._cells.values()
+            else:
+                cells = [self._cells[key] for key in self._candidate_cells(lat, lon, radius_km) if key in self._cells]
+
+            hits = []
+            for cell in cells:
+                for item_id, (plat, plon) in cell.items():
+                    distance = haversine_km(lat, lon, plat, plon)
+                    if distance <= radius_km:
+                        hits.append((item_id, distance))
+
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+
+# ----------------------------------------------------------
+# DB-backed index per model
+# ----------------------------------------------------------
+class ModelGeoIndex:
+    """
+    A GeoGridIndex kept in sync with a table that has `latitude`/`longitude`
+    columns. It is loaded lazily, updated in place by this worker's writes,
+    picks up rows added by other workers by polling `id > last seen id`, and
+    is rebuilt periodically so deletions elsewhere are eventually dropped.
+    """
+
+    def __init__(self, model, cell_deg: float = 0.1, poll_seconds: float = 1.0, rebuild_seconds: float = 300.0):
+        self.model = model
+        self.index = GeoGridIndex(cell_deg)
+        self.poll_seconds = poll_seconds
+        self.rebuild_seconds = rebuild_seconds
+        self._max_id = 0
+        self._last_poll: Optional[float] = None
+        self._last_rebuild: Optional[float] = None
+        self._sync_lock = threading.Lock()
+
+    def _load(self, db: Session, index: GeoGridIndex, min_id: int = 0) -> int:
+        rows = db.execute(
+            select(self.model.id, self.model.latitude, self.model.longitude)
+            .where(self.model.id > min_id, self.model.latitude.isnot(None), self.model.longitude.isnot(None))
+        ).all()
+        index.bulk_load(rows)
+        return max((row[0] for row in rows), default=min_id)
+
+    def sync(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._last_poll is not None and now - self._last_poll < self.poll_seconds:
+            return
+        with self._sync_lock:
+            if self._last_rebuild is None or now - self._last_rebuild >= self.rebuild_seconds:
+                fresh = GeoGridIndex(self.index.cell_deg)
+                max_id = self._load(db, fresh)
+                self.index, self._max_id = fresh, max_id
+                self._last_rebuild = now
+            else:
+                self._max_id = max(self._max_id, self._load(db, self.index, self._max_id))
+            self._last_poll = now
+
+    def upsert(self, item_id: int, lat, lon) -> None:
+        if lat is None or lon is None:
+            self.index.remove(item_id)
+        else:
+            self.index.upsert(item_id, lat, lon)
+
+    def remove(self, item_id: int) -> None:
+        self.index.remove(item_id)
+
+    def within(self, db: Session, lat: float, lon: float, radius_km: float) -> List[Tuple[int, float]]:
+        self.sync(db)
+        return self.index.within(lat, lon, radius_km)
+
+
+incident_geo = ModelGeoIndex(models.Incident)
+sensor_geo = ModelGeoIndex(models.Sensor)
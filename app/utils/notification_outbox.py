@@ -0,0 +1,199 @@
+# app/utils/notification_outbox.py
+# Transactional outbox for notification emails
+# ==========================================================
+#
+# API handlers only insert `Notification` rows with `sent=False`. A small
+# pool of background threads drains due rows in batches, sends them and
+# marks the delivered ones with a single bulk UPDATE (bumping the report
+# summary counters in the same transaction). Failed rows are
+# rescheduled with exponential backoff until `outbox_max_attempts`.
+#
+# Workers split the table by `id % workers`, and the batch select uses
+# `FOR UPDATE SKIP LOCKED` (ignored on SQLite), so several workers - or
+# several app processes - never deliver the same row twice concurrently.
+
+import logging
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.utils import report_summary
+from app.utils.email_utils import send_many
+
+logger = logging.getLogger(__name__)
+
+# (to_email, subject, body) -> delivered?
+Sender = Callable[[str, str, str], bool]
+
+NO_RECIPIENT_ERROR = "No recipient email address"
+
+
+def _send_each(send: Sender, messages: List[Tuple[str, str, str]]) -> List[Optional[str]]:
+    """Adapt a single-message sender to the batch interface of `send_many`."""
+    errors: List[Optional[str]] = []
+    for to_email, subject, body in messages:
+        try:
+            errors.append(None if send(to_email, subject, body) else "Mail server rejected the message")
+        except Exception as e:
+            errors.append(str(e) or e.__class__.__name__)
+    return errors
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff (with +/-10% jitter) after `attempts` failed sends."""
+    delay = settings.outbox_backoff_base_seconds * 2 ** max(attempts - 1, 0)
+    delay = min(delay, settings.outbox_backoff_max_seconds)
+    return delay * random.uniform(0.9, 1.1)
+
+
+# ----------------------------------------------------------
+# One batch
+# ----------------------------------------------------------
+def drain_once(
+    db: Session,
+    send: Optional[Sender] = None,
+    worker_index: int = 0,
+    worker_count: int = 1,
+    batch_size: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> int:
+    """Deliver one batch of due notifications; returns the number of rows handled."""
+    batch_size = batch_size or settings.outbox_batch_size
+    now = now or datetime.utcnow()
+    notification, user = models.Notification, models.User
+
+    query = (
+        select(
+            notification.id,
+            notification.title,
+            notification.message,
+            notification.attempts,
+            func.coalesce(user.email, notification.recipient),
+            notification.created_at,
+            notification.created_by,
+            notification.target_user_id,
+        )
+        .outerjoin(user, user.id == notification.target_user_id)
+        .where(
+            notification.sent.is_(False),
+            notification.attempts < settings.outbox_max_attempts,
+            or_(notification.next_attempt_at.is_(None), notification.next_attempt_at <= now),
+        )
+        .order_by(notification.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True, of=notification)
+    )
+    if worker_count > 1:
+        query = query.where(notification.id % worker_count == worker_index)
+
+    rows = db.execute(query).all()
+    if not rows:
+        db.rollback()
+        return 0
+
+    sent_ids: List[int] = []
+    failed: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+    deliverable = []
+    summary_keys = {}
+    for notification_id, title, message, attempts, email, *summary_key in rows:
+        summary_keys[notification_id] = summary_key
+        if email:
+            deliverable.append((notification_id, attempts, (email, title or "", message or "")))
+        else:
+            # Nothing to retry: give up on the row straight away
+            failed[(settings.outbox_max_attempts, NO_RECIPIENT_ERROR)].append(notification_id)
+
+    # One pooled SMTP session carries the whole batch
+    messages = [message for *_, message in deliverable]
+    errors = _send_each(send, messages) if send else send_many(messages)
+    for (notification_id, attempts, _), error in zip(deliverable, errors):
+        if error is None:
+            sent_ids.append(notification_id)
+        else:
+            failed[(attempts + 1, error[:500])].append(notification_id)
+
+    if sent_ids:
+        db.execute(
+            update(notification)
+            .where(notification.id.in_(sent_ids))
+            .values(sent=True, last_error=None, next_attempt_at=None)
+        )
+        report_summary.count_sent(db, (summary_keys[notification_id] for notification_id in sent_ids))
+    for (attempts, error), ids in failed.items():
+        db.execute(
+            update(notification)
+            .where(notification.id.in_(ids))
+            .values(
+                attempts=attempts,
+                last_error=error,
+                next_attempt_at=now + timedelta(seconds=backoff_seconds(attempts)),
+            )
+        )
+    db.commit()
+
+    if failed:
+        logger.warning(f"⚠️ Outbox: {sum(len(ids) for ids in failed.values())} notification(s) failed, will retry")
+    return len(rows)
+
+
+# ----------------------------------------------------------
+# Worker pool
+# ----------------------------------------------------------
+class NotificationOutbox:
+    def __init__(self, session_factory=SessionLocal, send: Optional[Sender] = None):
+        self.session_factory = session_factory
+        self.send = send
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self, workers: Optional[int] = None) -> None:
+        if self.running:
+            return
+        workers = max(1, workers or settings.outbox_workers)
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, args=(index, workers), name=f"outbox-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"✅ Notification outbox started with {workers} worker(s)")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def wake(self) -> None:
+        """Nudge idle workers after new rows were committed."""
+        self._wake.set()
+
+    def _run(self, index: int, workers: int) -> None:
+        while not self._stop.is_set():
+            handled = 0
+            try:
+                with self.session_factory() as db:
+                    handled = drain_once(db, self.send, index, workers)
+            except Exception as e:
+                logger.error(f"❌ Outbox worker {index} failed: {e}")
+            if handled < settings.outbox_batch_size:
+                self._wake.wait(settings.outbox_poll_seconds)
+                self._wake.clear()
+
+
+outbox = NotificationOutbox()
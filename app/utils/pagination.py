@@ -0,0 +1,45 @@
+# app/utils/pagination.py
+# Opaque cursors for keyset (seek) pagination
+# ==========================================================
+
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(position: Optional[datetime], row_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque token (the position may be NULL)."""
+    raw = json.dumps([None if position is None else position.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of `encode_cursor`; raises ValueError on a malformed token."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return None if position is None else datetime.fromisoformat(position), int(row_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def order_desc(dialect_name: str, position_col, id_col) -> tuple:
+    """`(position DESC, id DESC)` with NULL positions last on every backend, matching `before`."""
+    position = position_col.desc()
+    if dialect_name not in ("mysql", "mariadb"):  # they sort NULLs last in DESC already and lack NULLS LAST
+        position = position.nulls_last()
+    return position, id_col.desc()
+
+
+def before(position_col, id_col, position: Optional[datetime], row_id: int):
+    """Rows strictly after the cursor in `order_desc` order; NULL positions follow all others."""
+    if position is None:
+        return and_(position_col.is_(None), id_col < row_id)
+    return or_(
+        position_col < position,
+        and_(position_col == position, id_col < row_id),
+        position_col.is_(None),
+    )
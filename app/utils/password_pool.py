@@ -0,0 +1,124 @@
+# app/utils/password_pool.py
+# Bounded process pool for bcrypt hashing / verification
+# ==========================================================
+#
+# bcrypt is deliberately slow (~250 ms of CPU per call). Running it on the
+# request threads lets a login storm occupy every worker thread and the
+# GIL, so other endpoints stall. Here the work runs in a small pool of
+# separate processes. Callers await the result without holding a thread,
+# and once `max_pending` calls are queued new ones are rejected with
+# `PasswordPoolBusy` (mapped to 503) instead of piling up.
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Optional
+
+from app.config import settings
+from app.utils import security
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPoolBusy(Exception):
+    """Raised when the hashing queue is full; callers should answer 503."""
+
+
+def _timed(fn, *args):
+    """Runs in the worker process: the result plus the CPU-side seconds it took (no queue wait)."""
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+class PasswordHasherPool:
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self.workers = settings.password_pool_workers if workers is None else workers
+        self.max_pending = settings.password_pool_max_pending if max_pending is None else max_pending
+        self._executor: Optional["ProcessPoolExecutor"] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.busy_seconds = 0.0  # time spent inside the workers, excluding the queue
+
+    # -------- lifecycle --------
+    def _get_executor(self) -> "ProcessPoolExecutor":
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: never fork a process that is running outbox / asyncio threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"✅ Password hashing pool started with {self.workers} process(es)")
+        return self._executor
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # -------- submission --------
+    def _submit(self, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy("Password hashing queue is full")
+            self.pending += 1
+            executor = self._get_executor()
+        try:
+            future = executor.submit(_timed, fn, *args)
+        except Exception:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Optional[Future]) -> None:
+        failed = future is None or future.cancelled() or future.exception() is not None
+        with self._lock:
+            self.pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+                self.busy_seconds += future.result()[1]
+
+    # -------- async API (event loop callers) --------
+    async def hash(self, password: str) -> str:
+        return (await asyncio.wrap_future(self._submit(security.hash_password, password)))[0]
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return (await asyncio.wrap_future(self._submit(security.verify_password, plain_password, hashed_password)))[0]
+
+    # -------- blocking API (threadpool callers) --------
+    def hash_sync(self, password: str) -> str:
+        return self._submit(security.hash_password, password).result()[0]
+
+    def verify_sync(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(security.verify_password, plain_password, hashed_password).result()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                # Worker time per completed call; queueing shows up as `pending`
+                "avg_ms": round(self.busy_seconds / self.completed * 1000, 1) if self.completed else None,
+            }
+
+
+password_pool = PasswordHasherPool()
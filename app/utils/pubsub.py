@@ -0,0 +1,222 @@
+# app/utils/pubsub.py
+# In-process publish/subscribe fan-out for the live stream endpoints
+# ==========================================================
+#
+# Route handlers call `broker.publish(...)` (from the event loop or from
+# FastAPI's threadpool). Each event is serialized exactly once and the same
+# string is handed to every matching subscriber queue. When `REDIS_URL` is
+# set, events are relayed through Redis pub/sub so that every uvicorn
+# worker fans them out to its own subscribers. The Redis publish is an
+# asyncio call scheduled on the broker's loop, so `publish` never blocks a
+# handler on a network round trip.
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIBER_QUEUE_SIZE = 1000
+REDIS_CHANNEL_PREFIX = "aidrp:stream:"
+
+
+# ----------------------------------------------------------
+# Events and subscriptions
+# ----------------------------------------------------------
+class Event:
+    """A published event, pre-serialized for both WebSocket and SSE clients."""
+
+    __slots__ = ("topic", "type", "attrs", "payload", "sse")
+
+    def __init__(self, topic: str, event_type: str, payload: str, attrs: Dict[str, str]):
+        self.topic = topic
+        self.type = event_type
+        self.attrs = attrs
+        self.payload = payload
+        self.sse = f"event: {event_type}\ndata: {payload}\n\n"
+
+    @classmethod
+    def create(cls, topic: str, event_type: str, data: dict, attrs: Dict[str, object]) -> "Event":
+        payload = json.dumps({"type": event_type, "data": data}, default=str)
+        normalized = {k: str(v).lower() for k, v in attrs.items() if v is not None}
+        return cls(topic, event_type, payload, normalized)
+
+
+class Subscription:
+    """A bounded per-client queue; the oldest event is dropped when it overflows."""
+
+    def __init__(self, broker: "PubSub", topic: str, filters: Dict[str, str]):
+        self.broker = broker
+        self.topic = topic
+        self.filters = {k: v.lower() for k, v in filters.items() if v}
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.dropped = 0
+
+    def matches(self, event: Event) -> bool:
+        for key, wanted in self.filters.items():
+            value = event.attrs.get(key)
+            if value is None:
+                return False
+            if key == "location":
+                if wanted not in value:
+                    return False
+            elif value not in wanted.split(","):
+                return False
+        return True
+
+    def put(self, event: Event) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+    async def __aenter__(self) -> "Subscription":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.broker.unsubscribe(self)
+
+
+# ----------------------------------------------------------
+# Broker
+# ----------------------------------------------------------
+class PubSub:
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self._pending: Set[object] = set()  # in-flight Redis publishes (asyncio tasks / thread futures)
+        self.published = 0
+
+    # -------- lifecycle --------
+    async def start(self, redis_url: str = "") -> None:
+        """Connect the optional Redis relay (no-op for the in-memory backend)."""
+        if not redis_url:
+            return
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.error("❌ REDIS_URL is set but the 'redis' package is not installed; using in-memory pub/sub")
+            return
+        self._loop = asyncio.get_running_loop()
+        self._redis = aioredis.Redis.from_url(redis_url)
+        self._relay_task = asyncio.create_task(self._relay(aioredis.Redis.from_url(redis_url)))
+        logger.info("✅ Stream pub/sub relayed through Redis")
+
+    async def stop(self) -> None:
+        if self._relay_task:
+            self._relay_task.cancel()
+            self._relay_task = None
+        if self._pending:
+            # Let queued publishes finish before the client closes
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in list(self._pending)), return_exceptions=True)
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+            self._loop = None
+
+    # -------- subscribing --------
+    def subscribe(self, topic: str, **filters: Optional[str]) -> Subscription:
+        """Register a subscriber; must be called from the event loop."""
+        subscription = Subscription(self, topic, filters)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers[subscription.topic].discard(subscription)
+
+    def subscriber_count(self, topic: Optional[str] = None) -> int:
+        with self._lock:
+            if topic:
+                return len(self._subscribers[topic])
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    # -------- publishing --------
+    def publish(self, topic: str, event_type: str, data: dict, **attrs: object) -> None:
+        """Serialize once and fan out. Safe to call from any thread."""
+        event = Event.create(topic, event_type, data, attrs)
+        self.published += 1
+        loop = self._loop
+        if self._redis is None or loop is None or loop.is_closed():
+            self._dispatch(event)
+            return
+
+        envelope = json.dumps({"type": event.type, "attrs": event.attrs, "payload": event.payload})
+        publishing = self._publish_remote(event, envelope)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            future = loop.create_task(publishing)
+        else:
+            # From the threadpool (or another loop): hand the coroutine to the broker's loop
+            future = asyncio.run_coroutine_threadsafe(publishing, loop)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    async def _publish_remote(self, event: Event, envelope: str) -> None:
+        try:
+            await self._redis.publish(REDIS_CHANNEL_PREFIX + event.topic, envelope)
+        except Exception as e:
+            logger.error(f"❌ Redis publish failed, delivering locally only: {e}")
+            self._dispatch(event)
+
+    def _dispatch(self, event: Event) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event.topic, ()))
+        if not subscribers:
+            return
+
+        by_loop: Dict[asyncio.AbstractEventLoop, list] = defaultdict(list)
+        for subscription in subscribers:
+            if subscription.matches(event):
+                by_loop[subscription.loop].append(subscription)
+
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for loop, targets in by_loop.items():
+            if loop is current:
+                _fan_out(targets, event)
+            elif not loop.is_closed():
+                loop.call_soon_threadsafe(_fan_out, targets, event)
+
+    async def _relay(self, client) -> None:
+        pubsub = client.pubsub()
+        await pubsub.psubscribe(REDIS_CHANNEL_PREFIX + "*")
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                channel = message["channel"]
+                if isinstance(channel, bytes):
+                    channel = channel.decode()
+                envelope = json.loads(message["data"])
+                topic = channel[len(REDIS_CHANNEL_PREFIX):]
+                self._dispatch(Event(topic, envelope["type"], envelope["payload"], envelope["attrs"]))
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await pubsub.close()
+            await client.close()
+
+
+def _fan_out(subscriptions, event: Event) -> None:
+    for subscription in subscriptions:
+        subscription.put(event)
+
+
+broker = PubSub()
@@ -0,0 +1,205 @@
+# app/utils/query_counter.py
+# Per-request SQL profiling: statement count, DB time, slowest statement
+# and repeated-statement (probable N+1) detection
+# ==========================================================
+#
+# `instrument(engine, name)` times every statement an engine executes into
+# the profile of the current context, and into the engine's slow / sampled
+# SQL log (DB_SLOW_QUERY_MS, DB_LOG_SAMPLE_RATE) from the same timestamp;
+# `configure_engine` applies it to each engine app/database.py builds
+# (primary, async, replicas). The context
+# variable follows the request into FastAPI's threadpool and into
+# AsyncSession's greenlets, so sync handlers, async handlers and `run_sync`
+# crud helpers all land on the request that caused them. Outside a profile
+# and with SQL logging off, the listeners cost one context-variable lookup
+# per statement.
+#
+# `QueryProfileMiddleware` opens a profile per HTTP request and reports it:
+#
+#   one JSON line per request on the "app.requests" logger, at DEBUG
+#   the same line as a WARNING when one statement ran QUERY_REPEAT_THRESHOLD+ times
+#   with QUERY_SERVER_TIMING=true (debug / internal deployments only, as it
+#   shows clients the database timings):
+#   Server-Timing: db;dur=12.40;desc="7 queries", db-slowest;dur=5.10, app;dur=18.02
+#
+# SQLAlchemy binds parameters, so a lazy load repeated per row produces the
+# same statement text each time: the text itself is the statement's shape.
+# QUERY_COUNT_HEADER=true also sets `X-Query-Count`, which the tests use to
+# fail an endpoint whose statement count grows with its result size.
+
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.utils.fast_json import dumps
+
+logger = logging.getLogger("app.requests")
+sql_logger = logging.getLogger("app.sql")
+
+COUNT_HEADER = "X-Query-Count"
+STATEMENT_PREVIEW = 300  # characters of SQL kept in logs
+
+
+class QueryProfile:
+    __slots__ = ("count", "seconds", "slowest_seconds", "slowest_statement", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Dict[str, int] = {}
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first."""
+        if threshold <= 0:
+            return []
+        return sorted(
+            ((statement, count) for statement, count in self.shapes.items() if count >= threshold),
+            key=lambda item: -item[1],
+        )
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def _sql_logging() -> bool:
+    return settings.db_slow_query_ms > 0 or settings.db_log_sample_rate > 0
+
+
+def _log_statement(name: str, statement: str, elapsed: float) -> None:
+    elapsed_ms = elapsed * 1000
+    if settings.db_slow_query_ms > 0 and elapsed_ms >= settings.db_slow_query_ms:
+        sql_logger.warning(f"🐢 [{name}] {elapsed_ms:.1f} ms: {statement}")
+    elif settings.db_log_sample_rate > 0 and random.random() < settings.db_log_sample_rate:
+        sql_logger.info(f"[{name}] {elapsed_ms:.1f} ms: {statement}")
+
+
+def instrument(engine: Engine, name: str = "") -> Engine:
+    """Attach the timing listeners to a sync engine (`async_engine.sync_engine` for async)."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        # One timestamp per connection, overwritten by the next statement, so a
+        # statement that raises (no after_cursor_execute) leaves nothing behind
+        if _current.get() is not None or _sql_logging():
+            conn.info["query_started"] = perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop("query_started", None)
+        if started is None:
+            return
+        elapsed = perf_counter() - started
+        profile = _current.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+        if _sql_logging():
+            _log_statement(name, statement, elapsed)
+
+    return engine
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Profile the statements executed in this context (and the tasks / threads it spawns)."""
+    profile = QueryProfile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+# ----------------------------------------------------------
+# Reporting
+# ----------------------------------------------------------
+def server_timing(profile: QueryProfile, elapsed: float) -> str:
+    metrics = [f'db;dur={profile.seconds * 1000:.2f};desc="{profile.count} queries"']
+    if profile.count:
+        metrics.append(f"db-slowest;dur={profile.slowest_seconds * 1000:.2f}")
+    metrics.append(f"app;dur={elapsed * 1000:.2f}")
+    return ", ".join(metrics)
+
+
+def _preview(statement: Optional[str]) -> Optional[str]:
+    if statement is None:
+        return None
+    return " ".join(statement.split())[:STATEMENT_PREVIEW]
+
+
+def log_request(scope, status: int, profile: QueryProfile, elapsed: float, repeat_threshold: int) -> None:
+    repeated = profile.repeated(repeat_threshold)
+    level = logging.WARNING if repeated else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+
+    route = scope.get("route")
+    record = {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": getattr(route, "path", None),
+        "status": status,
+        "duration_ms": round(elapsed * 1000, 2),
+        "db_queries": profile.count,
+        "db_ms": round(profile.seconds * 1000, 2),
+        "db_slowest_ms": round(profile.slowest_seconds * 1000, 2),
+        "db_slowest": _preview(profile.slowest_statement),
+    }
+    if repeated:
+        record["probable_n_plus_one"] = [
+            {"count": count, "statement": _preview(statement)} for statement, count in repeated
+        ]
+    logger.log(level, dumps(record).decode(), extra={"request_profile": record})
+
+
+class QueryProfileMiddleware:
+    """ASGI middleware: profile each request's SQL into the request log (and optionally Server-Timing)."""
+
+    def __init__(self, app, repeat_threshold: int = 5, server_timing: bool = False, count_header: bool = False):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+        self.server_timing = server_timing
+        self.count_header = count_header
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = 500
+        with profile_queries() as profile:
+            async def send_with_timing(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    # Headers go out before a streaming body finishes; the log line covers all of it
+                    status = message["status"]
+                    if self.server_timing or self.count_header:
+                        headers = list(message.get("headers", []))
+                        if self.server_timing:
+                            headers.append((b"server-timing", server_timing(profile, perf_counter() - started).encode()))
+                        if self.count_header:
+                            headers.append((COUNT_HEADER.lower().encode(), str(profile.count).encode()))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                log_request(scope, status, profile, perf_counter() - started, self.repeat_threshold)
@@ -0,0 +1,301 @@
+# app/utils/report_summary.py
+# Incrementally maintained notification report counts
+# ==========================================================
+#
+# `notification_daily_summaries` holds sent / total counts per UTC day for
+# three scopes: every notification ("all", subject 0), per creator and per
+# recipient. Writers call `count_created` / `count_sent` / `count_deleted`
+# inside their own transaction, so the counters move together with the
+# notification rows. A scheduled job re-aggregates the trailing days from
+# the raw rows to repair any drift (e.g. rows changed outside the API).
+#
+# Writers hold the lock row (LOCK_KEY, created by migration 0004) shared
+# until they commit and `rebuild` holds it exclusively, so a rebuild waits
+# for in-flight counts, aggregates what they committed, and no count lands
+# between its read and its write. Every worker may run a rebuilder: runs
+# serialize on the lock and each one writes the same absolute counts.
+
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, Integer, Select, String, case, delete, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+from app.utils.timeseries import as_utc_naive
+from app.utils.upsert import upsert, upsert_from_select
+
+logger = logging.getLogger(__name__)
+
+SCOPE_ALL = "all"
+SCOPE_CREATOR = "creator"
+SCOPE_RECIPIENT = "recipient"
+SCOPES = (SCOPE_ALL, SCOPE_CREATOR, SCOPE_RECIPIENT)
+LOCK_KEY = (date(1970, 1, 1), "lock", 0)  # (day, scope, subject_id) of the lock row; outside every scope
+SUMMARY_KEY = ("day", "scope", "subject_id")
+
+# (created_at, created_by, target_user_id)
+NotificationKey = Tuple[datetime, Optional[int], Optional[int]]
+Deltas = Dict[Tuple[date, str, int], List[int]]
+
+
+def _day(value) -> date:
+    if isinstance(value, datetime):
+        return as_utc_naive(value).date()
+    if isinstance(value, str):  # SQLite returns date() as text
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _utc_day(db: Session, column):
+    """
+    SQL for the UTC day of a timestamp column, matching `_day`: PostgreSQL
+    converts the timestamptz to UTC first; elsewhere the stored value is
+    already naive UTC (the app writes `utcnow()`).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return func.date(func.timezone("UTC", column))
+    return func.date(column)
+
+
+def _accumulate(deltas: Deltas, rows: Iterable[NotificationKey], total: int, sent: int) -> Deltas:
+    for created_at, created_by, target_user_id in rows:
+        day = _day(created_at or datetime.utcnow())
+        keys = [(day, SCOPE_ALL, 0)]
+        if created_by is not None:
+            keys.append((day, SCOPE_CREATOR, created_by))
+        if target_user_id is not None:
+            keys.append((day, SCOPE_RECIPIENT, target_user_id))
+        for key in keys:
+            counts = deltas[key]
+            counts[0] += total
+            counts[1] += sent
+    return deltas
+
+
+def _lock(db: Session, exclusive: bool = False) -> None:
+    """Take the lock row for the rest of the transaction (a no-op on SQLite, which locks the whole file)."""
+    summary = models.NotificationDailySummary
+    day, scope, subject_id = LOCK_KEY
+    db.execute(
+        select(summary.id)
+        .where(summary.day == day, summary.scope == scope, summary.subject_id == subject_id)
+        .with_for_update(read=not exclusive)
+    ).all()
+
+
+def _increment(incoming) -> dict:
+    table = models.NotificationDailySummary.__table__
+    return {
+        "total_count": table.c.total_count + incoming.total_count,
+        "sent_count": table.c.sent_count + incoming.sent_count,
+    }
+
+
+def _apply(db: Session, deltas: Deltas) -> None:
+    rows = [
+        {"day": day, "scope": scope, "subject_id": subject_id, "total_count": total, "sent_count": sent}
+        for (day, scope, subject_id), (total, sent) in deltas.items()
+        if total or sent
+    ]
+    if rows:
+        _lock(db)
+        upsert(db, models.NotificationDailySummary.__table__, rows, SUMMARY_KEY, _increment)
+
+
+# ----------------------------------------------------------
+# Incremental maintenance (call before the writer's commit)
+# ----------------------------------------------------------
+def count_created(db: Session, rows: Iterable[NotificationKey], sent: bool = False) -> None:
+    _apply(db, _accumulate(defaultdict(lambda: [0, 0]), rows, 1, int(sent)))
+
+
+def count_sent(db: Session, rows: Iterable[NotificationKey]) -> None:
+    _apply(db, _accumulate(defaultdict(lambda: [0, 0]), rows, 0, 1))
+
+
+def count_deleted(db: Session, rows: Iterable[NotificationKey], sent: bool) -> None:
+    _apply(db, _accumulate(defaultdict(lambda: [0, 0]), rows, -1, -int(sent)))
+
+
+def count_broadcast(
+    db: Session, created_at: datetime, created_by: Optional[int], created: int, recipients: Select
+) -> None:
+    """
+    Count `created` broadcast notifications sharing `created_at` and
+    `created_by`. `recipients` selects the new rows' `target_user_id`; the
+    per-recipient counts are grouped and merged by the database.
+    """
+    if not created:
+        return
+    day = _day(created_at)
+    deltas: Deltas = defaultdict(lambda: [0, 0])
+    deltas[(day, SCOPE_ALL, 0)][0] = created
+    if created_by is not None:
+        deltas[(day, SCOPE_CREATOR, created_by)][0] = created
+    _apply(db, deltas)
+
+    targets = recipients.subquery()
+    upsert_from_select(
+        db,
+        models.NotificationDailySummary.__table__,
+        ("day", "scope", "subject_id", "total_count", "sent_count"),
+        select(
+            literal(day, Date),
+            literal(SCOPE_RECIPIENT, String),
+            targets.c.target_user_id,
+            func.count(),
+            literal(0, Integer),
+        )
+        .where(targets.c.target_user_id.is_not(None))
+        .group_by(targets.c.target_user_id),
+        SUMMARY_KEY,
+        _increment,
+    )
+
+
+def _grouped_keys(db: Session, *criteria) -> List[Tuple[Optional[date], Optional[int], Optional[int], int, int]]:
+    """
+    (utc_day, created_by, target_user_id, total, sent) groups, aggregated by
+    the database: one row per summary key, not per notification.
+    """
+    notification = models.Notification
+    day = _utc_day(db, notification.created_at)
+    return db.execute(
+        select(
+            day,
+            notification.created_by,
+            notification.target_user_id,
+            func.count(),
+            func.sum(case((notification.sent.is_(True), 1), else_=0)),
+        )
+        .where(*criteria)
+        .group_by(day, notification.created_by, notification.target_user_id)
+    ).all()
+
+
+def count_deleted_for_user(db: Session, user_id: int) -> None:
+    """
+    Discount every notification a user created or received, ahead of the
+    user delete whose ON DELETE CASCADE removes them. One grouped query
+    instead of loading the rows.
+    """
+    notification = models.Notification
+    deltas: Deltas = defaultdict(lambda: [0, 0])
+    grouped = _grouped_keys(db, or_(notification.created_by == user_id, notification.target_user_id == user_id))
+    for day, created_by, target_user_id, total, sent in grouped:
+        _accumulate(deltas, [(_day(day) if day else None, created_by, target_user_id)], -total, -(sent or 0))
+    _apply(db, deltas)
+
+
+# ----------------------------------------------------------
+# Scheduled re-aggregation
+# ----------------------------------------------------------
+def rebuild(db: Session, start: date, end: date) -> int:
+    """Recompute the summaries for days in [start, end] from raw rows; returns rows written."""
+    notification = models.Notification
+    summary = models.NotificationDailySummary
+    _lock(db, exclusive=True)  # waits for in-flight counts; holds new ones until the commit
+    window_start = datetime.combine(start, datetime.min.time())
+    window_end = datetime.combine(end + timedelta(days=1), datetime.min.time())
+
+    deltas: Deltas = defaultdict(lambda: [0, 0])
+    grouped = _grouped_keys(db, notification.created_at >= window_start, notification.created_at < window_end)
+    for day, created_by, target_user_id, total, sent in grouped:
+        _accumulate(deltas, [(_day(day), created_by, target_user_id)], total, sent or 0)
+    rows = [
+        {"day": day, "scope": scope, "subject_id": subject_id, "total_count": total, "sent_count": sent}
+        for (day, scope, subject_id), (total, sent) in deltas.items()
+    ]
+
+    # Overwrite in place (zero the window, upsert the absolute counts, drop what stayed
+    # zero) rather than delete + insert, which trips uq_notification_summary_day
+    window = (summary.day >= start, summary.day <= end, summary.scope.in_(SCOPES))
+    db.execute(update(summary).where(*window).values(total_count=0, sent_count=0))
+    upsert(
+        db,
+        summary.__table__,
+        rows,
+        SUMMARY_KEY,
+        lambda incoming: {"total_count": incoming.total_count, "sent_count": incoming.sent_count},
+    )
+    db.execute(delete(summary).where(*window, summary.total_count == 0, summary.sent_count == 0))
+    db.commit()
+    return len(rows)
+
+
+class SummaryRebuilder:
+    """Background thread that re-aggregates the trailing `report_rebuild_days` days."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="report-summary", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            today = datetime.utcnow().date()
+            start = today - timedelta(days=max(settings.report_rebuild_days, 1) - 1)
+            try:
+                with self.session_factory() as db:
+                    written = rebuild(db, start, today)
+                logger.info(f"✅ Notification summaries rebuilt for {start}..{today} ({written} rows)")
+            except Exception as e:
+                logger.error(f"❌ Notification summary rebuild failed: {e}")
+            self._stop.wait(settings.report_rebuild_interval_seconds)
+
+
+rebuilder = SummaryRebuilder()
+
+
+# ----------------------------------------------------------
+# Reads
+# ----------------------------------------------------------
+def read_daily(db: Session, start: date, end: date, scope: str = SCOPE_ALL, subject_id: int = 0) -> List[dict]:
+    summary = models.NotificationDailySummary
+    rows = db.execute(
+        select(summary.day, summary.total_count, summary.sent_count)
+        .where(
+            summary.scope == scope,
+            summary.subject_id == subject_id,
+            summary.day >= start,
+            summary.day <= end,
+        )
+        .order_by(summary.day)
+    ).all()
+    return [
+        {"day": day, "total": total, "sent": sent, "unsent": total - sent}
+        for day, total, sent in rows
+    ]
+
+
+def read_weekly(db: Session, start: date, end: date, scope: str = SCOPE_ALL, subject_id: int = 0) -> List[dict]:
+    """Roll the daily rows up into ISO weeks (keyed by their Monday)."""
+    weeks: Dict[date, List[int]] = {}
+    for row in read_daily(db, start, end, scope, subject_id):
+        monday = row["day"] - timedelta(days=row["day"].weekday())
+        counts = weeks.setdefault(monday, [0, 0])
+        counts[0] += row["total"]
+        counts[1] += row["sent"]
+    return [
+        {"week_start": monday, "total": total, "sent": sent, "unsent": total - sent}
+        for monday, (total, sent) in sorted(weeks.items())
+    ]
@@ -0,0 +1,146 @@
+# app/utils/revocation.py
+# Revoked access tokens: in-memory O(1) lookups, synced from a DB table
+# ==========================================================
+#
+# Every access token carries a `jti`. Revoking one writes a row to
+# `revoked_tokens` and adds it to this worker's in-memory set right away;
+# other workers pick it up by polling `id > last seen id - overlap` every
+# `revocation_sync_seconds`. Ids are handed out at insert but become
+# visible at commit, so a row can appear behind the watermark; re-reading
+# the trailing `revocation_sync_overlap_ids` ids on every sync catches it.
+#
+# Entries are grouped into one set per hour of token expiry. A lookup hashes
+# the jti to a 64-bit int and probes the set for the token's own expiry
+# hour, so it is O(1). Once an hour has passed, every token in it is expired
+# anyway, and the whole set is dropped. Memory is therefore bounded by the
+# revocations of tokens that are still valid, however many are made per day.
+
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+BUCKET_SECONDS = 3600
+
+
+def _key(jti: str) -> int:
+    return int.from_bytes(hashlib.blake2b(jti.encode(), digest_size=8).digest(), "big")
+
+
+def _epoch(ts: datetime) -> float:
+    return (ts - datetime(1970, 1, 1)).total_seconds()
+
+
+class RevocationList:
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self._buckets: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+        self._max_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_purge = 0.0
+
+    # -------- in-memory set --------
+    def _add(self, jti: str, exp: float) -> bool:
+        """Add a revocation; True if this worker did not have it yet."""
+        if exp <= time.time():
+            return False
+        bucket = int(exp // BUCKET_SECONDS)
+        key = _key(jti)
+        with self._lock:
+            revoked = self._buckets.setdefault(bucket, set())
+            if key in revoked:
+                return False
+            revoked.add(key)
+            return True
+
+    def is_revoked(self, jti: Optional[str], exp: Optional[float]) -> bool:
+        if not jti or exp is None:
+            return False
+        revoked = self._buckets.get(int(exp // BUCKET_SECONDS))
+        return revoked is not None and _key(jti) in revoked
+
+    def _drop_expired_buckets(self) -> None:
+        current = int(time.time() // BUCKET_SECONDS)
+        with self._lock:
+            for bucket in [b for b in self._buckets if b < current]:
+                del self._buckets[bucket]
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    # -------- writes --------
+    def revoke(self, db: Session, jti: str, exp: float) -> None:
+        """Persist a revocation (idempotent) and apply it to this worker immediately."""
+        self._add(jti, exp)
+        db.add(models.RevokedToken(jti=jti, expires_at=datetime.utcfromtimestamp(exp)))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # already revoked
+
+    # -------- cross-worker sync --------
+    def sync(self, db: Session) -> int:
+        """Load revocations added since the last sync (plus the trailing overlap); returns how many were new."""
+        since = max(self._max_id - settings.revocation_sync_overlap_ids, 0)
+        rows = db.execute(
+            select(models.RevokedToken.id, models.RevokedToken.jti, models.RevokedToken.expires_at)
+            .where(models.RevokedToken.id > since, models.RevokedToken.expires_at > datetime.utcnow())
+            .order_by(models.RevokedToken.id)
+        ).all()
+        added = 0
+        for row_id, jti, expires_at in rows:
+            added += self._add(jti, _epoch(expires_at))
+            self._max_id = max(self._max_id, row_id)
+        self._drop_expired_buckets()
+        return added
+
+    def purge(self, db: Session) -> None:
+        db.execute(delete(models.RevokedToken).where(models.RevokedToken.expires_at <= datetime.utcnow()))
+        db.commit()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="token-revocation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                with self.session_factory() as db:
+                    if time.monotonic() - self._last_purge >= settings.revocation_purge_seconds:
+                        self.purge(db)
+                        self._last_purge = time.monotonic()
+                        # Full reload also catches ids committed later than the overlap covers
+                        self._max_id = 0
+                    self.sync(db)
+            except Exception as e:
+                logger.error(f"❌ Token revocation sync failed: {e}")
+            self._stop.wait(settings.revocation_sync_seconds)
+
+    def stats(self) -> dict:
+        return {"revoked": len(self), "buckets": len(self._buckets)}
+
+
+revocations = RevocationList()
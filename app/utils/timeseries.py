@@ -0,0 +1,191 @@
+# app/utils/timeseries.py
+# Sensor time-series rollups and downsampled series queries
+# ==========================================================
+
+import math
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.utils.upsert import upsert
+
+# ----------------------------------------------------------
+# Bucket configuration
+# ----------------------------------------------------------
+ROLLUP_RESOLUTIONS = {60: "1m", 3600: "1h", 86400: "1d"}
+NICE_STEPS = (1, 10, 60, 300, 900, 3600, 6 * 3600, 86400, 7 * 86400)
+MAX_SERIES_POINTS = 1000
+HARD_MAX_SERIES_POINTS = 10_000
+
+_EPOCH = datetime(1970, 1, 1)
+_RESOLUTION_RE = re.compile(r"^(\d+)([smhd]?)$")
+_UNIT_SECONDS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def as_utc_naive(ts: datetime) -> datetime:
+    """Normalize a datetime to naive UTC (the convention used for stored buckets)."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def bucket_start(ts: datetime, width: int) -> datetime:
+    """Floor `ts` to the start of its `width`-second bucket (epoch aligned)."""
+    seconds = int((as_utc_naive(ts) - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % width)
+
+
+def parse_resolution(value: str) -> int:
+    """Parse `30s`, `5m`, `1h`, `1d` or a plain number of seconds."""
+    match = _RESOLUTION_RE.match(value.strip().lower())
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Invalid resolution '{value}'")
+    return int(match.group(1)) * _UNIT_SECONDS[match.group(2)]
+
+
+def auto_resolution(start: datetime, end: datetime) -> int:
+    """Pick the smallest nice step that keeps the series under MAX_SERIES_POINTS."""
+    span = (end - start).total_seconds()
+    for step in NICE_STEPS:
+        if span / step <= MAX_SERIES_POINTS:
+            return step
+    return NICE_STEPS[-1]
+
+
+def choose_source(step: int) -> int:
+    """Return the coarsest rollup width that evenly divides `step` (0 = raw readings)."""
+    candidates = [width for width in ROLLUP_RESOLUTIONS if step % width == 0]
+    return max(candidates) if candidates else 0
+
+
+# ----------------------------------------------------------
+# Incremental maintenance
+# ----------------------------------------------------------
+def build_rollups(rows: List[dict]) -> List[dict]:
+    """Aggregate raw reading rows into one partial rollup row per bucket."""
+    buckets: Dict[Tuple[int, str, int, datetime], List[float]] = {}
+    for row in rows:
+        for width in ROLLUP_RESOLUTIONS:
+            key = (row["sensor_id"], row["metric"], width, bucket_start(row["recorded_at"], width))
+            value = row["value"]
+            agg = buckets.get(key)
+            if agg is None:
+                buckets[key] = [value, value, value, 1]
+            else:
+                if value < agg[0]:
+                    agg[0] = value
+                if value > agg[1]:
+                    agg[1] = value
+                agg[2] += value
+                agg[3] += 1
+
+    return [
+        {
+            "sensor_id": sensor_id,
+            "metric": metric,
+            "resolution": width,
+            "bucket_start": start,
+            "min_value": agg[0],
+            "max_value": agg[1],
+            "sum_value": agg[2],
+            "count": agg[3],
+        }
+        for (sensor_id, metric, width, start), agg in buckets.items()
+    ]
+
+
+def apply_rollups(db: Session, rollups: List[dict]) -> None:
+    """Merge partial rollups into the stored buckets (does not commit)."""
+    table = models.SensorReadingRollup.__table__
+
+    def merge(incoming):
+        return {
+            "min_value": case((incoming.min_value < table.c.min_value, incoming.min_value),
+                              else_=table.c.min_value),
+            "max_value": case((incoming.max_value > table.c.max_value, incoming.max_value),
+                              else_=table.c.max_value),
+            "sum_value": table.c.sum_value + incoming.sum_value,
+            "count": table.c.count + incoming.count,
+        }
+
+    # Lock bucket rows in one global key order so concurrent batches touching
+    # the same buckets wait on each other instead of deadlocking
+    key = ("sensor_id", "metric", "resolution", "bucket_start")
+    ordered = sorted(rollups, key=lambda rollup: tuple(rollup[column] for column in key))
+    upsert(db, table, ordered, key, merge)
+
+
+# ----------------------------------------------------------
+# Series queries
+# ----------------------------------------------------------
+def query_series(
+    db: Session,
+    sensor_id: int,
+    metric: str,
+    start: datetime,
+    end: datetime,
+    step: Optional[int] = None,
+) -> Tuple[int, str, List[dict]]:
+    """
+    Return `(step, source, points)` for a sensor metric between `start` and
+    `end`. The window is aligned to `step`, and points are read from the
+    coarsest rollup table that can answer the query, falling back to raw
+    readings only for sub-minute resolutions.
+    """
+    start, end = as_utc_naive(start), as_utc_naive(end)
+    step = step or auto_resolution(start, end)
+    if (end - start).total_seconds() / step > HARD_MAX_SERIES_POINTS:
+        raise ValueError(f"Resolution too fine: more than {HARD_MAX_SERIES_POINTS} points requested")
+
+    start = bucket_start(start, step)
+    end_seconds = (end - _EPOCH).total_seconds()
+    end = _EPOCH + timedelta(seconds=math.ceil(end_seconds / step) * step)
+
+    source = choose_source(step)
+    if source:
+        rollup = models.SensorReadingRollup
+        rows = db.execute(
+            select(rollup.bucket_start, rollup.min_value, rollup.max_value, rollup.sum_value, rollup.count)
+            .where(
+                rollup.sensor_id == sensor_id,
+                rollup.metric == metric,
+                rollup.resolution == source,
+                rollup.bucket_start >= start,
+                rollup.bucket_start < end,
+            )
+            .order_by(rollup.bucket_start)
+        ).all()
+    else:
+        reading = models.SensorReading
+        rows = db.execute(
+            select(reading.recorded_at, reading.value, reading.value, reading.value, 1)
+            .where(
+                reading.sensor_id == sensor_id,
+                reading.metric == metric,
+                reading.recorded_at >= start,
+                reading.recorded_at < end,
+            )
+            .order_by(reading.recorded_at)
+        ).all()
+
+    points: Dict[datetime, List[float]] = {}
+    for ts, low, high, total, count in rows:
+        key = bucket_start(ts, step)
+        agg = points.get(key)
+        if agg is None:
+            points[key] = [low, high, total, count]
+        else:
+            agg[0] = min(agg[0], low)
+            agg[1] = max(agg[1], high)
+            agg[2] += total
+            agg[3] += count
+
+    series = [
+        {"bucket_start": key, "min": agg[0], "max": agg[1], "mean": agg[2] / agg[3], "count": agg[3]}
+        for key, agg in sorted(points.items())
+    ]
+    return step, ROLLUP_RESOLUTIONS.get(source, "raw"), series
@@ -0,0 +1,73 @@
+# app/utils/upsert.py
+# Dialect-aware bulk "INSERT ... ON CONFLICT" helper
+# ==========================================================
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, Table
+from sqlalchemy.orm import Session
+
+
+def upsert(
+    db: Session,
+    table: Table,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    update_values: Callable[[object], Dict[str, object]],
+) -> None:
+    """
+    Insert `rows` into `table`, merging into existing rows that collide on
+    `index_elements` (which must be backed by a unique constraint).
+
+    `update_values` receives the "incoming row" namespace (`excluded` on
+    SQLite/PostgreSQL, `inserted` on MySQL) and returns the column
+    assignments to apply on conflict. Rows are sent as one executemany.
+    """
+    if not rows:
+        return
+    db.execute(_upsert_statement(db, table, None, index_elements, update_values), rows)
+
+
+def upsert_from_select(
+    db: Session,
+    table: Table,
+    columns: Sequence[str],
+    select: Select,
+    index_elements: Sequence[str],
+    update_values: Callable[[object], Dict[str, object]],
+) -> None:
+    """
+    `INSERT INTO table (columns) SELECT ... ON CONFLICT ...`: the same merge
+    as `upsert`, for rows the database computes itself (e.g. a GROUP BY),
+    so they never travel through Python.
+    """
+    db.execute(_upsert_statement(db, table, (columns, select), index_elements, update_values))
+
+
+def _upsert_statement(
+    db: Session,
+    table: Table,
+    from_select: Optional[Tuple[Sequence[str], Select]],
+    index_elements: Sequence[str],
+    update_values: Callable[[object], Dict[str, object]],
+):
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+    else:
+        raise NotImplementedError(f"upsert is not supported for dialect '{dialect}'")
+
+    stmt = insert(table)
+    if from_select is not None:
+        columns, select = from_select
+        stmt = stmt.from_select(list(columns), select)
+    if dialect in ("mysql", "mariadb"):
+        return stmt.on_duplicate_key_update(update_values(stmt.inserted))
+    return stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_=update_values(stmt.excluded),
+    )
@@ -0,0 +1,93 @@
+# app/utils/user_invalidation.py
+# Cross-worker invalidation of cached users, synced from a DB table
+# ==========================================================
+#
+# Changing or deleting a user drops it from this worker's user cache right
+# away and writes a row to `user_invalidations`; other workers poll
+# `id > last seen id - overlap` every `auth_cache_sync_seconds` and drop the
+# same emails, so a demotion or deactivation reaches every worker within one
+# poll instead of after the cache TTL. The trailing overlap catches ids that
+# commit out of order, the same way the token revocation list does.
+#
+# A row only matters while a cache entry written before it can still be
+# alive, so rows older than the cache TTL are purged.
+
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+PURGE_SECONDS = 600.0
+
+
+class UserInvalidationLog:
+    def __init__(self, on_invalidate: Callable[[str], None], session_factory=SessionLocal):
+        self.on_invalidate = on_invalidate
+        self.session_factory = session_factory
+        self._max_id = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._last_purge = 0.0
+
+    # -------- writes --------
+    def invalidate(self, db: Session, emails: Iterable[str]) -> None:
+        """Drop the users here immediately and record them for the other workers."""
+        emails = sorted(set(emails))
+        for email in emails:
+            self.on_invalidate(email)
+        if emails:
+            db.add_all([models.UserInvalidation(email=email) for email in emails])
+            db.commit()
+
+    # -------- cross-worker sync --------
+    def sync(self, db: Session) -> int:
+        """Apply invalidations recorded since the last sync (plus the trailing overlap); returns how many rows were read."""
+        since = max(self._max_id - settings.auth_cache_sync_overlap_ids, 0)
+        rows = db.execute(
+            select(models.UserInvalidation.id, models.UserInvalidation.email)
+            .where(models.UserInvalidation.id > since)
+            .order_by(models.UserInvalidation.id)
+        ).all()
+        for row_id, email in rows:
+            self.on_invalidate(email)
+            self._max_id = max(self._max_id, row_id)
+        return len(rows)
+
+    def purge(self, db: Session) -> None:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.auth_cache_ttl_seconds)
+        db.execute(delete(models.UserInvalidation).where(models.UserInvalidation.created_at < cutoff))
+        db.commit()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="user-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(settings.auth_cache_sync_seconds):
+            try:
+                with self.session_factory() as db:
+                    if time.monotonic() - self._last_purge >= PURGE_SECONDS:
+                        self.purge(db)
+                        self._last_purge = time.monotonic()
+                    self.sync(db)
+            except Exception as e:
+                logger.error(f"❌ User invalidation sync failed: {e}")
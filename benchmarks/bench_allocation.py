@@ -0,0 +1,56 @@
+# benchmarks/bench_allocation.py
+# Throughput of batch resource-allocation predictions (incidents / second).
+# "end-to-end" includes building and JSON-encoding the response body.
+#
+#   python -m benchmarks.bench_allocation
+# ==========================================================
+
+import json
+import random
+import time
+
+from app.utils.allocation import allocate, allocate_batch
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+INCIDENT_TYPES = ("fire", "Flood", "earthquake", "landslide", "FIRE")
+
+
+def _make_batch(size: int, rng: random.Random):
+    types = [rng.choice(INCIDENT_TYPES) for _ in range(size)]
+    severities = [rng.randint(-1, 5) for _ in range(size)]
+    return types, severities
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'batch':>8} | {'per-item loop/s':>16} | {'batch/s':>14} | {'end-to-end/s':>14}")
+    print("-" * 62)
+    for size in BATCH_SIZES:
+        types, severities = _make_batch(size, rng)
+        repeat = max(3, 200_000 // max(size, 1) // 10)
+
+        loop = _best_of(lambda: [allocate(t, s) for t, s in zip(types, severities)], repeat)
+        vectorized = _best_of(lambda: allocate_batch(types, severities), repeat)
+
+        def end_to_end():
+            resources = allocate_batch(types, severities)
+            json.dumps({"count": size, "allocations": [
+                {"incident_type": t, "severity": s, "allocated_resources": r}
+                for t, s, r in zip(types, severities, resources)
+            ]})
+
+        full = _best_of(end_to_end, repeat)
+        print(f"{size:>8} | {size / loop:>16,.0f} | {size / vectorized:>14,.0f} | {size / full:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
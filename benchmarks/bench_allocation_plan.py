@@ -0,0 +1,56 @@
+# benchmarks/bench_allocation_plan.py
+# Full solve and incremental re-solve times for the global assignment planner
+#
+#   python -m benchmarks.bench_allocation_plan
+# ==========================================================
+
+import random
+import time
+
+from app.utils.allocation import RESOURCE_TABLE
+from app.utils.allocation_engine import AllocationPlanner
+
+RESOURCE_TYPES = sorted({rtype for resources in RESOURCE_TABLE.values() for rtype in resources})
+
+
+def _scenario(n_incidents: int, n_units: int, rng: random.Random):
+    incidents = [{
+        "id": i,
+        "incident_type": rng.choice(list(RESOURCE_TABLE) + ["landslide"]),
+        "severity": rng.randint(1, 5),
+        "latitude": rng.uniform(8, 37),
+        "longitude": rng.uniform(68, 97),
+    } for i in range(n_incidents)]
+    units = [{
+        "id": f"unit-{j}",
+        "resource_type": rng.choice(RESOURCE_TYPES + ["General Rescue Team"]),
+        "latitude": rng.uniform(8, 37),
+        "longitude": rng.uniform(68, 97),
+    } for j in range(n_units)]
+    return incidents, units
+
+
+def main():
+    rng = random.Random(7)
+    for n_incidents, n_units in ((1_000, 200), (10_000, 2_000), (50_000, 10_000)):
+        incidents, units = _scenario(n_incidents, n_units, rng)
+        planner = AllocationPlanner()
+
+        start = time.perf_counter()
+        plan = planner.solve(incidents, units, time_budget_ms=10_000)
+        full_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for incident in rng.sample(incidents, 100):
+            planner.update_incident({**incident, "severity": rng.randint(1, 5)})
+        update_ms = (time.perf_counter() - start) * 1000 / 100
+
+        print(
+            f"{n_incidents:>6} incidents x {n_units:>6} units: full solve {full_ms:8.1f} ms "
+            f"({len(plan['assignments'])} assigned, {len(plan['unmet'])} unmet) | "
+            f"incremental update {update_ms:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/bench_json_lists.py
+# Large list responses: per-row models + response_model + stdlib json
+# vs. column tuples encoded straight to JSON with orjson
+#
+#   python -m benchmarks.bench_json_lists [--rows 10000 100000]
+# ==========================================================
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Throwaway SQLite database; must be set before the app is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aidrp-bench-'), 'bench.db')}"
+for key, value in {"SECRET_KEY": "bench", "MYSQL_USER": "bench", "MYSQL_PASSWORD": "bench", "MYSQL_DB": "bench",
+                   "OUTBOX_ENABLED": "false", "REPORT_REBUILD_ENABLED": "false"}.items():
+    os.environ.setdefault(key, value)
+
+from fastapi import APIRouter, Depends  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import delete, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app import migrate, models, schemas  # noqa: E402
+from app.database import engine, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+ADMIN, PASSWORD = "bench-admin@example.com", "password123"
+
+# The previous handlers, kept here as the baseline (stdlib JSONResponse, as before)
+legacy = APIRouter(prefix="/legacy", default_response_class=JSONResponse)
+
+
+@legacy.get("/users", response_model=List[schemas.UserOut])
+def legacy_users(db: Session = Depends(get_db)):
+    users = db.query(models.User).all()
+    return [schemas.UserOut.model_validate(user, from_attributes=True) for user in users]
+
+
+@legacy.get("/notifications", response_model=List[schemas.NotificationOut])
+def legacy_notifications(db: Session = Depends(get_db)):
+    return db.query(models.Notification).all()
+
+
+app.include_router(legacy)
+
+
+def _seed(rows: int) -> None:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(delete(models.Notification))
+        conn.execute(delete(models.User).where(models.User.email != ADMIN))
+        conn.execute(insert(models.User), [
+            {"email": f"user{i}@example.com", "hashed_password": "x", "full_name": f"User {i}",
+             "role": "responder", "region": "north" if i % 2 else "south", "is_active": True}
+            for i in range(rows)
+        ])
+        conn.execute(insert(models.Notification), [
+            {"title": f"Alert {i}", "message": "Evacuate the harbor area", "recipient": f"user{i}@example.com",
+             "sent": bool(i % 3), "created_at": now - timedelta(seconds=i)}
+            for i in range(rows)
+        ])
+
+
+def _time(client, path: str, headers: dict, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        resp = client.get(path, headers=headers)
+        elapsed = time.perf_counter() - start
+        assert resp.status_code == 200, resp.text
+        best = min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    migrate.upgrade()
+    with TestClient(app) as client:
+        client.post("/auth/register", json={"email": ADMIN, "password": PASSWORD, "role": "admin"})
+        token = client.post("/auth/token", data={"username": ADMIN, "password": PASSWORD}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for rows in args.rows:
+            _seed(rows)
+            for label, old, new in [
+                ("users", "/legacy/users", "/admin/users"),
+                ("notifications", "/legacy/notifications", "/admin/notifications/"),
+            ]:
+                assert client.get(old, headers=headers).json() == client.get(new, headers=headers).json()
+                before = _time(client, old, headers, args.repeat)
+                after = _time(client, new, headers, args.repeat)
+                print(f"{label:<14} {rows:>7} rows | models + json {before * 1000:8.0f} ms | "
+                      f"tuples + orjson {after * 1000:7.0f} ms | {before / after:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/bench_request_profile.py
+# Overhead of the per-request SQL profiler (Server-Timing + request log)
+# on list endpoints, profiler on vs. off
+#
+#   python -m benchmarks.bench_request_profile [--batches 40] [--batch-size 150]
+# ==========================================================
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+# Throwaway SQLite database; must be set before the app is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='aidrp-bench-'), 'bench.db')}"
+for key, value in {"SECRET_KEY": "bench", "MYSQL_USER": "bench", "MYSQL_PASSWORD": "bench", "MYSQL_DB": "bench",
+                   "OUTBOX_ENABLED": "false", "REPORT_REBUILD_ENABLED": "false"}.items():
+    os.environ.setdefault(key, value)
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+
+from app import migrate, models  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import create_app  # noqa: E402
+from app.utils.query_counter import QueryProfileMiddleware, profile_queries  # noqa: E402
+
+PATHS = ["/sensors/", "/incidents/?limit=50", "/courses/"]
+
+
+def _seed() -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(models.Sensor), [
+            {"name": f"Gauge {i}", "type": "water_level", "location": "Harbor", "latitude": 1.0, "longitude": 2.0}
+            for i in range(50)
+        ])
+        conn.execute(insert(models.Incident), [
+            {"title": f"Flood {i}", "severity": "high", "location": "Dock"} for i in range(50)
+        ])
+        conn.execute(insert(models.Course), [{"title": f"Course {i}"} for i in range(50)])
+
+
+async def _run(app, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i in range(requests):
+            resp = await client.get(PATHS[i % len(PATHS)])
+            assert resp.status_code == 200, resp.text
+        return time.perf_counter() - start
+
+
+def _batches(plain, profiled, batches: int, size: int) -> dict:
+    """Alternate short batches (ABBA order) so drift and warm-up hit both apps alike."""
+    timings = {"off": [], "on": []}
+    for i in range(batches):
+        order = [("off", plain), ("on", profiled)]
+        for label, app in (order if i % 2 == 0 else order[::-1]):
+            timings[label].append(asyncio.run(_run(app, size)) / size)
+    return {label: statistics.median(values) for label, values in timings.items()}
+
+
+def _fixed_costs(iterations: int) -> tuple:
+    """The profiler's own work, without the request noise: (us per request, us per statement)."""
+    async def bare(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"[]"})
+
+    async def noop_send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+    wrapped = QueryProfileMiddleware(bare, server_timing=True)
+
+    async def loop(app):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await app(dict(scope), None, noop_send)
+        return time.perf_counter() - start
+
+    per_request = (asyncio.run(loop(wrapped)) - asyncio.run(loop(bare))) / iterations
+
+    with engine.connect() as conn:
+        statement = text("SELECT 1")
+        start = time.perf_counter()
+        for _ in range(iterations):
+            conn.execute(statement)
+        outside = time.perf_counter() - start
+        with profile_queries():
+            start = time.perf_counter()
+            for _ in range(iterations):
+                conn.execute(statement)
+            inside = time.perf_counter() - start
+    return per_request * 1e6, (inside - outside) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=150)
+    args = parser.parse_args()
+
+    migrate.upgrade()
+    _seed()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    requests_log = logging.getLogger("app.requests")
+    requests_log.setLevel(logging.DEBUG)
+    requests_log.handlers = [logging.NullHandler()]  # build + emit the record, without terminal I/O
+    requests_log.propagate = False
+
+    settings.query_profile_enabled = False
+    plain = create_app()
+    settings.query_profile_enabled = settings.query_server_timing = True  # the most expensive setup
+    profiled = create_app()
+
+    _batches(plain, profiled, 2, args.batch_size)  # warm up caches and the pool
+    median = _batches(plain, profiled, args.batches, args.batch_size)
+    off, on = median["off"] * 1e6, median["on"] * 1e6
+    print(f"profiler off {off:8.1f} us/request (median of {args.batches} batches)")
+    print(f"profiler on  {on:8.1f} us/request | overhead {(on - off) / off * 100:+.2f}%")
+
+    request_cost, statement_cost = _fixed_costs(20_000)
+    print(f"middleware + log line {request_cost:6.1f} us/request ({request_cost / off * 100:.2f}% of a request); "
+          f"listeners {statement_cost:4.1f} us/statement")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_startup.py
+# Worker cold start: import time, time to first served request and memory
+#
+#   python -m benchmarks.bench_startup [--workers 4]
+#
+# "cold" starts each worker as a fresh interpreter (uvicorn --workers).
+# "preload" imports the app once and forks the workers from it (gunicorn
+# --preload), so read-only pages are shared copy-on-write; there, the
+# private (unshared) memory per worker is what each extra worker costs.
+# ==========================================================
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "smtplib", "alembic")
+
+_db_dir = tempfile.mkdtemp(prefix="aidrp-bench-")
+ENV = {
+    **os.environ,
+    "DATABASE_URL": f"sqlite:///{os.path.join(_db_dir, 'bench.db')}",
+    "SECRET_KEY": "bench", "MYSQL_USER": "bench", "MYSQL_PASSWORD": "bench", "MYSQL_DB": "bench",
+    "OUTBOX_ENABLED": "false", "REPORT_REBUILD_ENABLED": "false",
+}
+
+
+def _memory_kb() -> dict:
+    """RSS and private (unshared) memory of this process, in kB (Linux)."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            if name in ("Rss", "Private_Clean", "Private_Dirty"):
+                fields[name] = int(rest.split()[0])
+    return {"rss_kb": fields["Rss"], "private_kb": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _first_request(app) -> float:
+    from fastapi.testclient import TestClient
+
+    start = time.perf_counter()
+    with TestClient(app) as client:
+        assert client.get("/status").status_code == 200
+    return time.perf_counter() - start
+
+
+def _worker_report(import_seconds: float, app) -> dict:
+    first_request = _first_request(app)
+    return {
+        "import_s": import_seconds,
+        "first_request_s": first_request,
+        **_memory_kb(),
+        "heavy": [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+
+def cold_worker() -> None:
+    start = time.perf_counter()
+    from app.main import app
+    print(json.dumps(_worker_report(time.perf_counter() - start, app)))
+
+
+def _summarise(label: str, reports: list) -> None:
+    n = len(reports)
+    avg = {key: sum(r[key] for r in reports) / n for key in ("import_s", "first_request_s", "rss_kb", "private_kb")}
+    print(
+        f"{label:<8} {n} workers | import {avg['import_s'] * 1000:7.0f} ms | first request "
+        f"{avg['first_request_s'] * 1000:6.0f} ms | RSS {avg['rss_kb'] / 1024:6.1f} MB | "
+        f"private {avg['private_kb'] / 1024:6.1f} MB | loaded: {', '.join(reports[0]['heavy']) or '-'}"
+    )
+
+
+def cold(workers: int) -> None:
+    reports = []
+    for _ in range(workers):
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_startup", "--cold-worker"],
+            env=ENV, capture_output=True, text=True, check=True
+        ).stdout
+        reports.append(json.loads(out.strip().splitlines()[-1]))
+    _summarise("cold", reports)
+
+
+def preload(workers: int) -> None:
+    os.environ.update(ENV)
+    start = time.perf_counter()
+    from app.main import app
+    import_seconds = time.perf_counter() - start
+    import gc
+    gc.freeze()  # keep the imported objects out of the children's GC passes (fewer COW page copies)
+
+    reports = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            with os.fdopen(write_fd, "w") as pipe:
+                pipe.write(json.dumps(_worker_report(0.0, app)))
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd) as pipe:
+            reports.append(json.loads(pipe.read()))
+        os.waitpid(pid, 0)
+    print(f"preload  master import {import_seconds * 1000:.0f} ms (once, before forking)")
+    _summarise("preload", reports)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--cold-worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.cold_worker:
+        cold_worker()
+        return
+    subprocess.run([sys.executable, "-m", "app.migrate"], env=ENV, capture_output=True, check=True)
+    cold(args.workers)
+    preload(args.workers)
+
+
+if __name__ == "__main__":
+    main()
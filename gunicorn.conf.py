@@ -0,0 +1,37 @@
+# gunicorn.conf.py
+# Production process manager:  gunicorn -c gunicorn.conf.py app.main:app
+# ==========================================================
+#
+# preload_app imports app.main (building the route table and OpenAPI models)
+# once in the master; workers are forked from it and share those pages
+# copy-on-write instead of each importing the app again.
+
+import gc
+import multiprocessing
+import os
+
+bind = f"{os.getenv('APP_HOST', '0.0.0.0')}:{os.getenv('APP_PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    # Move everything imported so far out of the collector's reach, so GC passes
+    # in the workers don't touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # The master never queries the database, but make sure no pooled
+    # connection is ever shared between processes
+    from app.database import async_engine, engine, replica_engines
+
+    engine.dispose(close=False)
+    async_engine.sync_engine.dispose(close=False)
+    for replica_engine, async_replica_engine in replica_engines:
+        replica_engine.dispose(close=False)
+        async_replica_engine.sync_engine.dispose(close=False)
@@ -0,0 +1,32 @@
+# migrations/online.py
+# Index builds that do not block writes on large tables
+# ==========================================================
+
+from typing import Sequence
+
+from alembic import op
+
+
+def create_index_online(name: str, table: str, columns: Sequence[str], unique: bool = False) -> None:
+    """
+    Postgres: CREATE INDEX CONCURRENTLY, outside the migration transaction.
+    MySQL / MariaDB: InnoDB builds secondary indexes in place (LOCK=NONE).
+    SQLite: plain CREATE INDEX.
+    """
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, list(columns), unique=unique, postgresql_concurrently=True, if_not_exists=True)
+    elif dialect in ("mysql", "mariadb"):
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        op.execute(f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(columns)}), ALGORITHM=INPLACE, LOCK=NONE")
+    else:
+        op.create_index(name, table, list(columns), unique=unique)
+
+
+def drop_index_online(name: str, table: str) -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,129 @@
+"""Tables, columns and indexes added between the baseline and the first migration
+
+Sensor readings and rollups, coordinates, keyset / outbox / report indexes,
+notification outbox columns, report summaries, revoked and refresh tokens.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 18:10:52.118034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('notification_daily_summaries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('scope', sa.String(length=20), nullable=False),
+    sa.Column('subject_id', sa.Integer(), nullable=False),
+    sa.Column('total_count', sa.Integer(), nullable=False),
+    sa.Column('sent_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'scope', 'subject_id', name='uq_notification_summary_day')
+    )
+    op.create_table('revoked_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('jti')
+    )
+    op.create_index(op.f('ix_revoked_tokens_expires_at'), 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_table('refresh_tokens',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('family_id', sa.String(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_refresh_tokens_family_id'), 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index(op.f('ix_refresh_tokens_user_id'), 'refresh_tokens', ['user_id'], unique=False)
+    op.create_table('sensor_reading_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sensor_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(), nullable=False),
+    sa.Column('min_value', sa.Float(), nullable=False),
+    sa.Column('max_value', sa.Float(), nullable=False),
+    sa.Column('sum_value', sa.Float(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sensor_id', 'metric', 'resolution', 'bucket_start', name='uq_sensor_rollup_bucket')
+    )
+    op.create_table('sensor_readings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sensor_id', sa.Integer(), nullable=False),
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('value', sa.Float(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['sensor_id'], ['sensors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sensor_readings_sensor_recorded', 'sensor_readings', ['sensor_id', 'recorded_at'], unique=False)
+    op.add_column('incidents', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('incidents', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_incidents_assignee_reported', 'incidents', ['assigned_to', 'reported_at', 'id'], unique=False)
+    op.create_index('ix_incidents_lat_lon', 'incidents', ['latitude', 'longitude'], unique=False)
+    op.create_index('ix_incidents_location_reported', 'incidents', ['location', 'reported_at', 'id'], unique=False)
+    op.create_index('ix_incidents_reported_id', 'incidents', ['reported_at', 'id'], unique=False)
+    op.create_index('ix_incidents_severity_reported', 'incidents', ['severity', 'reported_at', 'id'], unique=False)
+    op.add_column('notifications', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('notifications', sa.Column('next_attempt_at', sa.DateTime(), nullable=True))
+    op.add_column('notifications', sa.Column('last_error', sa.String(length=500), nullable=True))
+    op.create_index('ix_notifications_created_at', 'notifications', ['created_at'], unique=False)
+    op.create_index('ix_notifications_outbox', 'notifications', ['sent', 'next_attempt_at'], unique=False)
+    op.add_column('sensors', sa.Column('name', sa.String(length=255), nullable=True))
+    op.add_column('sensors', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('sensors', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_index('ix_sensors_lat_lon', 'sensors', ['latitude', 'longitude'], unique=False)
+    op.add_column('users', sa.Column('region', sa.String(length=100), nullable=True))
+    op.create_index(op.f('ix_users_region'), 'users', ['region'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_region'), table_name='users')
+    op.drop_column('users', 'region')
+    op.drop_index('ix_sensors_lat_lon', table_name='sensors')
+    op.drop_column('sensors', 'longitude')
+    op.drop_column('sensors', 'latitude')
+    op.drop_column('sensors', 'name')
+    op.drop_index('ix_notifications_outbox', table_name='notifications')
+    op.drop_index('ix_notifications_created_at', table_name='notifications')
+    op.drop_column('notifications', 'last_error')
+    op.drop_column('notifications', 'next_attempt_at')
+    op.drop_column('notifications', 'attempts')
+    op.drop_index('ix_incidents_severity_reported', table_name='incidents')
+    op.drop_index('ix_incidents_reported_id', table_name='incidents')
+    op.drop_index('ix_incidents_location_reported', table_name='incidents')
+    op.drop_index('ix_incidents_lat_lon', table_name='incidents')
+    op.drop_index('ix_incidents_assignee_reported', table_name='incidents')
+    op.drop_column('incidents', 'longitude')
+    op.drop_column('incidents', 'latitude')
+    op.drop_index('ix_sensor_readings_sensor_recorded', table_name='sensor_readings')
+    op.drop_table('sensor_readings')
+    op.drop_table('sensor_reading_rollups')
+    op.drop_index(op.f('ix_refresh_tokens_user_id'), table_name='refresh_tokens')
+    op.drop_index(op.f('ix_refresh_tokens_family_id'), table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
+    op.drop_index(op.f('ix_revoked_tokens_expires_at'), table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
+    op.drop_table('notification_daily_summaries')
@@ -0,0 +1,57 @@
+"""Cascade user deletes to incidents and notifications in the database
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 19:02:13.518204
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, columns referencing users.id)
+USER_FKS = [
+    ('incidents', ['assigned_to']),
+    ('notifications', ['target_user_id', 'created_by']),
+]
+
+# SQLite keeps these constraints unnamed; batch mode names them by this convention
+SQLITE_FK_NAMES = {"fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+
+def _replace_user_fks(table: str, columns: Sequence[str], ondelete: Optional[str]) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        with op.batch_alter_table(table, naming_convention=SQLITE_FK_NAMES) as batch_op:
+            for column in columns:
+                name = f'fk_{table}_{column}_users'
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, 'users', [column], ['id'], ondelete=ondelete)
+        return
+
+    existing = {
+        tuple(fk['constrained_columns']): fk['name']
+        for fk in sa.inspect(bind).get_foreign_keys(table)
+    }
+    for column in columns:
+        name = existing[(column,)]
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, 'users', [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    for table, columns in USER_FKS:
+        _replace_user_fks(table, columns, 'CASCADE')
+
+
+def downgrade() -> None:
+    for table, columns in USER_FKS:
+        _replace_user_fks(table, columns, None)
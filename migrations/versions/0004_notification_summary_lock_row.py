@@ -0,0 +1,41 @@
+"""Lock row that serializes summary rebuilds against incremental counts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 21:40:05.317442
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors app.utils.report_summary.LOCK_KEY; outside every report scope
+LOCK_DAY, LOCK_SCOPE, LOCK_SUBJECT = date(1970, 1, 1), 'lock', 0
+
+summaries = sa.table(
+    'notification_daily_summaries',
+    sa.column('day', sa.Date),
+    sa.column('scope', sa.String),
+    sa.column('subject_id', sa.Integer),
+    sa.column('total_count', sa.Integer),
+    sa.column('sent_count', sa.Integer),
+)
+
+
+def upgrade() -> None:
+    op.bulk_insert(summaries, [
+        {'day': LOCK_DAY, 'scope': LOCK_SCOPE, 'subject_id': LOCK_SUBJECT, 'total_count': 0, 'sent_count': 0},
+    ])
+
+
+def downgrade() -> None:
+    op.execute(summaries.delete().where(summaries.c.scope == LOCK_SCOPE))
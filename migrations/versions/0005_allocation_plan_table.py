@@ -0,0 +1,37 @@
+"""Shared allocation plan state, one row read by every worker
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 23:12:40.604718
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Mirrors app.routes.allocation_routes.PLAN_ROW_ID
+PLAN_ROW_ID = 1
+
+
+def upgrade() -> None:
+    plans = op.create_table('allocation_plans',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('state', sa.Text().with_variant(mysql.LONGTEXT(), 'mysql'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(plans, [{'id': PLAN_ROW_ID, 'version': 0, 'state': None, 'updated_at': None}])
+
+
+def downgrade() -> None:
+    op.drop_table('allocation_plans')